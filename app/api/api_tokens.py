@@ -1,8 +1,9 @@
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_session
+from app.core.pagination import set_next_cursor
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.crud import api_token as crud_api_token
@@ -19,8 +20,10 @@ router = APIRouter(prefix="/api_tokens", tags=["api_tokens"])
 
 @router.get("/", response_model=List[APITokenResponse])
 async def get_api_tokens(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     user_id: Optional[UUID] = None,
     is_active: Optional[bool] = None,
     issued_for: Optional[str] = None,
@@ -33,6 +36,7 @@ async def get_api_tokens(
     Args:
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         user_id: Фильтр по ID пользователя
         is_active: Фильтр по статусу активности
         issued_for: Фильтр по типу выдачи ('user' или 'system')
@@ -55,10 +59,12 @@ async def get_api_tokens(
         db=db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         user_id=user_id,
         is_active=is_active,
         issued_for=issued_for
     )
+    set_next_cursor(response, tokens, limit)
     return tokens
 
 
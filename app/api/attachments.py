@@ -1,8 +1,9 @@
 from typing import List, Optional
 from uuid import UUID, uuid4
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_session
+from app.core.pagination import set_next_cursor
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.crud import attachment as crud_attachment
@@ -18,8 +19,10 @@ router = APIRouter(prefix="/attachments", tags=["attachments"])
 
 @router.get("/", response_model=List[AttachmentResponse])
 async def get_attachments(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     object_id: Optional[UUID] = Query(None, description="Фильтр по ID объекта"),
     content_type: Optional[str] = Query(None, description="Фильтр по типу контента"),
     db: AsyncSession = Depends(get_session)
@@ -30,6 +33,7 @@ async def get_attachments(
     Args:
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         object_id: Фильтр по ID объекта
         content_type: Фильтр по типу контента
         db: Сессия базы данных
@@ -41,9 +45,11 @@ async def get_attachments(
         db=db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         object_id=object_id,
         content_type=content_type
     )
+    set_next_cursor(response, attachments, limit)
     return attachments
 
 
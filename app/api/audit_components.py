@@ -1,8 +1,9 @@
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_session
+from app.core.pagination import set_next_cursor
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.crud import audit_component as crud_audit_component
@@ -18,8 +19,10 @@ router = APIRouter(prefix="/audit_components", tags=["audit_components"])
 
 @router.get("/", response_model=List[AuditComponentResponse])
 async def get_audit_components(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     audit_id: Optional[UUID] = None,
     component_type: Optional[str] = None,
     sap_id: Optional[str] = None,
@@ -32,6 +35,7 @@ async def get_audit_components(
     Args:
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         audit_id: Фильтр по аудиту
         component_type: Фильтр по типу компонента
         sap_id: Фильтр по SAP ID
@@ -45,11 +49,13 @@ async def get_audit_components(
         db=db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         audit_id=audit_id,
         component_type=component_type,
         sap_id=sap_id,
         part_number=part_number
     )
+    set_next_cursor(response, components, limit)
     return components
 
 
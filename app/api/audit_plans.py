@@ -1,8 +1,9 @@
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_session
+from app.core.pagination import set_next_cursor
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.crud import audit_plan as crud_audit_plan
@@ -23,8 +24,10 @@ router = APIRouter(prefix="/audit_plans", tags=["audit_plans"])
 
 @router.get("/", response_model=List[AuditPlanResponse])
 async def get_audit_plans(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     enterprise_id: Optional[UUID] = None,
     category: Optional[str] = None,
     status: Optional[str] = None,
@@ -36,6 +39,7 @@ async def get_audit_plans(
     Args:
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         enterprise_id: Фильтр по предприятию
         category: Фильтр по категории графика ('product', 'process_system', 'lra', 'external')
         status: Фильтр по статусу ('draft', 'approved', 'in_progress', 'completed')
@@ -48,10 +52,12 @@ async def get_audit_plans(
         db=db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         enterprise_id=enterprise_id,
         category=category,
         status=status
     )
+    set_next_cursor(response, audit_plans, limit)
     return audit_plans
 
 
@@ -256,8 +262,10 @@ async def reject_audit_plan(
 
 @router.get("/items/", response_model=List[AuditPlanItemResponse])
 async def get_audit_plan_items(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     audit_plan_id: Optional[UUID] = None,
     planned_auditor_id: Optional[UUID] = None,
     db: AsyncSession = Depends(get_session)
@@ -268,6 +276,7 @@ async def get_audit_plan_items(
     Args:
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         audit_plan_id: Фильтр по плану аудитов
         planned_auditor_id: Фильтр по запланированному аудитору
         db: Сессия базы данных
@@ -279,9 +288,11 @@ async def get_audit_plan_items(
         db=db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         audit_plan_id=audit_plan_id,
         planned_auditor_id=planned_auditor_id
     )
+    set_next_cursor(response, items, limit)
     return items
 
 
@@ -1,8 +1,9 @@
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_session
+from app.core.pagination import set_next_cursor
 from app.crud import auditor_qualification as crud
 from app.schemas.auditor_qualification import (
     AuditorQualificationCreate,
@@ -22,8 +23,10 @@ router = APIRouter(prefix="/auditor_qualifications", tags=["auditor_qualificatio
 
 @router.get("/standards", response_model=List[QualificationStandardResponse])
 async def get_qualification_standards(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     is_active: Optional[bool] = None,
     db: AsyncSession = Depends(get_session)
 ):
@@ -33,6 +36,7 @@ async def get_qualification_standards(
     Args:
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         is_active: Фильтр по статусу активности
         db: Сессия базы данных
     
@@ -43,8 +47,10 @@ async def get_qualification_standards(
         db=db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         is_active=is_active
     )
+    set_next_cursor(response, standards, limit)
     return standards
 
 
@@ -147,9 +153,11 @@ async def delete_qualification_standard(
 
 @router.get("/chapters", response_model=List[StandardChapterResponse])
 async def get_standard_chapters(
+    response: Response,
     standard_id: UUID,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     db: AsyncSession = Depends(get_session)
 ):
     """
@@ -159,6 +167,7 @@ async def get_standard_chapters(
         standard_id: ID стандарта
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         db: Сессия базы данных
     
     Returns:
@@ -168,8 +177,10 @@ async def get_standard_chapters(
         db=db,
         standard_id=standard_id,
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=cursor
     )
+    set_next_cursor(response, chapters, limit)
     return chapters
 
 
@@ -272,8 +283,10 @@ async def delete_standard_chapter(
 
 @router.get("/", response_model=List[AuditorQualificationResponse])
 async def get_auditor_qualifications(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     user_id: Optional[UUID] = None,
     status_id: Optional[UUID] = None,
     is_active: Optional[bool] = None,
@@ -285,6 +298,7 @@ async def get_auditor_qualifications(
     Args:
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         user_id: Фильтр по ID пользователя
         status_id: Фильтр по ID статуса
         is_active: Фильтр по статусу активности
@@ -297,10 +311,12 @@ async def get_auditor_qualifications(
         db=db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         user_id=user_id,
         status_id=status_id,
         is_active=is_active
     )
+    set_next_cursor(response, qualifications, limit)
     return qualifications
 
 
@@ -2,14 +2,17 @@ from typing import List, Optional
 from uuid import UUID
 from datetime import date
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_session
+from app.core.database import get_session, get_read_session
+from app.core.pagination import set_next_cursor
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.crud import audit as crud_audit
 from app.crud import audit_calendar as crud_calendar
 from app.crud import audit_schedule_week as crud_schedule_week
 from app.crud import export_task as crud_export_task
+from app.crud.s3_storage import get_default_s3_storage
 from app.schemas.audit import (
     AuditCreate,
     AuditUpdate,
@@ -25,6 +28,7 @@ from app.schemas.change_history import ChangeHistoryResponse
 from app.schemas.export_task import ExportTaskCreate, ExportTaskResponse, ExportTaskStatusResponse
 from app.services.export import export_audit_to_zip
 from app.services.tasks import export_audit_task
+from app.services.s3 import generate_presigned_url
 from app.models.export_task import ExportTaskStatus
 
 
@@ -33,8 +37,10 @@ router = APIRouter(prefix="/audits", tags=["audits"])
 
 @router.get("/", response_model=List[AuditResponse])
 async def get_audits(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     enterprise_id: Optional[UUID] = None,
     audit_category: Optional[str] = None,
     audit_type_id: Optional[UUID] = None,
@@ -51,6 +57,7 @@ async def get_audits(
     Args:
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         enterprise_id: Фильтр по предприятию
         audit_category: Фильтр по категории ('product', 'process_system', 'lra', 'external')
         audit_type_id: Фильтр по типу аудита
@@ -68,6 +75,7 @@ async def get_audits(
         db=db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         enterprise_id=enterprise_id,
         audit_category=audit_category,
         audit_type_id=audit_type_id,
@@ -77,6 +85,7 @@ async def get_audits(
         audit_date_from=audit_date_from,
         audit_date_to=audit_date_to
     )
+    set_next_cursor(response, audits, limit)
     return audits
 
 
@@ -125,7 +134,7 @@ async def get_audit(
     Raises:
         HTTPException: Если аудит не найден
     """
-    audit = await crud_audit.get_audit(db, audit_id)
+    audit = await crud_audit.get_audit(db, audit_id, profile="detail")
     if not audit:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -170,8 +179,8 @@ async def update_audit(
         for field in old_audit.__table__.columns.keys()
     }
     
-    # Обновляем аудит
-    updated_audit = await crud_audit.update_audit(db, audit_id, audit_update)
+    # Обновляем аудит без commit: изменение и его история фиксируются одним commit ниже
+    updated_audit = await crud_audit.update_audit(db, audit_id, audit_update, commit=False)
     if not updated_audit:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -196,9 +205,8 @@ async def update_audit(
     )
     
     await db.commit()
-    await db.refresh(updated_audit)
     
-    return updated_audit
+    return await crud_audit.get_audit(db, audit_id, profile="detail")
 
 
 @router.delete("/{audit_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -259,7 +267,7 @@ async def reschedule_audit(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Audit not found"
         )
-    return updated_audit
+    return await crud_audit.get_audit(db, audit_id, profile="detail")
 
 
 @router.get("/calendar/schedule", response_model=AuditScheduleResponse)
@@ -491,10 +499,12 @@ async def get_reschedule_history(
 
 @router.get("/{audit_id}/history", response_model=List[ChangeHistoryResponse])
 async def get_audit_history(
+    response: Response,
     audit_id: UUID,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_session),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -504,6 +514,7 @@ async def get_audit_history(
         audit_id: UUID аудита
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         db: Сессия базы данных
         current_user: Текущий авторизованный пользователь
     
@@ -528,10 +539,12 @@ async def get_audit_history(
         db=db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         entity_type='audit',
         entity_id=audit_id
     )
     
+    set_next_cursor(response, history, limit, sort_attr="changed_at")
     return history
 
 
@@ -643,7 +656,7 @@ async def download_exported_audit(
         db: Сессия базы данных
     
     Returns:
-        ZIP архив с данными аудита
+        Редирект на ZIP архив с данными аудита в S3
     
     Raises:
         HTTPException: Если задача не найдена или не завершена
@@ -680,24 +693,23 @@ async def download_exported_audit(
             detail="File path not found"
         )
     
-    from app.services.s3 import s3_service
-    
-    try:
-        file_content = await s3_service.download_file(export_task.file_path)
-        
-        from datetime import datetime
-        filename = export_task.file_path.split("/")[-1]
-        
-        return Response(
-            content=file_content,
-            media_type="application/zip",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}"
-            }
+    storage = await get_default_s3_storage(db)
+    if not storage:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No default S3 storage configured"
         )
-    except Exception as e:
+    
+    download_url = generate_presigned_url(
+        storage=storage,
+        s3_key=export_task.file_path,
+        filename=export_task.file_path.split("/")[-1]
+    )
+    if not download_url:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to download file: {str(e)}"
+            detail="Failed to generate download URL"
         )
+    
+    return RedirectResponse(download_url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
 
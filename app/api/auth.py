@@ -31,6 +31,7 @@ from app.crud.ldap_connection import get_default_ldap_connection
 from app.services.email import send_registration_invite
 from app.services.ldap import authenticate_ldap_user
 from app.services.otp import otp_service
+from app.services.principal_cache import principal_cache
 from app.schemas.auth import OTPSendRequest, OTPVerifyRequest
 from pydantic import EmailStr
 
@@ -66,6 +67,10 @@ async def get_current_user(
     
     user_id_uuid = UUID(user_id)
     
+    user = await principal_cache.get_user(db, user_id_uuid, session_id)
+    if user is not None:
+        return user
+    
     result = await db.execute(select(User).where(User.id == user_id_uuid))
     user = result.scalar_one_or_none()
     
@@ -84,6 +89,8 @@ async def get_current_user(
     if user.session_id != session_id:
         raise credentials_exception
     
+    await principal_cache.set_user(user)
+    
     return user
 
 
@@ -148,6 +155,7 @@ async def login(
     user.last_login = datetime.now(timezone.utc)
     
     await db.commit()
+    await principal_cache.invalidate(user.id)
     
     access_token = create_access_token(
         data={
@@ -250,6 +258,7 @@ async def logout(
     """
     current_user.session_id = None
     await db.commit()
+    await principal_cache.invalidate(current_user.id)
     
     return {"message": "Successfully logged out"}
 
@@ -450,6 +459,7 @@ async def ldap_login(
     user.last_login = datetime.now(timezone.utc)
     
     await db.commit()
+    await principal_cache.invalidate(user.id)
     
     access_token = create_access_token(
         data={
@@ -7,6 +7,7 @@ from app.core.database import get_db
 from app.models.user import User
 from app.core.security import create_access_token, create_refresh_token
 from app.services.otp import otp_service
+from app.services.principal_cache import principal_cache
 from app.services.email import send_otp
 from app.crud.email_account import get_default_email_account
 from app.schemas.auth import OTPSendRequest, OTPVerifyRequest, LoginResponse
@@ -108,6 +109,7 @@ async def verify_otp(
     user.last_login = datetime.now(timezone.utc)
     
     await db.commit()
+    await principal_cache.invalidate(user.id)
     
     access_token = create_access_token(
         data={
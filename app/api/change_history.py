@@ -1,8 +1,9 @@
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_session
+from app.core.database import get_read_session
+from app.core.pagination import set_next_cursor
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.crud import change_history as crud_change_history
@@ -14,12 +15,14 @@ router = APIRouter(prefix="/change_history", tags=["change_history"])
 
 @router.get("/", response_model=List[ChangeHistoryResponse])
 async def get_change_history_list(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     entity_type: Optional[str] = Query(None, description="Фильтр по типу сущности"),
     entity_id: Optional[UUID] = Query(None, description="Фильтр по ID сущности"),
     user_id: Optional[UUID] = Query(None, description="Фильтр по ID пользователя"),
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -28,6 +31,7 @@ async def get_change_history_list(
     Args:
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         entity_type: Фильтр по типу сущности
         entity_id: Фильтр по ID сущности
         user_id: Фильтр по ID пользователя
@@ -41,17 +45,19 @@ async def get_change_history_list(
         db=db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         entity_type=entity_type,
         entity_id=entity_id,
         user_id=user_id
     )
+    set_next_cursor(response, history, limit, sort_attr="changed_at")
     return history
 
 
 @router.get("/{change_id}", response_model=ChangeHistoryResponse)
 async def get_change_history(
     change_id: UUID,
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user)
 ):
     """
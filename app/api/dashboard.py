@@ -1,6 +1,9 @@
+from typing import Optional
+from uuid import UUID
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_session
+from app.core.config import settings
+from app.core.database import get_read_session
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.crud import dashboard as crud_dashboard
@@ -16,11 +19,18 @@ router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 @router.get("/stats", response_model=DashboardStatsResponse)
 async def get_dashboard_stats(
-    db: AsyncSession = Depends(get_session)
+    enterprise_id: Optional[UUID] = Query(None, description="Фильтр по предприятию"),
+    db: AsyncSession = Depends(get_read_session)
 ):
     """
     Получить общую статистику системы для дашборда.
     
+    При DASHBOARD_ROLLUPS_ENABLED статистика берется из предагрегированных
+    сверток, иначе (или если свертки еще не построены) считается на лету.
+    
+    Args:
+        enterprise_id: Фильтр по предприятию
+    
     Returns:
         Общая статистика системы:
         - total_audits: Общее количество аудитов
@@ -29,15 +39,21 @@ async def get_dashboard_stats(
         - overdue_findings: Количество просроченных несоответствий
         - total_users: Общее количество пользователей
         - active_users: Количество активных пользователей
+        - refreshed_at: Время обновления сверток
     """
-    stats = await crud_dashboard.get_dashboard_stats(db=db)
+    if settings.DASHBOARD_ROLLUPS_ENABLED:
+        stats = await crud_dashboard.get_dashboard_stats_from_rollup(db=db, enterprise_id=enterprise_id)
+        if stats is not None:
+            return stats
+    
+    stats = await crud_dashboard.get_dashboard_stats(db=db, enterprise_id=enterprise_id)
     return stats
 
 
 @router.get("/my_tasks", response_model=MyTaskResponse)
 async def get_my_tasks(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     """
     Получить количество задач текущего пользователя.
@@ -56,7 +72,7 @@ async def get_my_tasks(
 async def get_my_tasks_detail(
     current_user: User = Depends(get_current_user),
     limit: int = Query(10, ge=1, le=50, description="Максимальное количество записей для каждого типа задач"),
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     """
     Получить детальный список задач текущего пользователя.
@@ -1,8 +1,9 @@
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_session
+from app.core.pagination import set_next_cursor
 from app.crud import dictionary as crud_dictionary
 from app.schemas.dictionary import (
     DictionaryTypeCreate,
@@ -19,8 +20,10 @@ router = APIRouter(prefix="/dictionaries", tags=["dictionaries"])
 
 @router.get("/types", response_model=List[DictionaryTypeResponse])
 async def get_dictionary_types(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     db: AsyncSession = Depends(get_session)
 ):
     """
@@ -29,6 +32,7 @@ async def get_dictionary_types(
     Args:
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         db: Сессия базы данных
     
     Returns:
@@ -37,8 +41,10 @@ async def get_dictionary_types(
     dictionary_types = await crud_dictionary.get_dictionary_types(
         db=db,
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=cursor
     )
+    set_next_cursor(response, dictionary_types, limit)
     return dictionary_types
 
 
@@ -151,8 +157,10 @@ async def delete_dictionary_type(
 
 @router.get("/", response_model=List[DictionaryResponse])
 async def get_dictionaries(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     dictionary_type_id: Optional[UUID] = None,
     enterprise_id: Optional[UUID] = None,
     is_active: Optional[bool] = None,
@@ -164,6 +172,7 @@ async def get_dictionaries(
     Args:
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         dictionary_type_id: Фильтр по типу справочника
         enterprise_id: Фильтр по предприятию
         is_active: Фильтр по статусу активности
@@ -176,10 +185,12 @@ async def get_dictionaries(
         db=db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         dictionary_type_id=dictionary_type_id,
         enterprise_id=enterprise_id,
         is_active=is_active
     )
+    set_next_cursor(response, dictionaries, limit)
     return dictionaries
 
 
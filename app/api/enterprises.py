@@ -1,8 +1,9 @@
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_session
+from app.core.pagination import set_next_cursor
 from app.crud import enterprise as crud_enterprise
 from app.schemas.enterprise import EnterpriseCreate, EnterpriseUpdate, EnterpriseResponse
 
@@ -12,8 +13,10 @@ router = APIRouter(prefix="/enterprises", tags=["enterprises"])
 
 @router.get("/", response_model=List[EnterpriseResponse])
 async def get_enterprises(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     is_active: Optional[bool] = None,
     db: AsyncSession = Depends(get_session)
 ):
@@ -23,6 +26,7 @@ async def get_enterprises(
     Args:
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         is_active: Фильтр по статусу активности
         db: Сессия базы данных
     
@@ -33,8 +37,10 @@ async def get_enterprises(
         db=db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         is_active=is_active
     )
+    set_next_cursor(response, enterprises, limit)
     return enterprises
 
 
@@ -1,9 +1,11 @@
 from typing import List, Optional
 from uuid import UUID
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_session
+from app.core.database import get_session, get_read_session
+from app.core.pagination import set_next_cursor
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.crud import finding as crud_finding
@@ -13,6 +15,9 @@ from app.schemas.finding import (
     FindingCreate,
     FindingUpdate,
     FindingResponse,
+    FindingBulkCreate,
+    FindingBulkItemResult,
+    FindingBulkCreateResponse,
     FindingDelegationCreate,
     FindingDelegationResponse,
     FindingCommentCreate,
@@ -27,8 +32,10 @@ router = APIRouter(prefix="/findings", tags=["findings"])
 
 @router.get("/", response_model=List[FindingResponse])
 async def get_findings(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     audit_id: Optional[UUID] = None,
     enterprise_id: Optional[UUID] = None,
     status_id: Optional[UUID] = None,
@@ -44,6 +51,7 @@ async def get_findings(
     Args:
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         audit_id: Фильтр по аудиту
         enterprise_id: Фильтр по предприятию
         status_id: Фильтр по статусу
@@ -60,6 +68,7 @@ async def get_findings(
         db=db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         audit_id=audit_id,
         enterprise_id=enterprise_id,
         status_id=status_id,
@@ -68,6 +77,7 @@ async def get_findings(
         deadline_from=deadline_from,
         deadline_to=deadline_to
     )
+    set_next_cursor(response, findings, limit)
     return findings
 
 
@@ -98,6 +108,58 @@ async def create_finding(
     return await crud_finding.create_finding(db=db, finding=create_schema)
 
 
+@router.post("/bulk", response_model=FindingBulkCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_findings_bulk(
+    bulk: FindingBulkCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Создать пакет несоответствий одной транзакцией.
+    
+    Каждая строка проверяется отдельно: строки с ошибками схемы или ссылок
+    пропускаются и возвращаются с ошибками, остальные создаются.
+    
+    Args:
+        bulk: Строки для создания несоответствий
+        current_user: Текущий пользователь
+        db: Сессия базы данных
+    
+    Returns:
+        Результат по каждой строке запроса
+    """
+    valid = {}
+    errors = {}
+    for index, item in enumerate(bulk.items):
+        try:
+            valid[index] = FindingCreate(**{**item, "created_by_id": current_user.id})
+        except ValidationError as e:
+            errors[index] = [
+                f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}" if error['loc'] else error['msg']
+                for error in e.errors()
+            ]
+    
+    created = {}
+    if valid:
+        created, reference_errors = await crud_finding.create_findings_bulk(db=db, findings=valid)
+        errors.update(reference_errors)
+    
+    results = []
+    for index in range(len(bulk.items)):
+        if index in created:
+            finding_id, finding_number = created[index]
+            results.append(FindingBulkItemResult(
+                index=index,
+                success=True,
+                id=finding_id,
+                finding_number=finding_number
+            ))
+        else:
+            results.append(FindingBulkItemResult(index=index, success=False, errors=errors.get(index, [])))
+    
+    return FindingBulkCreateResponse(created=len(created), failed=len(bulk.items) - len(created), results=results)
+
+
 @router.get("/{finding_id}", response_model=FindingResponse)
 async def get_finding(
     finding_id: UUID,
@@ -116,7 +178,7 @@ async def get_finding(
     Raises:
         HTTPException: Если несоответствие не найдено
     """
-    finding = await crud_finding.get_finding(db, finding_id)
+    finding = await crud_finding.get_finding(db, finding_id, profile="detail")
     if not finding:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -161,8 +223,8 @@ async def update_finding(
         for field in old_finding.__table__.columns.keys()
     }
     
-    # Обновляем несоответствие
-    updated_finding = await crud_finding.update_finding(db, finding_id, finding_update)
+    # Обновляем несоответствие без commit: изменение и его история фиксируются одним commit ниже
+    updated_finding = await crud_finding.update_finding(db, finding_id, finding_update, commit=False)
     if not updated_finding:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -187,9 +249,8 @@ async def update_finding(
     )
     
     await db.commit()
-    await db.refresh(updated_finding)
     
-    return updated_finding
+    return await crud_finding.get_finding(db, finding_id, profile="detail")
 
 
 @router.delete("/{finding_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -260,8 +321,10 @@ async def delegate_finding(
 
 @router.get("/comments/", response_model=List[FindingCommentResponse])
 async def get_finding_comments(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     finding_id: Optional[UUID] = Query(None, description="Фильтр по несоответствию"),
     db: AsyncSession = Depends(get_session)
 ):
@@ -271,6 +334,7 @@ async def get_finding_comments(
     Args:
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         finding_id: Фильтр по несоответствию
         db: Сессия базы данных
     
@@ -281,8 +345,10 @@ async def get_finding_comments(
         db=db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         finding_id=finding_id
     )
+    set_next_cursor(response, comments, limit)
     return comments
 
 
@@ -367,10 +433,12 @@ async def delete_finding_comment(
 
 @router.get("/{finding_id}/history", response_model=List[ChangeHistoryResponse])
 async def get_finding_history(
+    response: Response,
     finding_id: UUID,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_session),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -380,6 +448,7 @@ async def get_finding_history(
         finding_id: UUID несоответствия
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         db: Сессия базы данных
         current_user: Текущий авторизованный пользователь
     
@@ -404,9 +473,11 @@ async def get_finding_history(
         db=db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         entity_type='finding',
         entity_id=finding_id
     )
     
+    set_next_cursor(response, history, limit, sort_attr="changed_at")
     return history
 
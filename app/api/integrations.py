@@ -1,8 +1,9 @@
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_session
+from app.core.pagination import set_next_cursor
 from app.crud import s3_storage as crud_s3, email_account as crud_email, ldap_connection as crud_ldap
 from app.schemas.s3_storage import S3StorageCreate, S3StorageUpdate, S3StorageResponse, S3StorageTestResponse
 from app.schemas.email_account import EmailAccountCreate, EmailAccountUpdate, EmailAccountResponse, EmailAccountTestResponse
@@ -20,8 +21,10 @@ router = APIRouter(prefix="/integrations", tags=["integrations"])
 
 @router.get("/s3_storages", response_model=List[S3StorageResponse])
 async def get_s3_storages(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     enterprise_id: Optional[UUID] = None,
     division_id: Optional[UUID] = None,
     is_active: Optional[bool] = None,
@@ -34,6 +37,7 @@ async def get_s3_storages(
     Args:
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         enterprise_id: Фильтр по ID предприятия
         division_id: Фильтр по ID дивизиона
         is_active: Фильтр по статусу активности
@@ -47,10 +51,12 @@ async def get_s3_storages(
         db=db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         enterprise_id=enterprise_id,
         division_id=division_id,
         is_active=is_active
     )
+    set_next_cursor(response, storages, limit)
     return storages
 
 
@@ -182,8 +188,10 @@ async def test_s3_storage(
 
 @router.get("/email_accounts", response_model=List[EmailAccountResponse])
 async def get_email_accounts(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     enterprise_id: Optional[UUID] = None,
     division_id: Optional[UUID] = None,
     is_active: Optional[bool] = None,
@@ -196,6 +204,7 @@ async def get_email_accounts(
     Args:
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         enterprise_id: Фильтр по ID предприятия
         division_id: Фильтр по ID дивизиона
         is_active: Фильтр по статусу активности
@@ -209,10 +218,12 @@ async def get_email_accounts(
         db=db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         enterprise_id=enterprise_id,
         division_id=division_id,
         is_active=is_active
     )
+    set_next_cursor(response, accounts, limit)
     return accounts
 
 
@@ -351,8 +362,10 @@ async def test_email_account(
 
 @router.get("/ldap_connections", response_model=List[LdapConnectionResponse])
 async def get_ldap_connections(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     enterprise_id: Optional[UUID] = None,
     division_id: Optional[UUID] = None,
     is_active: Optional[bool] = None,
@@ -365,6 +378,7 @@ async def get_ldap_connections(
     Args:
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         enterprise_id: Фильтр по ID предприятия
         division_id: Фильтр по ID дивизиона
         is_active: Фильтр по статусу активности
@@ -378,10 +392,12 @@ async def get_ldap_connections(
         db=db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         enterprise_id=enterprise_id,
         division_id=division_id,
         is_active=is_active
     )
+    set_next_cursor(response, connections, limit)
     return connections
 
 
@@ -1,16 +1,21 @@
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
 from app.core.database import get_session
+from app.core.pagination import set_next_cursor
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.crud import notification as crud_notification
+from app.services.stats_cache import notification_stats_cache
 from app.schemas.notification import (
     NotificationCreate,
     NotificationUpdate,
     NotificationResponse,
     NotificationStatsResponse,
+    NotificationBulkRead,
+    NotificationEntityRead,
     NotificationQueueResponse,
     NotificationQueueStatsResponse
 )
@@ -21,8 +26,10 @@ router = APIRouter(prefix="/notifications", tags=["notifications"])
 
 @router.get("/", response_model=List[NotificationResponse])
 async def get_notifications(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     event_type: Optional[str] = None,
     entity_type: Optional[str] = None,
     entity_id: Optional[UUID] = None,
@@ -36,6 +43,7 @@ async def get_notifications(
     Args:
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         event_type: Фильтр по типу события
         entity_type: Фильтр по типу сущности
         entity_id: Фильтр по ID сущности
@@ -50,12 +58,14 @@ async def get_notifications(
         db=db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         user_id=current_user.id,
         event_type=event_type,
         entity_type=entity_type,
         entity_id=entity_id,
         is_read=is_read
     )
+    set_next_cursor(response, notifications, limit)
     return notifications
 
 
@@ -76,10 +86,9 @@ async def get_notification_stats(
     Returns:
         Статистика уведомлений
     """
-    stats = await crud_notification.get_notification_stats(
-        db=db,
-        user_id=current_user.id,
-        days=days
+    stats = await notification_stats_cache.get_or_set(
+        ("notifications", current_user.id, days),
+        lambda: crud_notification.get_notification_stats(db=db, user_id=current_user.id, days=days)
     )
     return stats
 
@@ -106,6 +115,84 @@ async def mark_all_notifications_as_read(
     return {"count": count}
 
 
+@router.post("/read_bulk", status_code=status.HTTP_200_OK)
+async def mark_notifications_as_read(
+    payload: NotificationBulkRead,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Отметить прочитанными уведомления из списка ID.
+    
+    Уведомления других пользователей пропускаются.
+    
+    Args:
+        payload: Список ID уведомлений
+        current_user: Текущий пользователь
+        db: Сессия базы данных
+    
+    Returns:
+        Количество обновленных уведомлений
+    """
+    count = await crud_notification.mark_notifications_as_read(
+        db=db,
+        user_id=current_user.id,
+        notification_ids=payload.ids
+    )
+    return {"count": count}
+
+
+@router.post("/read_by_entity", status_code=status.HTTP_200_OK)
+async def mark_entity_notifications_as_read(
+    payload: NotificationEntityRead,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Отметить прочитанными все уведомления по сущности (например, несоответствию).
+    
+    Args:
+        payload: Тип и ID сущности
+        current_user: Текущий пользователь
+        db: Сессия базы данных
+    
+    Returns:
+        Количество обновленных уведомлений
+    """
+    count = await crud_notification.mark_entity_notifications_as_read(
+        db=db,
+        user_id=current_user.id,
+        entity_type=payload.entity_type,
+        entity_id=payload.entity_id
+    )
+    return {"count": count}
+
+
+@router.delete("/older_than", status_code=status.HTTP_200_OK)
+async def delete_old_notifications(
+    days: int = Query(..., ge=1, description="Удалить уведомления старше указанного числа дней"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Удалить (мягко) уведомления текущего пользователя старше days дней.
+    
+    Args:
+        days: Возраст уведомлений в днях
+        current_user: Текущий пользователь
+        db: Сессия базы данных
+    
+    Returns:
+        Количество удаленных уведомлений
+    """
+    count = await crud_notification.delete_notifications_older_than(
+        db=db,
+        user_id=current_user.id,
+        days=days
+    )
+    return {"count": count}
+
+
 @router.post("/{notification_id}/read", response_model=NotificationResponse)
 async def mark_notification_as_read(
     notification_id: UUID,
@@ -172,14 +259,22 @@ async def get_notification_queue_stats(
             detail="Недостаточно прав для просмотра статистики очереди"
         )
     
-    stats = await crud_notification.get_notification_queue_stats(db=db)
+    stats = await notification_stats_cache.get_or_set(
+        ("queue",),
+        lambda: crud_notification.get_notification_queue_stats(
+            db=db,
+            speed_window_minutes=settings.NOTIFICATION_QUEUE_SPEED_WINDOW_MINUTES
+        )
+    )
     return stats
 
 
 @router.get("/queue", response_model=List[NotificationQueueResponse])
 async def get_notification_queue(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     notification_id: Optional[UUID] = None,
     channel: Optional[str] = None,
     status: Optional[str] = None,
@@ -192,6 +287,7 @@ async def get_notification_queue(
     Args:
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         notification_id: Фильтр по ID уведомления
         channel: Фильтр по каналу
         status: Фильтр по статусу
@@ -214,17 +310,22 @@ async def get_notification_queue(
         db=db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         notification_id=notification_id,
         channel=channel,
         status=status
     )
+    set_next_cursor(response, queue_items, limit)
     return queue_items
 
 
 @router.get("/failed", response_model=List[NotificationResponse])
 async def get_failed_notifications(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
+    channel: Optional[str] = Query(None, pattern="^(email|telegram)$"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_session)
 ):
@@ -234,6 +335,8 @@ async def get_failed_notifications(
     Args:
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
+        channel: Только ошибки указанного канала
         current_user: Текущий пользователь
         db: Сессия базы данных
     
@@ -249,17 +352,14 @@ async def get_failed_notifications(
             detail="Недостаточно прав для просмотра неудачных уведомлений"
         )
     
-    notifications = await crud_notification.get_notifications(
+    notifications = await crud_notification.get_failed_notifications(
         db=db,
         skip=skip,
         limit=limit,
-        user_id=None
+        cursor=cursor,
+        channel=channel
     )
     
-    failed_notifications = [
-        n for n in notifications 
-        if n.email_error or n.telegram_error
-    ]
-    
-    return failed_notifications[:limit]
+    set_next_cursor(response, notifications, limit)
+    return notifications
 
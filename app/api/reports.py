@@ -1,21 +1,39 @@
 from typing import Optional
 from uuid import UUID
-from datetime import date
-from fastapi import APIRouter, Depends, Query, Response
+from datetime import date, datetime, timedelta, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_session
+from app.core.config import settings
+from app.core.database import get_session, get_read_session
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.dependencies import get_current_user
 from app.crud import report as crud_report
+from app.crud import export_task as crud_export_task
+from app.crud.s3_storage import get_default_s3_storage
+from app.models.export_task import ExportTask, ExportTaskStatus
+from app.models.user import User
+from app.schemas.export_task import ExportTaskCreate, ExportTaskResponse, ExportTaskStatusResponse
 from app.schemas.report import (
     ReportFilter,
+    ReportExportCreate,
+    ReportFormatName,
     FindingsReportResponse,
     ProcessReportResponse,
     SolverReportResponse
 )
-from app.services.export import (
-    export_findings_to_excel,
-    export_process_to_excel,
-    export_solver_to_excel
+from app.services.report_export import (
+    FINDINGS_REPORT,
+    PROCESS_REPORT,
+    SOLVER_REPORT,
+    REPORT_EXPORTS,
+    get_report_cache_key,
+    report_export_filename,
+    report_response,
+    rows_as_chunks
 )
+from app.services.s3 import generate_presigned_url
+from app.services.tasks import export_report_task
 
 
 router = APIRouter(prefix="/reports", tags=["reports"])
@@ -23,6 +41,7 @@ router = APIRouter(prefix="/reports", tags=["reports"])
 
 @router.get("/findings", response_model=FindingsReportResponse)
 async def get_findings_report(
+    response: Response,
     enterprise_id: Optional[UUID] = Query(None, description="Фильтр по предприятию"),
     date_from: Optional[date] = Query(None, description="Начальная дата"),
     date_to: Optional[date] = Query(None, description="Конечная дата"),
@@ -30,15 +49,23 @@ async def get_findings_report(
     finding_type: Optional[str] = Query(None, description="Тип несоответствия (CAR1, CAR2, OFI)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(1000, ge=1, le=10000),
-    db: AsyncSession = Depends(get_session)
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
+    estimated_total: bool = Query(False, description="Оценка общего количества вместо точного подсчета"),
+    db: AsyncSession = Depends(get_read_session)
 ):
     """
     Получить отчет по несоответствиям.
     
+    Args:
+        skip: Количество записей для пропуска
+        limit: Размер страницы (1-10000)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
+        estimated_total: Вернуть в total оценку планировщика (быстрее на больших выборках)
+    
     Returns:
         Отчет по несоответствиям с фильтрацией и пагинацией
     """
-    data, total = await crud_report.get_findings_report(
+    data, total, next_page = await crud_report.get_findings_report(
         db=db,
         enterprise_id=enterprise_id,
         date_from=date_from,
@@ -46,8 +73,12 @@ async def get_findings_report(
         status_id=status_id,
         finding_type=finding_type,
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=cursor,
+        estimated_total=estimated_total
     )
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
     
     return FindingsReportResponse(total=total, data=data)
 
@@ -59,34 +90,30 @@ async def export_findings_report(
     date_to: Optional[date] = Query(None),
     status_id: Optional[UUID] = Query(None),
     finding_type: Optional[str] = Query(None),
-    db: AsyncSession = Depends(get_session)
+    export_format: ReportFormatName = Query("xlsx", alias="format", description="Формат файла"),
+    db: AsyncSession = Depends(get_read_session)
 ):
     """
-    Экспортировать отчет по несоответствиям в Excel.
+    Экспортировать отчет по несоответствиям в Excel, CSV, JSON Lines или Parquet.
+    
+    Строки читаются из БД пачками и пишутся в файл потоково,
+    поэтому выгружаются все несоответствия, подходящие под фильтр.
+    CSV и JSON Lines отдаются по мере чтения курсора.
     
     Returns:
-        Excel файл
+        Файл отчета
     """
-    data, _ = await crud_report.get_findings_report(
+    chunks = crud_report.stream_findings_report(
         db=db,
         enterprise_id=enterprise_id,
         date_from=date_from,
         date_to=date_to,
         status_id=status_id,
         finding_type=finding_type,
-        skip=0,
-        limit=10000
+        chunk_size=settings.REPORT_EXPORT_CHUNK_SIZE
     )
     
-    excel_file = export_findings_to_excel(data)
-    
-    return Response(
-        content=excel_file.read(),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": f"attachment; filename=findings_report_{date.today().isoformat()}.xlsx"
-        }
-    )
+    return await report_response(FINDINGS_REPORT, chunks, export_format)
 
 
 @router.get("/by_processes", response_model=ProcessReportResponse)
@@ -94,7 +121,7 @@ async def get_process_report(
     enterprise_id: Optional[UUID] = Query(None, description="Фильтр по предприятию"),
     date_from: Optional[date] = Query(None, description="Начальная дата"),
     date_to: Optional[date] = Query(None, description="Конечная дата"),
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     """
     Получить отчет по процессам.
@@ -117,13 +144,14 @@ async def export_process_report(
     enterprise_id: Optional[UUID] = Query(None),
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
-    db: AsyncSession = Depends(get_session)
+    export_format: ReportFormatName = Query("xlsx", alias="format", description="Формат файла"),
+    db: AsyncSession = Depends(get_read_session)
 ):
     """
-    Экспортировать отчет по процессам в Excel.
+    Экспортировать отчет по процессам в Excel, CSV, JSON Lines или Parquet.
     
     Returns:
-        Excel файл
+        Файл отчета
     """
     data = await crud_report.get_process_report(
         db=db,
@@ -132,15 +160,7 @@ async def export_process_report(
         date_to=date_to
     )
     
-    excel_file = export_process_to_excel(data)
-    
-    return Response(
-        content=excel_file.read(),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": f"attachment; filename=process_report_{date.today().isoformat()}.xlsx"
-        }
-    )
+    return await report_response(PROCESS_REPORT, rows_as_chunks(data), export_format)
 
 
 @router.get("/by_solvers", response_model=SolverReportResponse)
@@ -148,7 +168,7 @@ async def get_solver_report(
     enterprise_id: Optional[UUID] = Query(None, description="Фильтр по предприятию"),
     date_from: Optional[date] = Query(None, description="Начальная дата"),
     date_to: Optional[date] = Query(None, description="Конечная дата"),
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     """
     Получить отчет по исполнителям.
@@ -171,13 +191,14 @@ async def export_solver_report(
     enterprise_id: Optional[UUID] = Query(None),
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
-    db: AsyncSession = Depends(get_session)
+    export_format: ReportFormatName = Query("xlsx", alias="format", description="Формат файла"),
+    db: AsyncSession = Depends(get_read_session)
 ):
     """
-    Экспортировать отчет по исполнителям в Excel.
+    Экспортировать отчет по исполнителям в Excel, CSV, JSON Lines или Parquet.
     
     Returns:
-        Excel файл
+        Файл отчета
     """
     data = await crud_report.get_solver_report(
         db=db,
@@ -186,13 +207,173 @@ async def export_solver_report(
         date_to=date_to
     )
     
-    excel_file = export_solver_to_excel(data)
+    return await report_response(SOLVER_REPORT, rows_as_chunks(data), export_format)
+
+
+
+@router.post("/exports", response_model=ExportTaskResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_report_export(
+    export: ReportExportCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Создать задачу фоновой выгрузки отчета в файл (xlsx, csv, jsonl или parquet).
+    
+    Если отчет с теми же фильтрами уже выгружался и данные с тех пор не менялись
+    (в пределах REPORT_EXPORT_CACHE_HOURS), задача сразу создается завершенной
+    и ссылается на готовый файл.
+    
+    Args:
+        export: Тип отчета и фильтры
+        current_user: Текущий пользователь
+        db: Сессия базы данных
+    
+    Returns:
+        Задача экспорта со статусом PENDING или COMPLETED
+    """
+    params = {
+        **REPORT_EXPORTS[export.report_type].filter_values(export.model_dump(mode="json")),
+        "format": export.format
+    }
+    cache_key, watermark = await get_report_cache_key(db, export.report_type, export.model_dump(), export.format)
+    
+    cached = await crud_export_task.get_cached_report_export(
+        db,
+        cache_key,
+        completed_after=datetime.now(timezone.utc) - timedelta(hours=settings.REPORT_EXPORT_CACHE_HOURS)
+    )
     
-    return Response(
-        content=excel_file.read(),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": f"attachment; filename=solver_report_{date.today().isoformat()}.xlsx"
-        }
+    export_task_create = ExportTaskCreate(
+        report_type=export.report_type,
+        params=params,
+        cache_key=cache_key,
+        data_watermark=watermark
     )
+    if cached:
+        export_task_create.status = ExportTaskStatus.COMPLETED
+        export_task_create.file_path = cached.file_path
+        export_task_create.completed_at = datetime.now(timezone.utc)
+    
+    export_task = await crud_export_task.create_export_task(
+        db=db,
+        export_task=export_task_create,
+        user_id=current_user.id
+    )
+    
+    if not cached:
+        export_report_task.delay(str(export_task.id))
+    
+    return export_task
+
 
+async def _get_report_export_task(db: AsyncSession, task_id: UUID, current_user: User) -> ExportTask:
+    export_task = await crud_export_task.get_export_task(db, task_id)
+    
+    if not export_task or not export_task.report_type:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export task not found"
+        )
+    
+    if export_task.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have access to this export task"
+        )
+    
+    return export_task
+
+
+async def _report_download_url(db: AsyncSession, export_task: ExportTask) -> Optional[str]:
+    storage = await get_default_s3_storage(db)
+    if not storage:
+        return None
+    
+    return generate_presigned_url(
+        storage=storage,
+        s3_key=export_task.file_path,
+        expiration=settings.REPORT_EXPORT_URL_EXPIRE_SECONDS,
+        filename=report_export_filename(
+            export_task.report_type,
+            export_task.completed_at,
+            (export_task.params or {}).get("format", "xlsx")
+        )
+    )
+
+
+@router.get("/exports/{task_id}", response_model=ExportTaskStatusResponse)
+async def get_report_export_status(
+    task_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Получить статус задачи выгрузки отчета.
+    
+    Для завершенной задачи возвращается pre-signed URL для скачивания файла.
+    
+    Args:
+        task_id: ID задачи экспорта
+        current_user: Текущий пользователь
+        db: Сессия базы данных
+    
+    Returns:
+        Статус задачи экспорта
+    
+    Raises:
+        HTTPException: Если задача не найдена или принадлежит другому пользователю
+    """
+    export_task = await _get_report_export_task(db, task_id, current_user)
+    
+    download_url = None
+    if export_task.status == ExportTaskStatus.COMPLETED and export_task.file_path:
+        download_url = await _report_download_url(db, export_task)
+    
+    return ExportTaskStatusResponse(
+        task_id=export_task.id,
+        celery_task_id=export_task.celery_task_id,
+        status=export_task.status,
+        file_path=export_task.file_path,
+        error_message=export_task.error_message,
+        completed_at=export_task.completed_at,
+        download_url=download_url
+    )
+
+
+@router.get("/exports/{task_id}/download")
+async def download_report_export(
+    task_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Перенаправить на pre-signed URL выгруженного отчета.
+    
+    Args:
+        task_id: ID задачи экспорта
+        current_user: Текущий пользователь
+        db: Сессия базы данных
+    
+    Returns:
+        Редирект на файл в S3
+    
+    Raises:
+        HTTPException: Если задача не найдена или не завершена
+    """
+    export_task = await _get_report_export_task(db, task_id, current_user)
+    
+    if export_task.status != ExportTaskStatus.COMPLETED or not export_task.file_path:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Export task is not completed. Current status: {export_task.status}"
+        )
+    
+    download_url = await _report_download_url(db, export_task)
+    if not download_url:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to generate download URL"
+        )
+    
+    return RedirectResponse(download_url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
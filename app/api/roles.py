@@ -1,8 +1,9 @@
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_session
+from app.core.pagination import set_next_cursor
 from app.crud import role as crud_role
 from app.schemas.role import RoleCreate, RoleUpdate, RoleResponse, PermissionCreate, PermissionResponse
 
@@ -12,8 +13,10 @@ router = APIRouter(prefix="/roles", tags=["roles"])
 
 @router.get("/", response_model=List[RoleResponse])
 async def get_roles(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     is_system: Optional[bool] = None,
     db: AsyncSession = Depends(get_session)
 ):
@@ -23,6 +26,7 @@ async def get_roles(
     Args:
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         is_system: Фильтр по типу роли (системная/пользовательская)
         db: Сессия базы данных
     
@@ -33,8 +37,10 @@ async def get_roles(
         db=db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         is_system=is_system
     )
+    set_next_cursor(response, roles, limit)
     return roles
 
 
@@ -1,8 +1,9 @@
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_session
+from app.core.pagination import set_next_cursor
 from app.crud import system_setting as crud_setting
 from app.schemas.system_setting import SystemSettingCreate, SystemSettingUpdate, SystemSettingResponse
 from app.models.user import User
@@ -14,8 +15,10 @@ router = APIRouter(prefix="/settings", tags=["settings"])
 
 @router.get("/", response_model=List[SystemSettingResponse])
 async def get_settings(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     category: Optional[str] = None,
     is_public: Optional[bool] = None,
     db: AsyncSession = Depends(get_session),
@@ -27,6 +30,7 @@ async def get_settings(
     Args:
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         category: Фильтр по категории настроек
         is_public: Фильтр по публичности настройки
         db: Сессия базы данных
@@ -39,9 +43,11 @@ async def get_settings(
         db=db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         category=category,
         is_public=is_public
     )
+    set_next_cursor(response, settings, limit)
     return settings
 
 
@@ -9,6 +9,7 @@ from app.core.database import get_db
 from app.core.config import settings
 from app.models.user import User
 from app.api.auth import get_current_user
+from app.services.principal_cache import principal_cache
 from app.schemas.api_token import TelegramLinkResponse
 
 router = APIRouter(prefix="/auth/telegram", tags=["telegram"])
@@ -71,6 +72,7 @@ async def confirm_telegram_link(
     await redis_client.delete(f"telegram_linked:{current_user.email}")
     
     await db.commit()
+    await principal_cache.invalidate(current_user.id)
     
     return TelegramLinkResponse(
         message="Telegram account linked successfully",
@@ -90,6 +92,7 @@ async def unlink_telegram(
     current_user.telegram_linked_at = None
     
     await db.commit()
+    await principal_cache.invalidate(current_user.id)
     
     return {"message": "Telegram account unlinked successfully"}
 
@@ -1,8 +1,9 @@
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_session
+from app.core.pagination import set_next_cursor
 from app.crud import user as crud_user
 from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserMeResponse
 from app.models.user import User
@@ -13,8 +14,10 @@ router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/", response_model=List[UserResponse])
 async def get_users(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     is_active: Optional[bool] = None,
     location_id: Optional[UUID] = None,
     db: AsyncSession = Depends(get_session)
@@ -25,6 +28,7 @@ async def get_users(
     Args:
         skip: Количество записей для пропуска
         limit: Максимальное количество записей для возврата (1-100)
+        cursor: Курсор следующей страницы (если передан, skip не используется)
         is_active: Фильтр по статусу активности
         location_id: Фильтр по ID локации
         db: Сессия базы данных
@@ -36,9 +40,11 @@ async def get_users(
         db=db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         is_active=is_active,
         location_id=location_id
     )
+    set_next_cursor(response, users, limit)
     return users
 
 
@@ -101,6 +107,7 @@ async def get_current_user_info(
         last_name_en=current_user.last_name_en,
         location_id=current_user.location_id,
         language=current_user.language,
+        notification_digest_minutes=current_user.notification_digest_minutes,
         is_auditor=current_user.is_auditor,
         is_expert=current_user.is_expert,
         is_active=current_user.is_active,
@@ -149,6 +156,7 @@ async def update_current_user(
         last_name_en=updated_user.last_name_en,
         location_id=updated_user.location_id,
         language=updated_user.language,
+        notification_digest_minutes=updated_user.notification_digest_minutes,
         is_auditor=updated_user.is_auditor,
         is_expert=updated_user.is_expert,
         is_active=updated_user.is_active,
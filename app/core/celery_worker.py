@@ -30,7 +30,19 @@ celery_app.conf.update(
         },
         "retry-failed-notifications": {
             "task": "app.services.tasks.retry_failed_notifications",
-            "schedule": 300.0,
+            "schedule": 60.0,
+        },
+        "refresh-dashboard-rollups": {
+            "task": "app.services.tasks.refresh_dashboard_rollups",
+            "schedule": 60.0,
+        },
+        "reconcile-findings-summary": {
+            "task": "app.services.tasks.reconcile_findings_summary",
+            "schedule": 86400.0,
+        },
+        "maintain-partitions": {
+            "task": "app.services.tasks.maintain_partitions",
+            "schedule": 86400.0,
         },
     },
 )
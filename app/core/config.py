@@ -10,6 +10,20 @@ class Settings(BaseSettings):
     )
 
     DATABASE_URL: str
+    READ_REPLICA_URL: str = ""
+    READ_REPLICA_MAX_LAG_SECONDS: float = 10.0
+    READ_REPLICA_CHECK_INTERVAL: float = 5.0
+    READ_REPLICA_ROUTES: str = "/api/v1/reports,/api/v1/dashboard,/api/v1/change_history"
+
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_NULL_POOL: bool = False
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    DB_APPLICATION_NAME: str = "mgc_audits"
     REDIS_URL: str = "redis://localhost:6379/0"
 
     SECRET_KEY: str
@@ -22,6 +36,47 @@ class Settings(BaseSettings):
     FRONTEND_URL: str = "http://localhost:3000"
     
     TELEGRAM_BOT_TOKEN: str = ""
+    TELEGRAM_API_BASE_URL: str = "https://api.telegram.org/bot"
+    TELEGRAM_GLOBAL_RATE_PER_SECOND: float = 30.0
+    TELEGRAM_CHAT_RATE_PER_SECOND: float = 1.0
+    TELEGRAM_GROUP_RATE_PER_MINUTE: float = 20.0
+    TELEGRAM_MAX_RETRIES: int = 3
+    TELEGRAM_SHARED_RATE_LIMIT: bool = True
+
+    PRINCIPAL_CACHE_ENABLED: bool = True
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PERMISSION_CACHE_TTL_SECONDS: int = 300
+
+    DASHBOARD_ROLLUPS_ENABLED: bool = False
+
+    CHANGE_HISTORY_DEFERRED: bool = False
+
+    SMTP_POOL_SIZE: int = 4
+    SMTP_POOL_MAX_MESSAGES_PER_CONNECTION: int = 100
+    SMTP_TIMEOUT_SECONDS: float = 30.0
+
+    NOTIFICATION_IMMEDIATE_DELIVERY: bool = True
+    NOTIFICATION_OUTBOX_BATCH_SIZE: int = 50
+    NOTIFICATION_OUTBOX_CONCURRENCY: int = 4
+    NOTIFICATION_TELEGRAM_CONCURRENCY: int = 16
+    NOTIFICATION_CLAIM_TIMEOUT_SECONDS: int = 300
+    NOTIFICATION_DIGEST_WINDOW_MINUTES: int = 0
+    NOTIFICATION_DIGEST_MAX_ITEMS: int = 50
+    NOTIFICATION_RETRY_BASE_SECONDS: int = 60
+    NOTIFICATION_RETRY_MAX_SECONDS: int = 3600
+    NOTIFICATION_RETRY_BATCH_SIZE: int = 500
+    NOTIFICATION_STATS_CACHE_SECONDS: int = 5
+    NOTIFICATION_QUEUE_SPEED_WINDOW_MINUTES: int = 5
+
+    REPORT_EXPORT_CHUNK_SIZE: int = 2000
+    REPORT_EXPORT_CACHE_HOURS: int = 24
+    REPORT_EXPORT_URL_EXPIRE_SECONDS: int = 3600
+
+    PARTITION_PREMAKE_MONTHS: int = 2
+    PARTITION_ARCHIVE_PREFIX: str = "archive/"
+    NOTIFICATION_RETENTION_MONTHS: int = 12
+    NOTIFICATION_QUEUE_RETENTION_MONTHS: int = 3
+    CHANGE_HISTORY_RETENTION_MONTHS: int = 36
 
 
 settings = Settings()
@@ -1,17 +1,164 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
-from typing import AsyncGenerator
+import time
+import logging
+from typing import AsyncGenerator, Optional, Dict, Any
+from fastapi import Request
+from sqlalchemy import event, text, Select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 from app.core.config import settings
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=False,
-    future=True,
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMetrics:
+    """
+    Счетчики пула соединений одного движка.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_time_total += seconds
+        if seconds > self.wait_time_max:
+            self.wait_time_max = seconds
+
+
+def _metered_pool_class(metrics: PoolMetrics) -> type:
+    """
+    Пул, замеряющий время ожидания свободного соединения.
+
+    Метрики хранятся в атрибуте класса, поэтому переживают pool.recreate().
+    """
+
+    class MeteredQueuePool(AsyncAdaptedQueuePool):
+        pool_metrics = metrics
+
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                self.pool_metrics.record_wait(time.perf_counter() - started)
+
+    return MeteredQueuePool
+
+
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+def _engine_kwargs(url: str, metrics: PoolMetrics) -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {"echo": False}
+
+    if url.startswith("sqlite"):
+        return kwargs
+
+    if settings.DB_NULL_POOL:
+        kwargs["poolclass"] = NullPool
+    else:
+        kwargs.update(
+            poolclass=_metered_pool_class(metrics),
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+
+    if url.startswith("postgresql+asyncpg"):
+        server_settings = {"application_name": settings.DB_APPLICATION_NAME}
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        kwargs["connect_args"] = {
+            "server_settings": server_settings,
+            "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        }
+
+    return kwargs
+
+
+def build_engine(url: str, name: str) -> AsyncEngine:
+    """
+    Создать движок с настройками пула из Settings и подключить сбор метрик.
+
+    Args:
+        url: URL базы данных
+        name: Имя движка для метрик ('primary', 'replica')
+
+    Returns:
+        Асинхронный движок SQLAlchemy
+    """
+    metrics = PoolMetrics(name)
+    pool_metrics[name] = metrics
+    async_engine = create_async_engine(url, **_engine_kwargs(url, metrics))
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+
+    @event.listens_for(async_engine.sync_engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidations += 1
+
+    return async_engine
+
+
+engine = build_engine(settings.DATABASE_URL, "primary")
+
+replica_engine: Optional[AsyncEngine] = (
+    build_engine(settings.READ_REPLICA_URL, "replica") if settings.READ_REPLICA_URL else None
 )
 
+class AppSession(Session):
+    """
+    Синхронная сессия приложения.
+
+    Обработчики событий ORM, которые должны работать только в сессиях
+    приложения (а не во всех Session процесса), регистрируются на этот класс.
+    """
+
+
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=AppSession,
+    expire_on_commit=False,
+    autoflush=False,
+    autocommit=False,
+)
+
+
+class RoutingSession(AppSession):
+    """
+    Сессия, направляющая SELECT-запросы в реплику, а flush и DML - в основную БД.
+
+    Реплика используется только если она настроена и session.info["use_replica"] истинно.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            replica_engine is not None
+            and self.info.get("use_replica")
+            and not self._flushing
+            and (clause is None or isinstance(clause, Select))
+        ):
+            return replica_engine.sync_engine
+        return engine.sync_engine
+
+
+async_read_session_maker = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    info={"use_replica": True},
     expire_on_commit=False,
     autoflush=False,
     autocommit=False,
@@ -30,7 +177,170 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
-def init_db():
-    from app.models import Enterprise, Division, Location, User, Role, Permission, UserRole
-    pass
+get_db = get_session
+
+
+class ReplicaMonitor:
+    """
+    Отслеживает доступность и отставание реплики.
+
+    Результат проверки кэшируется на READ_REPLICA_CHECK_INTERVAL секунд,
+    чтобы запрос отставания не выполнялся на каждый HTTP-запрос.
+    """
+
+    LAG_QUERY = text(
+        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+    )
+
+    def __init__(self):
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+        self.checked_at = 0.0
+        self.served = {"primary": 0, "replica": 0}
+
+    async def is_available(self) -> bool:
+        if replica_engine is None:
+            return False
+
+        if time.monotonic() - self.checked_at < settings.READ_REPLICA_CHECK_INTERVAL:
+            return self.healthy
+
+        self.checked_at = time.monotonic()
+        try:
+            async with replica_engine.connect() as conn:
+                lag = (await conn.execute(self.LAG_QUERY)).scalar()
+            self.lag_seconds = float(lag) if lag is not None else 0.0
+            self.healthy = self.lag_seconds <= settings.READ_REPLICA_MAX_LAG_SECONDS
+        except Exception as e:
+            logger.warning(f"Read replica check failed: {e}")
+            self.lag_seconds = None
+            self.healthy = False
+
+        return self.healthy
+
+    def mark_unavailable(self) -> None:
+        self.healthy = False
+        self.checked_at = time.monotonic()
+
+    def record(self, engine_name: str) -> None:
+        self.served[engine_name] += 1
+
+
+replica_monitor = ReplicaMonitor()
+
+
+def is_replica_route(path: str) -> bool:
+    """
+    Политика маршрутизации: отчеты, дашборд и списки истории изменений читают из реплики.
+
+    Args:
+        path: Путь HTTP-запроса
+
+    Returns:
+        True если запрос можно обслужить репликой
+    """
+    prefixes = [prefix.strip() for prefix in settings.READ_REPLICA_ROUTES.split(",") if prefix.strip()]
+    return any(path.startswith(prefix) for prefix in prefixes) or path.rstrip("/").endswith("/history")
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Сессия для read-only эндпоинтов.
+
+    Направляет запросы в реплику, если маршрут входит в политику, реплика доступна
+    и ее отставание не превышает READ_REPLICA_MAX_LAG_SECONDS. Иначе используется
+    основная БД. Соединение с репликой открывается до передачи сессии эндпоинту:
+    если подключиться не удалось, реплика помечается недоступной, а запрос
+    обслуживается основной БД. Выбранный движок сохраняется в request.state.db_engine.
+    """
+    use_replica = is_replica_route(request.url.path) and await replica_monitor.is_available()
+
+    async with async_read_session_maker(info={"use_replica": use_replica}) as session:
+        if use_replica:
+            try:
+                await session.connection()
+            except (DBAPIError, OSError) as e:
+                logger.warning(f"Read replica connection failed, falling back to primary: {e}")
+                replica_monitor.mark_unavailable()
+                await session.rollback()
+                use_replica = session.info["use_replica"] = False
+
+        engine_name = "replica" if use_replica else "primary"
+        request.state.db_engine = engine_name
+        replica_monitor.record(engine_name)
+
+        try:
+            yield session
+        except (DBAPIError, OSError) as e:
+            if use_replica and (isinstance(e, OSError) or e.connection_invalidated):
+                replica_monitor.mark_unavailable()
+            raise
+        finally:
+            await session.close()
+
+
+def get_pool_metrics() -> Dict[str, Any]:
+    """
+    Состояние пулов соединений для мониторинга.
+
+    Returns:
+        dict: Метрики по каждому движку (primary, replica)
+    """
+    engines = {"primary": engine}
+    if replica_engine is not None:
+        engines["replica"] = replica_engine
+
+    result = {}
+    for name, db_engine in engines.items():
+        pool = db_engine.sync_engine.pool
+        metrics = pool_metrics[name]
+        stats = {
+            "pool_class": type(pool).__name__,
+            "connects": metrics.connects,
+            "invalidations": metrics.invalidations,
+            "checkouts": metrics.checkouts,
+            "wait_time_avg_ms": (metrics.wait_time_total / metrics.checkouts * 1000) if metrics.checkouts else 0.0,
+            "wait_time_max_ms": metrics.wait_time_max * 1000,
+        }
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            stats.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+            )
+        result[name] = stats
+
+    if replica_engine is not None:
+        result["replica"].update(
+            healthy=replica_monitor.healthy,
+            lag_seconds=replica_monitor.lag_seconds,
+        )
+
+    return result
+
+
+async def init_db() -> None:
+    """
+    Регистрирует модели и прогревает пулы соединений при старте приложения.
+
+    Недоступная реплика не мешает запуску: она помечается недоступной,
+    и чтение идет из основной БД до следующей успешной проверки.
+    """
+    import app.models  # noqa: F401
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    if replica_engine is not None and not await replica_monitor.is_available():
+        logger.warning("Read replica is unavailable at startup, reads fall back to primary")
+
 
+async def close_db() -> None:
+    """
+    Закрывает пулы соединений при остановке приложения.
+    """
+    await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
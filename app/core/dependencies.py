@@ -1,13 +1,11 @@
 from typing import List, Optional
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from app.core.database import get_db
 from app.models.user import User
-from app.models.user_role import UserRole
-from app.models.role import Role, Permission
 from app.api.auth import get_current_user
+from app.services.permissions import permission_service
 
 
 async def check_permission(
@@ -33,32 +31,19 @@ async def check_permission(
     Raises:
         HTTPException: Если у пользователя нет прав
     """
-    if current_user.is_superuser:
-        return current_user
+    permission_set = await permission_service.get_permission_set(db, current_user)
     
-    result = await db.execute(
-        select(UserRole)
-        .where(UserRole.user_id == current_user.id)
-        .join(Role)
-        .join(Permission)
-        .where(Permission.resource == resource)
-        .where(Permission.action == action)
-    )
-    
-    user_role = result.scalar_one_or_none()
-    
-    if user_role is None:
+    if not permission_set.allows(resource, action):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"No permission to {action} {resource}"
         )
     
-    if enterprise_id is not None and user_role.enterprise_id is not None:
-        if str(user_role.enterprise_id) != enterprise_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"No permission to {action} {resource} for this enterprise"
-            )
+    if enterprise_id is not None and not permission_set.allows(resource, action, enterprise_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"No permission to {action} {resource} for this enterprise"
+        )
     
     return current_user
 
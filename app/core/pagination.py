@@ -0,0 +1,140 @@
+import base64
+import json
+from datetime import datetime, date
+from typing import Any, Optional, Sequence, Tuple
+from uuid import UUID
+from fastapi import Response
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorError(ValueError):
+    """
+    Курсор пагинации не удалось разобрать.
+    """
+
+
+def encode_cursor(sort_value: Any, row_id: UUID) -> str:
+    """
+    Закодировать позицию (sort_key, id) в непрозрачный курсор.
+
+    Args:
+        sort_value: Значение колонки сортировки последней строки страницы
+        row_id: ID последней строки страницы
+
+    Returns:
+        Курсор в base64url
+    """
+    if isinstance(sort_value, (datetime, date)):
+        sort_value = sort_value.isoformat()
+    elif isinstance(sort_value, UUID):
+        sort_value = str(sort_value)
+    raw = json.dumps([sort_value, str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_column: InstrumentedAttribute) -> Tuple[Any, UUID]:
+    """
+    Разобрать курсор и привести значение сортировки к типу колонки.
+
+    Args:
+        cursor: Курсор из запроса
+        sort_column: Колонка сортировки
+
+    Returns:
+        Кортеж (sort_value, id)
+
+    Raises:
+        InvalidCursorError: Если курсор поврежден
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        python_type = sort_column.type.python_type
+        if sort_value is not None:
+            if python_type is datetime:
+                sort_value = datetime.fromisoformat(sort_value)
+            elif python_type is date:
+                sort_value = date.fromisoformat(sort_value)
+            elif python_type is UUID:
+                sort_value = UUID(sort_value)
+        return sort_value, UUID(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Некорректный курсор пагинации") from e
+
+
+def paginate(
+    stmt: Select,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    descending: bool = True
+) -> Select:
+    """
+    Применить стабильную сортировку (sort_key, id) и keyset-пагинацию.
+
+    С курсором страница начинается строго после позиции курсора, skip игнорируется.
+    Без курсора используется offset(skip) для обратной совместимости.
+
+    Args:
+        stmt: Запрос
+        sort_column: Колонка сортировки (NOT NULL)
+        id_column: Колонка первичного ключа
+        cursor: Курсор предыдущей страницы
+        skip: Смещение (если курсор не передан)
+        limit: Размер страницы
+        descending: Сортировка по убыванию
+
+    Returns:
+        Запрос с ORDER BY, условием курсора и LIMIT
+    """
+    if descending:
+        stmt = stmt.order_by(sort_column.desc(), id_column.desc())
+    else:
+        stmt = stmt.order_by(sort_column.asc(), id_column.asc())
+
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, sort_column)
+        position = tuple_(sort_column, id_column)
+        if descending:
+            stmt = stmt.where(position < tuple_(sort_value, row_id))
+        else:
+            stmt = stmt.where(position > tuple_(sort_value, row_id))
+    elif skip:
+        stmt = stmt.offset(skip)
+
+    return stmt.limit(limit)
+
+
+def next_cursor(items: Sequence[Any], limit: int, sort_attr: str = "created_at") -> Optional[str]:
+    """
+    Курсор следующей страницы или None, если страница неполная.
+
+    Args:
+        items: Строки текущей страницы
+        limit: Запрошенный размер страницы
+        sort_attr: Имя атрибута сортировки
+
+    Returns:
+        Курсор или None
+    """
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(getattr(last, sort_attr), last.id)
+
+
+def set_next_cursor(response: Response, items: Sequence[Any], limit: int, sort_attr: str = "created_at") -> None:
+    """
+    Передать курсор следующей страницы в заголовке X-Next-Cursor.
+
+    Тело списочных ответов остается списком, поэтому старые клиенты не затрагиваются.
+    """
+    cursor = next_cursor(items, limit, sort_attr)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
@@ -7,6 +7,7 @@ import secrets
 import hashlib
 
 from app.models.api_token import APIToken
+from app.core.pagination import paginate
 
 
 def generate_token() -> tuple[str, str]:
@@ -136,6 +137,7 @@ async def get_tokens(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     user_id: Optional[UUID] = None,
     is_active: Optional[bool] = None,
     issued_for: Optional[str] = None
@@ -154,7 +156,7 @@ async def get_tokens(
     if issued_for is not None:
         stmt = stmt.where(APIToken.issued_for == issued_for)
     
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, APIToken.created_at, APIToken.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
@@ -4,6 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.attachment import Attachment
 from app.schemas.attachment import AttachmentCreate, AttachmentUpdate
+from app.core.pagination import paginate
 
 
 async def create_attachment(db: AsyncSession, attachment: AttachmentCreate) -> Attachment:
@@ -34,6 +35,7 @@ async def get_attachments(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     object_id: Optional[UUID] = None,
     content_type: Optional[str] = None
 ) -> List[Attachment]:
@@ -45,7 +47,7 @@ async def get_attachments(
     if content_type is not None:
         stmt = stmt.where(Attachment.content_type == content_type)
     
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, Attachment.created_at, Attachment.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
@@ -5,6 +5,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.audit import Audit
 from app.schemas.audit import AuditCreate, AuditUpdate
+from app.core.pagination import paginate
+from app.crud.loader_profiles import with_profile
 
 
 async def create_audit(db: AsyncSession, audit: AuditCreate) -> Audit:
@@ -70,12 +72,13 @@ async def create_audit(db: AsyncSession, audit: AuditCreate) -> Audit:
         db_audit.shifts = shifts
     
     await db.commit()
-    await db.refresh(db_audit)
-    return db_audit
+    return await get_audit(db, db_audit.id, profile="detail")
 
 
-async def get_audit(db: AsyncSession, audit_id: UUID) -> Optional[Audit]:
+async def get_audit(db: AsyncSession, audit_id: UUID, profile: Optional[str] = None) -> Optional[Audit]:
     stmt = select(Audit).where(Audit.id == audit_id)
+    if profile is not None:
+        stmt = with_profile(stmt, Audit, profile).execution_options(populate_existing=True)
     result = await db.execute(stmt)
     return result.scalar_one_or_none()
 
@@ -84,6 +87,7 @@ async def get_audits(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     enterprise_id: Optional[UUID] = None,
     audit_category: Optional[str] = None,
     audit_type_id: Optional[UUID] = None,
@@ -91,9 +95,10 @@ async def get_audits(
     auditor_id: Optional[UUID] = None,
     year: Optional[int] = None,
     audit_date_from: Optional[datetime] = None,
-    audit_date_to: Optional[datetime] = None
+    audit_date_to: Optional[datetime] = None,
+    profile: str = "list"
 ) -> List[Audit]:
-    stmt = select(Audit)
+    stmt = with_profile(select(Audit), Audit, profile)
     
     if enterprise_id is not None:
         stmt = stmt.where(Audit.enterprise_id == enterprise_id)
@@ -119,7 +124,7 @@ async def get_audits(
     if audit_date_to is not None:
         stmt = stmt.where(Audit.audit_date_to <= audit_date_to)
     
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, Audit.created_at, Audit.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
@@ -127,9 +132,10 @@ async def get_audits(
 async def update_audit(
     db: AsyncSession,
     audit_id: UUID,
-    audit_update: AuditUpdate
+    audit_update: AuditUpdate,
+    commit: bool = True
 ) -> Optional[Audit]:
-    db_audit = await get_audit(db, audit_id)
+    db_audit = await get_audit(db, audit_id, profile="detail")
     if not db_audit:
         return None
     
@@ -160,7 +166,10 @@ async def update_audit(
         shifts = result.scalars().all()
         db_audit.shifts = shifts
     
-    await db.commit()
+    if commit:
+        await db.commit()
+    else:
+        await db.flush()
     await db.refresh(db_audit)
     return db_audit
 
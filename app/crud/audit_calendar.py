@@ -9,6 +9,7 @@ from app.models.audit_schedule_week import AuditScheduleWeek
 from app.models.user import User
 from app.models.location import Location
 from app.models.dictionary import Dictionary
+from app.crud.loader_profiles import with_profile
 
 
 def get_weeks_in_range(date_from: date, date_to: date) -> List[Dict]:
@@ -166,13 +167,7 @@ async def get_audit_schedule(
     if status_id:
         stmt = stmt.where(Audit.status_id == status_id)
     
-    stmt = stmt.options(
-        selectinload(Audit.auditor),
-        selectinload(Audit.locations),
-        selectinload(Audit.clients),
-        selectinload(Audit.status),
-        selectinload(Audit.schedule_weeks)
-    )
+    stmt = with_profile(stmt, Audit, "calendar")
     
     result = await db.execute(stmt)
     audits = list(result.scalars().all())
@@ -4,6 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.audit_component import AuditComponent
 from app.schemas.audit_component import AuditComponentCreate, AuditComponentUpdate
+from app.core.pagination import paginate
 
 
 async def create_audit_component(db: AsyncSession, component: AuditComponentCreate) -> AuditComponent:
@@ -31,6 +32,7 @@ async def get_audit_components(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     audit_id: Optional[UUID] = None,
     component_type: Optional[str] = None,
     sap_id: Optional[str] = None,
@@ -50,7 +52,7 @@ async def get_audit_components(
     if part_number is not None:
         stmt = stmt.where(AuditComponent.part_number == part_number)
     
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, AuditComponent.created_at, AuditComponent.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
@@ -7,6 +7,7 @@ from app.models.audit_plan import AuditPlan
 from app.models.audit_plan_item import AuditPlanItem
 from app.schemas.audit_plan import AuditPlanCreate, AuditPlanUpdate
 from app.crud import auditor_qualification as crud_qualification
+from app.core.pagination import paginate
 
 
 async def create_audit_plan(db: AsyncSession, audit_plan: AuditPlanCreate) -> AuditPlan:
@@ -36,6 +37,7 @@ async def get_audit_plans(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     enterprise_id: Optional[UUID] = None,
     category: Optional[str] = None,
     status: Optional[str] = None
@@ -51,7 +53,7 @@ async def get_audit_plans(
     if status is not None:
         stmt = stmt.where(AuditPlan.status == status)
     
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, AuditPlan.created_at, AuditPlan.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
@@ -171,6 +173,7 @@ async def get_audit_plan_items(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     audit_plan_id: Optional[UUID] = None,
     planned_auditor_id: Optional[UUID] = None
 ) -> List[AuditPlanItem]:
@@ -182,7 +185,7 @@ async def get_audit_plan_items(
     if planned_auditor_id is not None:
         stmt = stmt.where(AuditPlanItem.planned_auditor_id == planned_auditor_id)
     
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, AuditPlanItem.created_at, AuditPlanItem.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
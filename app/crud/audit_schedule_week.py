@@ -4,6 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.audit_schedule_week import AuditScheduleWeek
 from app.schemas.audit_schedule_week import AuditScheduleWeekCreate, AuditScheduleWeekUpdate
+from app.core.pagination import paginate
 
 
 async def create_audit_schedule_week(db: AsyncSession, schedule_week: AuditScheduleWeekCreate) -> AuditScheduleWeek:
@@ -47,6 +48,7 @@ async def get_audit_schedule_weeks(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     audit_id: Optional[UUID] = None,
     year: Optional[int] = None,
     week_number: Optional[int] = None
@@ -62,7 +64,7 @@ async def get_audit_schedule_weeks(
     if week_number is not None:
         stmt = stmt.where(AuditScheduleWeek.week_number == week_number)
     
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, AuditScheduleWeek.created_at, AuditScheduleWeek.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
@@ -13,6 +13,7 @@ from app.schemas.auditor_qualification import (
     StandardChapterCreate,
     StandardChapterUpdate,
 )
+from app.core.pagination import paginate
 
 
 async def create_qualification_standard(db: AsyncSession, standard: QualificationStandardCreate) -> QualificationStandard:
@@ -38,6 +39,7 @@ async def get_qualification_standards(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     is_active: Optional[bool] = None
 ) -> List[QualificationStandard]:
     stmt = select(QualificationStandard)
@@ -45,7 +47,7 @@ async def get_qualification_standards(
     if is_active is not None:
         stmt = stmt.where(QualificationStandard.is_active == is_active)
     
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, QualificationStandard.created_at, QualificationStandard.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
@@ -103,10 +105,11 @@ async def get_standard_chapters_by_standard(
     db: AsyncSession,
     standard_id: UUID,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
 ) -> List[StandardChapter]:
     stmt = select(StandardChapter).where(StandardChapter.standard_id == standard_id)
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, StandardChapter.created_at, StandardChapter.id, cursor=cursor, skip=skip, limit=limit, descending=False)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
@@ -177,6 +180,7 @@ async def get_auditor_qualifications(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     user_id: Optional[UUID] = None,
     status_id: Optional[UUID] = None,
     is_active: Optional[bool] = None
@@ -192,7 +196,7 @@ async def get_auditor_qualifications(
     if is_active is not None:
         stmt = stmt.where(AuditorQualification.is_active == is_active)
     
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, AuditorQualification.created_at, AuditorQualification.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
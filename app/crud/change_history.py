@@ -1,10 +1,14 @@
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from uuid import UUID
 from datetime import datetime, timezone
-from sqlalchemy import select
+from sqlalchemy import select, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.change_history import ChangeHistory
 from app.schemas.change_history import ChangeHistoryCreate
+from app.core.pagination import paginate
+
+
+BULK_INSERT_CHUNK_SIZE = 1000
 
 
 async def create_change_history(db: AsyncSession, change: ChangeHistoryCreate) -> ChangeHistory:
@@ -34,6 +38,7 @@ async def get_change_history_list(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     entity_type: Optional[str] = None,
     entity_id: Optional[UUID] = None,
     user_id: Optional[UUID] = None
@@ -49,8 +54,7 @@ async def get_change_history_list(
     if user_id is not None:
         stmt = stmt.where(ChangeHistory.user_id == user_id)
     
-    stmt = stmt.order_by(ChangeHistory.changed_at.desc())
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, ChangeHistory.changed_at, ChangeHistory.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
@@ -94,3 +98,20 @@ async def log_change(
     await db.refresh(db_change)
     return db_change
 
+
+async def create_change_history_bulk(db: AsyncSession, changes: List[Dict[str, Any]]) -> int:
+    """
+    Вставить записи истории изменений многострочным INSERT.
+    
+    Не выполняет commit: записи попадают в транзакцию вызывающего кода.
+    
+    Args:
+        db: Сессия базы данных
+        changes: Словари с полями ChangeHistory
+    
+    Returns:
+        Количество вставленных записей
+    """
+    for start in range(0, len(changes), BULK_INSERT_CHUNK_SIZE):
+        await db.execute(insert(ChangeHistory).values(changes[start:start + BULK_INSERT_CHUNK_SIZE]))
+    return len(changes)
@@ -1,76 +1,223 @@
-from typing import List
+from typing import Optional
 from uuid import UUID
-from datetime import date, datetime
-from sqlalchemy import select, func, and_, or_
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy import select, update, func, and_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.models.finding import Finding
 from app.models.audit import Audit
 from app.models.user import User
 from app.models.status import Status
+from app.models.dashboard_rollup import DashboardRollup
 
 
-async def get_dashboard_stats(db: AsyncSession) -> dict:
+ROLLUP_REFRESH_OVERLAP = timedelta(minutes=5)
+
+
+async def get_dashboard_stats(db: AsyncSession, enterprise_id: Optional[UUID] = None) -> dict:
     """
     Получить общую статистику системы для дашборда.
     
+    Считается одним агрегирующим запросом с FILTER на каждую сущность.
+    
+    Args:
+        db: Сессия базы данных
+        enterprise_id: Фильтр по предприятию
+    
     Returns:
         dict: Словарь со статистикой
     """
     today = date.today()
     
-    stmt_total_audits = select(func.count(Audit.id))
-    result_total_audits = await db.execute(stmt_total_audits)
-    total_audits = result_total_audits.scalar() or 0
+    stmt_audits = select(func.count(Audit.id))
+    if enterprise_id is not None:
+        stmt_audits = stmt_audits.where(Audit.enterprise_id == enterprise_id)
+    result_audits = await db.execute(stmt_audits)
+    total_audits = result_audits.scalar() or 0
     
-    stmt_total_findings = select(func.count(Finding.id))
-    result_total_findings = await db.execute(stmt_total_findings)
-    total_findings = result_total_findings.scalar() or 0
-    
-    stmt_active_findings = select(func.count(Finding.id)).join(
+    active = and_(Status.is_final == False, Finding.deleted_at.is_(None))
+    stmt_findings = select(
+        func.count(Finding.id),
+        func.count(Finding.id).filter(active),
+        func.count(Finding.id).filter(and_(active, Finding.deadline < today))
+    ).join(
         Status, Finding.status_id == Status.id
-    ).where(
-        and_(
-            Status.is_final == False,
-            Finding.deleted_at.is_(None)
-        )
     )
-    result_active_findings = await db.execute(stmt_active_findings)
-    active_findings = result_active_findings.scalar() or 0
+    if enterprise_id is not None:
+        stmt_findings = stmt_findings.where(Finding.enterprise_id == enterprise_id)
+    result_findings = await db.execute(stmt_findings)
+    total_findings, active_findings, overdue_findings = result_findings.one()
     
-    stmt_overdue_findings = select(func.count(Finding.id)).join(
-        Status, Finding.status_id == Status.id
-    ).where(
-        and_(
-            Status.is_final == False,
-            Finding.deadline < today,
-            Finding.deleted_at.is_(None)
-        )
+    user_stats = await get_user_stats(db)
+    
+    return {
+        "total_audits": total_audits,
+        "total_findings": total_findings or 0,
+        "active_findings": active_findings or 0,
+        "overdue_findings": overdue_findings or 0,
+        **user_stats,
+        "refreshed_at": None
+    }
+
+
+async def get_user_stats(db: AsyncSession) -> dict:
+    """
+    Получить количество пользователей одним запросом.
+    
+    Returns:
+        dict: total_users и active_users
+    """
+    stmt = select(
+        func.count(User.id),
+        func.count(User.id).filter(and_(User.is_active == True, User.deleted_at.is_(None)))
     )
-    result_overdue_findings = await db.execute(stmt_overdue_findings)
-    overdue_findings = result_overdue_findings.scalar() or 0
+    result = await db.execute(stmt)
+    total_users, active_users = result.one()
     
-    stmt_total_users = select(func.count(User.id))
-    result_total_users = await db.execute(stmt_total_users)
-    total_users = result_total_users.scalar() or 0
+    return {
+        "total_users": total_users or 0,
+        "active_users": active_users or 0
+    }
+
+
+async def get_dashboard_stats_from_rollup(db: AsyncSession, enterprise_id: Optional[UUID] = None) -> Optional[dict]:
+    """
+    Получить статистику дашборда из предагрегированной таблицы dashboard_rollups.
     
-    stmt_active_users = select(func.count(User.id)).where(
-        and_(
-            User.is_active == True,
-            User.deleted_at.is_(None)
-        )
+    Args:
+        db: Сессия базы данных
+        enterprise_id: Фильтр по предприятию
+    
+    Returns:
+        dict со статистикой и временем обновления или None, если свертки еще не построены
+    """
+    stmt = select(
+        func.coalesce(func.sum(DashboardRollup.total_audits), 0),
+        func.coalesce(func.sum(DashboardRollup.total_findings), 0),
+        func.coalesce(func.sum(DashboardRollup.active_findings), 0),
+        func.coalesce(func.sum(DashboardRollup.overdue_findings), 0),
+        func.min(DashboardRollup.refreshed_at)
+    ).where(
+        DashboardRollup.deleted_at.is_(None)
     )
-    result_active_users = await db.execute(stmt_active_users)
-    active_users = result_active_users.scalar() or 0
+    if enterprise_id is not None:
+        stmt = stmt.where(DashboardRollup.enterprise_id == enterprise_id)
+    
+    result = await db.execute(stmt)
+    total_audits, total_findings, active_findings, overdue_findings, refreshed_at = result.one()
+    
+    if refreshed_at is None:
+        return None
+    
+    user_stats = await get_user_stats(db)
     
     return {
         "total_audits": total_audits,
         "total_findings": total_findings,
         "active_findings": active_findings,
         "overdue_findings": overdue_findings,
-        "total_users": total_users,
-        "active_users": active_users
+        **user_stats,
+        "refreshed_at": refreshed_at
+    }
+
+
+async def refresh_dashboard_rollups(db: AsyncSession, full: bool = False) -> int:
+    """
+    Обновить свертки дашборда по предприятиям.
+    
+    В инкрементальном режиме пересчитываются только предприятия, у которых
+    аудиты или несоответствия изменились с момента прошлого обновления.
+    Полный пересчет выполняется при первом запуске и при смене дня,
+    так как просрочка зависит от текущей даты.
+    
+    Args:
+        db: Сессия базы данных
+        full: Принудительный полный пересчет
+    
+    Returns:
+        int: Количество пересчитанных предприятий
+    """
+    today = date.today()
+    now = datetime.now(timezone.utc)
+    
+    result_last = await db.execute(select(func.max(DashboardRollup.refreshed_at)))
+    last_refresh = result_last.scalar()
+    
+    full = full or last_refresh is None or last_refresh.date() < today
+    
+    enterprise_ids = None
+    if not full:
+        since = last_refresh - ROLLUP_REFRESH_OVERLAP
+        stmt_changed = select(Finding.enterprise_id).where(Finding.updated_at >= since).union(
+            select(Audit.enterprise_id).where(Audit.updated_at >= since)
+        )
+        result_changed = await db.execute(stmt_changed)
+        enterprise_ids = list(result_changed.scalars().all())
+    
+    rows = {}
+    if full or enterprise_ids:
+        active = and_(Status.is_final == False, Finding.deleted_at.is_(None))
+        stmt_findings = select(
+            Finding.enterprise_id,
+            func.count(Finding.id),
+            func.count(Finding.id).filter(active),
+            func.count(Finding.id).filter(and_(active, Finding.deadline < today))
+        ).join(
+            Status, Finding.status_id == Status.id
+        ).group_by(Finding.enterprise_id)
+        
+        stmt_audits = select(Audit.enterprise_id, func.count(Audit.id)).group_by(Audit.enterprise_id)
+        
+        if enterprise_ids is not None:
+            stmt_findings = stmt_findings.where(Finding.enterprise_id.in_(enterprise_ids))
+            stmt_audits = stmt_audits.where(Audit.enterprise_id.in_(enterprise_ids))
+            for ent_id in enterprise_ids:
+                rows[ent_id] = _empty_rollup(ent_id, now)
+        else:
+            result_existing = await db.execute(select(DashboardRollup.enterprise_id))
+            for ent_id in result_existing.scalars().all():
+                rows[ent_id] = _empty_rollup(ent_id, now)
+        
+        result_findings = await db.execute(stmt_findings)
+        for ent_id, total, active_count, overdue in result_findings.all():
+            row = rows.setdefault(ent_id, _empty_rollup(ent_id, now))
+            row["total_findings"] = total
+            row["active_findings"] = active_count
+            row["overdue_findings"] = overdue
+        
+        result_audits = await db.execute(stmt_audits)
+        for ent_id, total in result_audits.all():
+            rows.setdefault(ent_id, _empty_rollup(ent_id, now))["total_audits"] = total
+    
+    if rows:
+        stmt_upsert = insert(DashboardRollup).values(list(rows.values()))
+        stmt_upsert = stmt_upsert.on_conflict_do_update(
+            index_elements=[DashboardRollup.enterprise_id],
+            set_={
+                "total_audits": stmt_upsert.excluded.total_audits,
+                "total_findings": stmt_upsert.excluded.total_findings,
+                "active_findings": stmt_upsert.excluded.active_findings,
+                "overdue_findings": stmt_upsert.excluded.overdue_findings,
+                "refreshed_at": stmt_upsert.excluded.refreshed_at
+            }
+        )
+        await db.execute(stmt_upsert)
+    
+    await db.execute(update(DashboardRollup).values(refreshed_at=now))
+    await db.commit()
+    
+    return len(rows)
+
+
+def _empty_rollup(enterprise_id: UUID, refreshed_at: datetime) -> dict:
+    return {
+        "enterprise_id": enterprise_id,
+        "total_audits": 0,
+        "total_findings": 0,
+        "active_findings": 0,
+        "overdue_findings": 0,
+        "refreshed_at": refreshed_at
     }
 
 
@@ -87,7 +234,10 @@ async def get_my_tasks_count(db: AsyncSession, user_id: UUID) -> dict:
     """
     today = date.today()
     
-    stmt_active_findings = select(func.count(Finding.id)).join(
+    stmt_findings = select(
+        func.count(Finding.id),
+        func.count(Finding.id).filter(Finding.deadline < today)
+    ).join(
         Status, Finding.status_id == Status.id
     ).where(
         and_(
@@ -96,8 +246,8 @@ async def get_my_tasks_count(db: AsyncSession, user_id: UUID) -> dict:
             Finding.deleted_at.is_(None)
         )
     )
-    result_active_findings = await db.execute(stmt_active_findings)
-    active_findings_count = result_active_findings.scalar() or 0
+    result_findings = await db.execute(stmt_findings)
+    active_findings_count, overdue_findings_count = result_findings.one()
     
     stmt_upcoming_audits = select(func.count(Audit.id)).join(
         Status, Audit.status_id == Status.id
@@ -112,23 +262,10 @@ async def get_my_tasks_count(db: AsyncSession, user_id: UUID) -> dict:
     result_upcoming_audits = await db.execute(stmt_upcoming_audits)
     upcoming_audits_count = result_upcoming_audits.scalar() or 0
     
-    stmt_overdue_findings = select(func.count(Finding.id)).join(
-        Status, Finding.status_id == Status.id
-    ).where(
-        and_(
-            Finding.resolver_id == user_id,
-            Status.is_final == False,
-            Finding.deadline < today,
-            Finding.deleted_at.is_(None)
-        )
-    )
-    result_overdue_findings = await db.execute(stmt_overdue_findings)
-    overdue_findings_count = result_overdue_findings.scalar() or 0
-    
     return {
-        "active_findings_count": active_findings_count,
+        "active_findings_count": active_findings_count or 0,
         "upcoming_audits_count": upcoming_audits_count,
-        "overdue_findings_count": overdue_findings_count
+        "overdue_findings_count": overdue_findings_count or 0
     }
 
 
@@ -146,7 +283,7 @@ async def get_my_tasks_detail(db: AsyncSession, user_id: UUID, limit: int = 10)
     """
     today = date.today()
     
-    stmt_active_findings = select(Finding, Status.code.label("status_code")).join(
+    stmt_active_findings = select(Finding, Status.code.label("status_code"), Audit.title.label("audit_title")).join(
         Status, Finding.status_id == Status.id
     ).join(
         Audit, Finding.audit_id == Audit.id
@@ -162,14 +299,14 @@ async def get_my_tasks_detail(db: AsyncSession, user_id: UUID, limit: int = 10)
     active_findings_rows = result_active_findings.all()
     
     active_findings = []
-    for finding, status_code in active_findings_rows:
+    for finding, status_code, audit_title in active_findings_rows:
         active_findings.append({
             "id": finding.id,
             "finding_number": finding.finding_number,
             "title": finding.title,
             "deadline": finding.deadline,
             "status": status_code,
-            "audit_title": finding.audit.title
+            "audit_title": audit_title
         })
     
     stmt_upcoming_audits = select(Audit, Status.code.label("status_code")).join(
@@ -197,7 +334,7 @@ async def get_my_tasks_detail(db: AsyncSession, user_id: UUID, limit: int = 10)
             "status": status_code
         })
     
-    stmt_overdue_findings = select(Finding, Status.code.label("status_code")).join(
+    stmt_overdue_findings = select(Finding, Status.code.label("status_code"), Audit.title.label("audit_title")).join(
         Status, Finding.status_id == Status.id
     ).join(
         Audit, Finding.audit_id == Audit.id
@@ -214,14 +351,14 @@ async def get_my_tasks_detail(db: AsyncSession, user_id: UUID, limit: int = 10)
     overdue_findings_rows = result_overdue_findings.all()
     
     overdue_findings = []
-    for finding, status_code in overdue_findings_rows:
+    for finding, status_code, audit_title in overdue_findings_rows:
         overdue_findings.append({
             "id": finding.id,
             "finding_number": finding.finding_number,
             "title": finding.title,
             "deadline": finding.deadline,
             "status": status_code,
-            "audit_title": finding.audit.title
+            "audit_title": audit_title
         })
     
     return {
@@ -4,6 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.dictionary import DictionaryType, Dictionary
 from app.schemas.dictionary import DictionaryTypeCreate, DictionaryTypeUpdate, DictionaryCreate, DictionaryUpdate
+from app.core.pagination import paginate
 
 
 async def create_dictionary_type(db: AsyncSession, dictionary_type: DictionaryTypeCreate) -> DictionaryType:
@@ -33,9 +34,11 @@ async def get_dictionary_type_by_code(db: AsyncSession, code: str) -> Optional[D
 async def get_dictionary_types(
     db: AsyncSession,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
 ) -> List[DictionaryType]:
-    stmt = select(DictionaryType).offset(skip).limit(limit)
+    stmt = select(DictionaryType)
+    stmt = paginate(stmt, DictionaryType.created_at, DictionaryType.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
@@ -94,6 +97,7 @@ async def get_dictionaries(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     dictionary_type_id: Optional[UUID] = None,
     enterprise_id: Optional[UUID] = None,
     is_active: Optional[bool] = None
@@ -109,7 +113,7 @@ async def get_dictionaries(
     if is_active is not None:
         stmt = stmt.where(Dictionary.is_active == is_active)
     
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, Dictionary.created_at, Dictionary.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.email_account import EmailAccount
 from app.schemas.email_account import EmailAccountCreate, EmailAccountUpdate
 from app.core.security import encrypt_value, decrypt_value
+from app.core.pagination import paginate
 
 
 async def create_email_account(db: AsyncSession, account: EmailAccountCreate) -> EmailAccount:
@@ -38,6 +39,7 @@ async def get_email_accounts(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     enterprise_id: Optional[UUID] = None,
     division_id: Optional[UUID] = None,
     is_active: Optional[bool] = None
@@ -53,7 +55,7 @@ async def get_email_accounts(
     if is_active is not None:
         stmt = stmt.where(EmailAccount.is_active == is_active)
     
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, EmailAccount.created_at, EmailAccount.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
@@ -4,6 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.enterprise import Enterprise
 from app.schemas.enterprise import EnterpriseCreate, EnterpriseUpdate
+from app.core.pagination import paginate
 
 
 async def create_enterprise(db: AsyncSession, enterprise: EnterpriseCreate) -> Enterprise:
@@ -35,6 +36,7 @@ async def get_enterprises(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     is_active: Optional[bool] = None
 ) -> List[Enterprise]:
     stmt = select(Enterprise)
@@ -42,7 +44,7 @@ async def get_enterprises(
     if is_active is not None:
         stmt = stmt.where(Enterprise.is_active == is_active)
     
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, Enterprise.created_at, Enterprise.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
@@ -5,6 +5,7 @@ from sqlalchemy import select
 from datetime import datetime, timezone
 from app.models.export_task import ExportTask, ExportTaskStatus
 from app.schemas.export_task import ExportTaskCreate, ExportTaskUpdate
+from app.core.pagination import paginate
 
 
 async def create_export_task(
@@ -35,6 +36,7 @@ async def get_export_tasks(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     user_id: Optional[UUID] = None,
     audit_id: Optional[UUID] = None,
     status: Optional[ExportTaskStatus] = None
@@ -48,7 +50,7 @@ async def get_export_tasks(
     if status:
         stmt = stmt.where(ExportTask.status == status)
     
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, ExportTask.created_at, ExportTask.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
@@ -92,3 +94,30 @@ async def get_export_task_by_celery_id(
     result = await db.execute(stmt)
     return result.scalar_one_or_none()
 
+
+
+async def get_cached_report_export(
+    db: AsyncSession,
+    cache_key: str,
+    completed_after: datetime
+) -> Optional[ExportTask]:
+    """
+    Последняя завершенная выгрузка отчета с тем же ключом кэша (фильтры и отметка данных).
+    
+    Args:
+        db: Сессия базы данных
+        cache_key: Ключ кэша выгрузки
+        completed_after: Учитывать только выгрузки, завершенные позже
+    
+    Returns:
+        Задача с готовым файлом или None
+    """
+    stmt = select(ExportTask).where(
+        ExportTask.cache_key == cache_key,
+        ExportTask.status == ExportTaskStatus.COMPLETED,
+        ExportTask.file_path.is_not(None),
+        ExportTask.completed_at >= completed_after,
+        ExportTask.deleted_at.is_(None)
+    ).order_by(ExportTask.completed_at.desc()).limit(1)
+    result = await db.execute(stmt)
+    return result.scalar_one_or_none()
@@ -1,10 +1,21 @@
-from typing import Optional, List
-from uuid import UUID
+from typing import Optional, List, Dict, Tuple
+from uuid import UUID, uuid4
 from datetime import date
-from sqlalchemy import select, func
+from sqlalchemy import select, insert, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.finding import Finding
+from app.models.finding import Finding, finding_number_seq
+from app.models.audit import Audit
+from app.models.enterprise import Enterprise
+from app.models.dictionary import Dictionary
+from app.models.status import Status
+from app.models.user import User
 from app.schemas.finding import FindingCreate, FindingUpdate
+from app.core.pagination import paginate
+from app.crud.loader_profiles import with_profile
+from app.crud.findings_summary import apply_findings_rows
+
+
+BULK_INSERT_CHUNK_SIZE = 1000
 
 
 async def create_finding(db: AsyncSession, finding: FindingCreate) -> Finding:
@@ -35,22 +46,132 @@ async def create_finding(db: AsyncSession, finding: FindingCreate) -> Finding:
     db.add(db_finding)
     await db.flush()
     
-    stmt = select(func.max(Finding.finding_number))
-    result = await db.execute(stmt)
-    max_number = result.scalar()
+    from app.services.notification_service import notify_finding_created
+    await notify_finding_created(
+        db=db,
+        finding_id=db_finding.id,
+        resolver_id=db_finding.resolver_id,
+        title=db_finding.title,
+        description=db_finding.description
+    )
     
-    if max_number is None:
-        db_finding.finding_number = 1
-    else:
-        db_finding.finding_number = max_number + 1
+    await db.commit()
+    return await get_finding(db, db_finding.id, profile="detail")
+
+
+async def _existing_ids(db: AsyncSession, model: type, ids: set, *criteria) -> set:
+    if not ids:
+        return set()
+    stmt = select(model.id).where(model.id.in_(ids), model.deleted_at.is_(None), *criteria)
+    result = await db.execute(stmt)
+    return set(result.scalars().all())
+
+
+async def validate_finding_references(
+    db: AsyncSession,
+    findings: Dict[int, FindingCreate]
+) -> Tuple[Dict[int, List[str]], Dict[UUID, User]]:
+    """
+    Проверить ссылки пакета findings одним запросом на каждую сущность.
+    
+    Args:
+        db: Сессия базы данных
+        findings: Проверяемые findings по номеру строки
+    
+    Returns:
+        tuple: (ошибки по номеру строки, найденные пользователи по ID)
+    """
+    audit_ids = {finding.audit_id for finding in findings.values()}
+    enterprise_ids = {finding.enterprise_id for finding in findings.values()}
+    process_ids = {finding.process_id for finding in findings.values()}
+    status_ids = {finding.status_id for finding in findings.values()}
+    user_ids = {finding.resolver_id for finding in findings.values()}
+    user_ids |= {finding.approver_id for finding in findings.values() if finding.approver_id}
+    
+    existing_audits = await _existing_ids(db, Audit, audit_ids)
+    existing_enterprises = await _existing_ids(db, Enterprise, enterprise_ids)
+    existing_processes = await _existing_ids(db, Dictionary, process_ids)
+    existing_statuses = await _existing_ids(db, Status, status_ids, Status.entity_type == "finding")
+    
+    users = {}
+    if user_ids:
+        stmt = select(User).where(User.id.in_(user_ids), User.is_active == True, User.deleted_at.is_(None))
+        result = await db.execute(stmt)
+        users = {user.id: user for user in result.scalars().all()}
+    
+    errors = {}
+    for index, finding in findings.items():
+        row_errors = []
+        if finding.audit_id not in existing_audits:
+            row_errors.append("Аудит не найден")
+        if finding.enterprise_id not in existing_enterprises:
+            row_errors.append("Предприятие не найдено")
+        if finding.process_id not in existing_processes:
+            row_errors.append("Процесс не найден")
+        if finding.status_id not in existing_statuses:
+            row_errors.append("Статус не найден")
+        if finding.resolver_id not in users:
+            row_errors.append("Исполнитель не найден")
+        if finding.approver_id and finding.approver_id not in users:
+            row_errors.append("Утверждающий не найден")
+        if row_errors:
+            errors[index] = row_errors
+    
+    return errors, users
+
+
+async def create_findings_bulk(
+    db: AsyncSession,
+    findings: Dict[int, FindingCreate]
+) -> Tuple[Dict[int, Tuple[UUID, int]], Dict[int, List[str]]]:
+    """
+    Создать пакет findings в одной транзакции.
+    
+    Ссылки проверяются пакетно, номера выделяются блоком из последовательности,
+    строки вставляются многострочными INSERT, куб findings_summary и уведомления
+    исполнителям обновляются в той же транзакции.
+    
+    Args:
+        db: Сессия базы данных
+        findings: Валидные по схеме findings по номеру строки запроса
+    
+    Returns:
+        tuple: (созданные (id, finding_number) по номеру строки, ошибки по номеру строки)
+    """
+    from app.services.notification_service import notify_findings_created_bulk
+    
+    errors, users = await validate_finding_references(db, findings)
+    valid = [(index, finding) for index, finding in findings.items() if index not in errors]
+    if not valid:
+        return {}, errors
+    
+    stmt_numbers = select(finding_number_seq.next_value()).select_from(func.generate_series(1, len(valid)))
+    result_numbers = await db.execute(stmt_numbers)
+    numbers = sorted(result_numbers.scalars().all())
+    
+    created = {}
+    rows = []
+    for (index, finding), finding_number in zip(valid, numbers):
+        row = finding.model_dump()
+        row["id"] = uuid4()
+        row["finding_number"] = finding_number
+        rows.append(row)
+        created[index] = (row["id"], finding_number)
+    
+    for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+        await db.execute(insert(Finding).values(rows[start:start + BULK_INSERT_CHUNK_SIZE]))
+    await apply_findings_rows(db, rows)
+    
+    await notify_findings_created_bulk(db=db, findings=rows, users=users)
     
     await db.commit()
-    await db.refresh(db_finding)
-    return db_finding
+    return created, errors
 
 
-async def get_finding(db: AsyncSession, finding_id: UUID) -> Optional[Finding]:
+async def get_finding(db: AsyncSession, finding_id: UUID, profile: Optional[str] = None) -> Optional[Finding]:
     stmt = select(Finding).where(Finding.id == finding_id)
+    if profile is not None:
+        stmt = with_profile(stmt, Finding, profile).execution_options(populate_existing=True)
     result = await db.execute(stmt)
     return result.scalar_one_or_none()
 
@@ -59,15 +180,17 @@ async def get_findings(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     audit_id: Optional[UUID] = None,
     enterprise_id: Optional[UUID] = None,
     status_id: Optional[UUID] = None,
     resolver_id: Optional[UUID] = None,
     approver_id: Optional[UUID] = None,
     deadline_from: Optional[date] = None,
-    deadline_to: Optional[date] = None
+    deadline_to: Optional[date] = None,
+    profile: str = "list"
 ) -> List[Finding]:
-    stmt = select(Finding)
+    stmt = with_profile(select(Finding), Finding, profile)
     
     if audit_id is not None:
         stmt = stmt.where(Finding.audit_id == audit_id)
@@ -90,7 +213,7 @@ async def get_findings(
     if deadline_to is not None:
         stmt = stmt.where(Finding.deadline <= deadline_to)
     
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, Finding.created_at, Finding.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
@@ -98,7 +221,8 @@ async def get_findings(
 async def update_finding(
     db: AsyncSession,
     finding_id: UUID,
-    finding_update: FindingUpdate
+    finding_update: FindingUpdate,
+    commit: bool = True
 ) -> Optional[Finding]:
     db_finding = await get_finding(db, finding_id)
     if not db_finding:
@@ -109,7 +233,10 @@ async def update_finding(
     for field, value in update_data.items():
         setattr(db_finding, field, value)
     
-    await db.commit()
+    if commit:
+        await db.commit()
+    else:
+        await db.flush()
     await db.refresh(db_finding)
     return db_finding
 
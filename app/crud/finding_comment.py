@@ -4,6 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.finding_comment import FindingComment
 from app.schemas.finding import FindingCommentCreate, FindingCommentUpdate
+from app.core.pagination import paginate
 
 
 async def create_finding_comment(db: AsyncSession, comment: FindingCommentCreate) -> FindingComment:
@@ -29,6 +30,7 @@ async def get_finding_comments(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     finding_id: Optional[UUID] = None
 ) -> List[FindingComment]:
     stmt = select(FindingComment)
@@ -36,7 +38,7 @@ async def get_finding_comments(
     if finding_id is not None:
         stmt = stmt.where(FindingComment.finding_id == finding_id)
     
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, FindingComment.created_at, FindingComment.id, cursor=cursor, skip=skip, limit=limit, descending=False)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
@@ -5,6 +5,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.finding_delegation import FindingDelegation
 from app.schemas.finding import FindingDelegationCreate
+from app.core.pagination import paginate
 
 
 async def create_finding_delegation(db: AsyncSession, delegation: FindingDelegationCreate) -> FindingDelegation:
@@ -32,6 +33,7 @@ async def get_finding_delegations(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     finding_id: Optional[UUID] = None
 ) -> List[FindingDelegation]:
     stmt = select(FindingDelegation)
@@ -39,7 +41,7 @@ async def get_finding_delegations(
     if finding_id is not None:
         stmt = stmt.where(FindingDelegation.finding_id == finding_id)
     
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, FindingDelegation.created_at, FindingDelegation.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
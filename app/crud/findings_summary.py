@@ -0,0 +1,252 @@
+"""
+Инкрементальное ведение куба findings_summary.
+
+Изменения несоответствий через ORM в сессиях приложения (AppSession) учитываются
+обработчиком before_flush в той же транзакции: для каждого созданного, измененного
+или удаленного несоответствия вычисляется старый и новый ключ куба, и счетчики
+меняются на +-1 одним INSERT ... ON CONFLICT DO UPDATE (PostgreSQL). Если старое
+значение отслеживаемой колонки не было загружено до изменения, оно читается из БД
+перед flush. Вставки в обход ORM (create_findings_bulk)
+передают строки в apply_findings_rows. Все, что меняет данные иначе (SQL-скрипты,
+смена is_final у статуса), исправляет ночная сверка reconcile_findings_summary.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
+from sqlalchemy import delete, event, func, inspect, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.database import AppSession
+from app.models.finding import Finding
+from app.models.findings_summary import FindingsSummary
+from app.models.status import Status
+
+
+KEY_COLUMNS = ("enterprise_id", "process_id", "resolver_id", "finding_type", "status_is_final", "day", "deadline")
+TRACKED_ATTRS = ("enterprise_id", "process_id", "resolver_id", "finding_type", "status_id", "deadline", "created_at", "deleted_at")
+
+# (enterprise_id, process_id, resolver_id, finding_type, status_id, day, deadline)
+StatusKey = Tuple[Any, ...]
+
+# День создания несоответствия по UTC - измерение day куба
+FINDING_DAY = func.date(func.timezone("UTC", Finding.created_at))
+
+
+def summary_day(created_at: Optional[datetime]) -> date:
+    """День создания по UTC; для еще не вставленных строк (created_at по умолчанию в БД) - сегодня."""
+    if created_at is None:
+        return datetime.now(timezone.utc).date()
+    return created_at.astimezone(timezone.utc).date()
+
+
+def _status_key(values: Dict[str, Any]) -> Optional[StatusKey]:
+    if values.get("deleted_at") is not None:
+        return None
+    return (
+        values["enterprise_id"],
+        values["process_id"],
+        values["resolver_id"],
+        values["finding_type"],
+        values["status_id"],
+        summary_day(values.get("created_at")),
+        values["deadline"],
+    )
+
+
+def _has_unloaded_original(finding: Finding) -> bool:
+    state = inspect(finding)
+    for name in TRACKED_ATTRS:
+        history = state.attrs[name].history
+        if history.added and not history.deleted:
+            return True
+    return False
+
+
+def _stored_values(session: Session, findings: Iterable[Finding]) -> Dict[Any, Dict[str, Any]]:
+    """Значения отслеживаемых колонок в БД до текущего flush."""
+    ids = [finding.id for finding in findings]
+    if not ids:
+        return {}
+    columns = [getattr(Finding, name) for name in TRACKED_ATTRS]
+    result = session.execute(select(Finding.id, *columns).where(Finding.id.in_(ids)))
+    return {row[0]: dict(zip(TRACKED_ATTRS, row[1:])) for row in result.all()}
+
+
+def _old_and_new_values(
+    finding: Finding,
+    stored: Optional[Dict[str, Any]] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    state = inspect(finding)
+    old, new = {}, {}
+    for name in TRACKED_ATTRS:
+        history = state.attrs[name].history
+        new[name] = getattr(finding, name)
+        if stored is not None:
+            old[name] = stored[name]
+        elif history.deleted:
+            old[name] = history.deleted[0]
+        else:
+            old[name] = new[name]
+    return old, new
+
+
+def _apply_deltas(session: Session, deltas: Dict[StatusKey, int]) -> None:
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    status_ids = {key[4] for key in deltas}
+    result = session.execute(select(Status.id, Status.is_final).where(Status.id.in_(status_ids)))
+    is_final = dict(result.all())
+
+    cells: Dict[Tuple[Any, ...], int] = defaultdict(int)
+    for (enterprise_id, process_id, resolver_id, finding_type, status_id, day, deadline), delta in deltas.items():
+        key = (enterprise_id, process_id, resolver_id, finding_type, bool(is_final.get(status_id)), day, deadline)
+        cells[key] += delta
+
+    rows = [
+        {**dict(zip(KEY_COLUMNS, key)), "findings_count": delta}
+        for key, delta in sorted(cells.items(), key=lambda item: tuple(map(str, item[0])))
+        if delta
+    ]
+    if not rows:
+        return
+
+    stmt = insert(FindingsSummary).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_findings_summary_key",
+        set_={
+            "findings_count": FindingsSummary.findings_count + stmt.excluded.findings_count,
+            "updated_at": func.now()
+        }
+    )
+    session.execute(stmt)
+
+
+@event.listens_for(AppSession, "before_flush")
+def _track_finding_changes(session: Session, flush_context, instances) -> None:
+    deltas: Dict[StatusKey, int] = defaultdict(int)
+
+    with session.no_autoflush:
+        for finding in session.new:
+            if isinstance(finding, Finding):
+                key = _status_key({name: getattr(finding, name) for name in TRACKED_ATTRS})
+                if key:
+                    deltas[key] += 1
+
+        dirty = [
+            finding for finding in session.dirty
+            if isinstance(finding, Finding) and session.is_modified(finding)
+        ]
+        deleted = [finding for finding in session.deleted if isinstance(finding, Finding)]
+        stored = _stored_values(session, [
+            finding for finding in dirty + deleted if _has_unloaded_original(finding)
+        ])
+
+        for finding in dirty:
+            old, new = _old_and_new_values(finding, stored.get(finding.id))
+            old_key, new_key = _status_key(old), _status_key(new)
+            if old_key != new_key:
+                if old_key:
+                    deltas[old_key] -= 1
+                if new_key:
+                    deltas[new_key] += 1
+
+        for finding in deleted:
+            old, _ = _old_and_new_values(finding, stored.get(finding.id))
+            key = _status_key(old)
+            if key:
+                deltas[key] -= 1
+
+        _apply_deltas(session, deltas)
+
+
+async def apply_findings_rows(db: AsyncSession, rows: Iterable[Dict[str, Any]], sign: int = 1) -> None:
+    """
+    Учесть в кубе несоответствия, вставленные в обход ORM (без commit).
+
+    Args:
+        db: Сессия базы данных
+        rows: Значения колонок несоответствий
+        sign: 1 - строки добавлены, -1 - удалены
+    """
+    deltas: Dict[StatusKey, int] = defaultdict(int)
+    for row in rows:
+        key = _status_key(row)
+        if key:
+            deltas[key] += sign
+    if deltas:
+        await db.run_sync(_apply_deltas, deltas)
+
+
+def _actual_summary_select():
+    day = FINDING_DAY
+    return select(
+        Finding.enterprise_id,
+        Finding.process_id,
+        Finding.resolver_id,
+        Finding.finding_type,
+        Status.is_final,
+        day,
+        Finding.deadline,
+        func.count()
+    ).join(
+        Status, Finding.status_id == Status.id
+    ).where(
+        Finding.deleted_at.is_(None)
+    ).group_by(
+        Finding.enterprise_id,
+        Finding.process_id,
+        Finding.resolver_id,
+        Finding.finding_type,
+        Status.is_final,
+        day,
+        Finding.deadline
+    )
+
+
+async def reconcile_findings_summary(db: AsyncSession) -> Dict[str, int]:
+    """
+    Сверить куб с таблицей findings и исправить расхождения.
+
+    Таблица блокируется в режиме EXCLUSIVE: чтение отчетов продолжается, а
+    транзакции, меняющие несоответствия, ждут окончания сверки и применяют
+    свои изменения поверх пересчитанных значений.
+
+    Returns:
+        dict: Число исправленных (updated) и удаленных (removed) ячеек
+    """
+    await db.execute(text("LOCK TABLE findings_summary IN EXCLUSIVE MODE"))
+
+    actual = _actual_summary_select()
+    stmt_upsert = insert(FindingsSummary).from_select(
+        [*KEY_COLUMNS, "findings_count", "id"],
+        actual.add_columns(func.gen_random_uuid())
+    )
+    stmt_upsert = stmt_upsert.on_conflict_do_update(
+        constraint="uq_findings_summary_key",
+        set_={"findings_count": stmt_upsert.excluded.findings_count, "updated_at": func.now()},
+        where=FindingsSummary.findings_count != stmt_upsert.excluded.findings_count
+    )
+    result_upsert = await db.execute(stmt_upsert)
+
+    key = tuple_(*(getattr(FindingsSummary, column) for column in KEY_COLUMNS))
+    actual_keys = actual.with_only_columns(*list(actual.selected_columns)[:len(KEY_COLUMNS)])
+    result_delete = await db.execute(delete(FindingsSummary).where(key.not_in(actual_keys)))
+
+    await db.commit()
+    return {"updated": result_upsert.rowcount, "removed": result_delete.rowcount}
+
+
+async def ensure_findings_summary(db: AsyncSession) -> Optional[Dict[str, int]]:
+    """
+    Построить куб, если он пуст (первый запуск после появления таблицы).
+
+    Returns:
+        Результат сверки или None, если куб уже заполнен
+    """
+    result = await db.execute(select(FindingsSummary.id).limit(1))
+    if result.first() is not None:
+        return None
+    return await reconcile_findings_summary(db)
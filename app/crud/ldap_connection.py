@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.ldap_connection import LdapConnection
 from app.schemas.ldap_connection import LdapConnectionCreate, LdapConnectionUpdate
 from app.core.security import encrypt_value, decrypt_value
+from app.core.pagination import paginate
 
 
 async def create_ldap_connection(db: AsyncSession, connection: LdapConnectionCreate) -> LdapConnection:
@@ -35,6 +36,7 @@ async def get_ldap_connections(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     enterprise_id: Optional[UUID] = None,
     division_id: Optional[UUID] = None,
     is_active: Optional[bool] = None
@@ -50,7 +52,7 @@ async def get_ldap_connections(
     if is_active is not None:
         stmt = stmt.where(LdapConnection.is_active == is_active)
     
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, LdapConnection.created_at, LdapConnection.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
@@ -0,0 +1,87 @@
+"""
+Профили загрузки связей для сериализации ответов.
+
+Связи "многие к одному" подгружаются joinedload в том же запросе, коллекции -
+selectinload отдельным запросом на страницу. Все остальные связи помечаются raiseload:
+обращение к незагруженной связи падает сразу, а не вызывает ленивую загрузку
+(в async-сессии она падает с MissingGreenlet или стоит запрос на строку)
+и не возвращает молча None.
+
+Профили:
+    list, detail - все связи, которые сериализуют AuditResponse/FindingResponse
+    calendar - данные для графика аудитов
+"""
+from typing import Dict, Tuple
+from sqlalchemy import Select
+from sqlalchemy.orm import joinedload, selectinload, raiseload
+from sqlalchemy.orm.interfaces import LoaderOption
+from app.models.audit import Audit
+from app.models.finding import Finding
+
+
+AUDIT_RESPONSE_OPTIONS: Tuple[LoaderOption, ...] = (
+    joinedload(Audit.enterprise),
+    joinedload(Audit.audit_type),
+    joinedload(Audit.process),
+    joinedload(Audit.product),
+    joinedload(Audit.project),
+    joinedload(Audit.norm),
+    joinedload(Audit.status),
+    joinedload(Audit.auditor),
+    joinedload(Audit.responsible_user),
+    joinedload(Audit.audit_plan_item),
+    joinedload(Audit.rescheduled_by),
+    joinedload(Audit.approver),
+    joinedload(Audit.creator),
+    joinedload(Audit.risk_level),
+    selectinload(Audit.locations),
+    selectinload(Audit.clients),
+    selectinload(Audit.shifts),
+    raiseload("*"),
+)
+
+FINDING_RESPONSE_OPTIONS: Tuple[LoaderOption, ...] = (
+    joinedload(Finding.audit),
+    joinedload(Finding.enterprise),
+    joinedload(Finding.process),
+    joinedload(Finding.status),
+    joinedload(Finding.resolver),
+    joinedload(Finding.approver),
+    joinedload(Finding.creator),
+    raiseload("*"),
+)
+
+LOADER_PROFILES: Dict[type, Dict[str, Tuple[LoaderOption, ...]]] = {
+    Audit: {
+        "list": AUDIT_RESPONSE_OPTIONS,
+        "detail": AUDIT_RESPONSE_OPTIONS,
+        "calendar": (
+            joinedload(Audit.auditor),
+            joinedload(Audit.status),
+            joinedload(Audit.risk_level),
+            selectinload(Audit.locations),
+            selectinload(Audit.clients),
+            selectinload(Audit.schedule_weeks),
+            raiseload("*"),
+        ),
+    },
+    Finding: {
+        "list": FINDING_RESPONSE_OPTIONS,
+        "detail": FINDING_RESPONSE_OPTIONS,
+    },
+}
+
+
+def with_profile(stmt: Select, model: type, profile: str) -> Select:
+    """
+    Применить профиль загрузки связей к запросу.
+
+    Args:
+        stmt: Запрос select(model)
+        model: Модель, для которой зарегистрирован профиль
+        profile: Имя профиля ('list', 'detail', 'calendar')
+
+    Returns:
+        Запрос с опциями загрузки
+    """
+    return stmt.options(*LOADER_PROFILES[model][profile])
@@ -1,11 +1,17 @@
 from typing import Optional, List, Dict, Any
 from uuid import UUID
-from datetime import datetime, timedelta
-from sqlalchemy import select, func, and_, or_
+from datetime import datetime, timedelta, timezone
+import uuid
+from sqlalchemy import select, insert, update, func, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from app.models.notification import Notification
 from app.models.notification_queue import NotificationQueue
 from app.schemas.notification import NotificationCreate, NotificationUpdate
+from app.core.pagination import paginate
+
+
+BULK_INSERT_CHUNK_SIZE = 1000
 
 
 async def create_notification(db: AsyncSession, notification: NotificationCreate) -> Notification:
@@ -26,7 +32,7 @@ async def create_notification(db: AsyncSession, notification: NotificationCreate
 
 
 async def get_notification(db: AsyncSession, notification_id: UUID) -> Optional[Notification]:
-    stmt = select(Notification).where(Notification.id == notification_id)
+    stmt = select(Notification).where(Notification.id == notification_id, Notification.deleted_at.is_(None))
     result = await db.execute(stmt)
     return result.scalar_one_or_none()
 
@@ -35,13 +41,14 @@ async def get_notifications(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     user_id: Optional[UUID] = None,
     event_type: Optional[str] = None,
     entity_type: Optional[str] = None,
     entity_id: Optional[UUID] = None,
     is_read: Optional[bool] = None
 ) -> List[Notification]:
-    stmt = select(Notification)
+    stmt = select(Notification).where(Notification.deleted_at.is_(None))
     
     if user_id is not None:
         stmt = stmt.where(Notification.user_id == user_id)
@@ -58,8 +65,38 @@ async def get_notifications(
     if is_read is not None:
         stmt = stmt.where(Notification.is_read == is_read)
     
-    stmt = stmt.order_by(Notification.created_at.desc())
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, Notification.created_at, Notification.id, cursor=cursor, skip=skip, limit=limit)
+    result = await db.execute(stmt)
+    return list(result.scalars().all())
+
+
+async def get_failed_notifications(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    channel: Optional[str] = None
+) -> List[Notification]:
+    """
+    Получить уведомления с ошибкой отправки (по частичному индексу неудачных).
+    
+    Args:
+        db: Сессия базы данных
+        skip: Количество записей для пропуска
+        limit: Размер страницы
+        cursor: Курсор следующей страницы
+        channel: Только ошибки канала ('email', 'telegram'), None - любого
+    
+    Returns:
+        Неудачные уведомления, новые первыми
+    """
+    error_columns = {
+        "email": [Notification.email_error],
+        "telegram": [Notification.telegram_error],
+    }.get(channel, [Notification.email_error, Notification.telegram_error])
+    
+    stmt = select(Notification).where(or_(*(column.isnot(None) for column in error_columns)))
+    stmt = paginate(stmt, Notification.created_at, Notification.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
@@ -94,23 +131,84 @@ async def mark_notification_as_read(db: AsyncSession, notification_id: UUID) ->
     return db_notification
 
 
-async def mark_all_notifications_as_read(db: AsyncSession, user_id: UUID) -> int:
-    stmt = select(Notification).where(
-        and_(
+async def _mark_as_read(db: AsyncSession, user_id: UUID, *criteria) -> int:
+    stmt = (
+        update(Notification)
+        .where(
             Notification.user_id == user_id,
-            Notification.is_read == False
+            Notification.is_read == False,
+            Notification.deleted_at.is_(None),
+            *criteria
         )
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
     )
     result = await db.execute(stmt)
-    notifications = result.scalars().all()
-    
-    count = 0
-    for notification in notifications:
-        notification.is_read = True
-        count += 1
+    await db.commit()
+    return result.rowcount
+
+
+async def mark_all_notifications_as_read(db: AsyncSession, user_id: UUID) -> int:
+    """
+    Отметить все непрочитанные уведомления пользователя одним UPDATE.
     
+    Returns:
+        Количество обновленных уведомлений
+    """
+    return await _mark_as_read(db, user_id)
+
+
+async def mark_notifications_as_read(db: AsyncSession, user_id: UUID, notification_ids: List[UUID]) -> int:
+    """
+    Отметить прочитанными уведомления пользователя из списка одним UPDATE.
+    Чужие и несуществующие ID пропускаются.
+    
+    Returns:
+        Количество обновленных уведомлений
+    """
+    return await _mark_as_read(db, user_id, Notification.id.in_(notification_ids))
+
+
+async def mark_entity_notifications_as_read(
+    db: AsyncSession,
+    user_id: UUID,
+    entity_type: str,
+    entity_id: UUID
+) -> int:
+    """
+    Отметить прочитанными все уведомления пользователя по одной сущности одним UPDATE.
+    
+    Returns:
+        Количество обновленных уведомлений
+    """
+    return await _mark_as_read(
+        db,
+        user_id,
+        Notification.entity_type == entity_type,
+        Notification.entity_id == entity_id
+    )
+
+
+async def delete_notifications_older_than(db: AsyncSession, user_id: UUID, days: int) -> int:
+    """
+    Мягко удалить уведомления пользователя старше days дней одним UPDATE.
+    
+    Returns:
+        Количество удаленных уведомлений
+    """
+    stmt = (
+        update(Notification)
+        .where(
+            Notification.user_id == user_id,
+            Notification.created_at < func.now() - timedelta(days=days),
+            Notification.deleted_at.is_(None)
+        )
+        .values(deleted_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(stmt)
     await db.commit()
-    return count
+    return result.rowcount
 
 
 async def delete_notification(db: AsyncSession, notification_id: UUID) -> bool:
@@ -128,37 +226,52 @@ async def get_notification_stats(
     user_id: Optional[UUID] = None,
     days: int = 7
 ) -> Dict[str, Any]:
-    date_from = datetime.now() - timedelta(days=days)
-    
-    stmt = select(Notification).where(Notification.created_at >= date_from)
-    
+    """
+    Статистика уведомлений за последние days дней, посчитанная в БД.
+    
+    Args:
+        db: Сессия базы данных
+        user_id: ID получателя (None - по всем пользователям)
+        days: Период в днях
+    
+    Returns:
+        Счетчики уведомлений, распределение по типам событий и каналам
+    """
+    filters = [
+        Notification.created_at >= datetime.now(timezone.utc) - timedelta(days=days),
+        Notification.deleted_at.is_(None)
+    ]
     if user_id is not None:
-        stmt = stmt.where(Notification.user_id == user_id)
+        filters.append(Notification.user_id == user_id)
+    
+    stmt_totals = select(
+        func.count().label("total_notifications"),
+        func.count().filter(Notification.is_read == False).label("unread_notifications"),
+        func.count().filter(Notification.sent_email == True).label("email_sent"),
+        func.count().filter(Notification.sent_telegram == True).label("telegram_sent"),
+        func.count().filter(Notification.email_error.isnot(None), Notification.email_error != "").label("failed_email"),
+        func.count().filter(Notification.telegram_error.isnot(None), Notification.telegram_error != "").label("failed_telegram")
+    ).where(*filters)
+    totals = (await db.execute(stmt_totals)).one()._asdict()
+    
+    stmt_event_types = (
+        select(Notification.event_type, func.count())
+        .where(*filters)
+        .group_by(Notification.event_type)
+    )
+    result_event_types = await db.execute(stmt_event_types)
     
-    result = await db.execute(stmt)
-    notifications = result.scalars().all()
-    
-    stats = {
-        "total_notifications": len(notifications),
-        "unread_notifications": sum(1 for n in notifications if not n.is_read),
-        "email_sent": sum(1 for n in notifications if n.sent_email),
-        "telegram_sent": sum(1 for n in notifications if n.sent_telegram),
-        "failed_email": sum(1 for n in notifications if n.email_error),
-        "failed_telegram": sum(1 for n in notifications if n.telegram_error),
-        "by_event_type": {},
-        "by_channel": {}
+    by_channel = {
+        channel: totals[field]
+        for channel, field in (("email", "email_sent"), ("telegram", "telegram_sent"))
+        if totals[field]
     }
     
-    for notification in notifications:
-        event_type = notification.event_type
-        stats["by_event_type"][event_type] = stats["by_event_type"].get(event_type, 0) + 1
-        
-        if notification.sent_email:
-            stats["by_channel"]["email"] = stats["by_channel"].get("email", 0) + 1
-        if notification.sent_telegram:
-            stats["by_channel"]["telegram"] = stats["by_channel"].get("telegram", 0) + 1
-    
-    return stats
+    return {
+        **totals,
+        "by_event_type": {event_type: count for event_type, count in result_event_types.all()},
+        "by_channel": by_channel
+    }
 
 
 async def create_notification_queue(db: AsyncSession, queue_item: Dict[str, Any]) -> NotificationQueue:
@@ -178,6 +291,392 @@ async def create_notification_queue(db: AsyncSession, queue_item: Dict[str, Any]
     return db_queue
 
 
+async def create_notifications_bulk(
+    db: AsyncSession,
+    notifications: List[Dict[str, Any]],
+    scheduled_at: Optional[datetime] = None
+) -> int:
+    """
+    Создать уведомления и элементы очереди многострочными INSERT без commit.
+    
+    Используется пакетными операциями, чтобы уведомления попали в ту же транзакцию.
+    
+    Args:
+        db: Сессия базы данных
+        notifications: Словари с полями user_id, event_type, entity_type, entity_id,
+            title, message и списком каналов channels
+        scheduled_at: Время отправки (по умолчанию сейчас)
+    
+    Returns:
+        int: Количество созданных уведомлений
+    """
+    if not notifications:
+        return 0
+    
+    scheduled_at = scheduled_at or datetime.now(timezone.utc)
+    notification_rows = []
+    queue_rows = []
+    
+    for item in notifications:
+        notification_id = uuid.uuid4()
+        notification_rows.append({
+            "id": notification_id,
+            "user_id": item["user_id"],
+            "event_type": item["event_type"],
+            "entity_type": item["entity_type"],
+            "entity_id": item["entity_id"],
+            "title": item["title"],
+            "message": item["message"],
+            "notification_config": item.get("notification_config"),
+            "is_read": False,
+            "sent_email": False,
+            "sent_telegram": False,
+            "retry_count": 0
+        })
+        for channel in item["channels"]:
+            queue_rows.append({
+                "id": uuid.uuid4(),
+                "notification_id": notification_id,
+                "channel": channel,
+                "status": "pending",
+                "priority": item.get("priority", 0),
+                "scheduled_at": scheduled_at,
+                "retry_count": 0,
+                "max_retries": 3
+            })
+    
+    for start in range(0, len(notification_rows), BULK_INSERT_CHUNK_SIZE):
+        await db.execute(insert(Notification).values(notification_rows[start:start + BULK_INSERT_CHUNK_SIZE]))
+    
+    for start in range(0, len(queue_rows), BULK_INSERT_CHUNK_SIZE):
+        await db.execute(insert(NotificationQueue).values(queue_rows[start:start + BULK_INSERT_CHUNK_SIZE]))
+    
+    return len(notification_rows)
+
+
+async def enqueue_notification(
+    db: AsyncSession,
+    notification: NotificationCreate,
+    channels: List[str],
+    priority: int = 0,
+    scheduled_at: Optional[datetime] = None
+) -> Notification:
+    """
+    Добавить в сессию уведомление вместе с элементами очереди по каналам.
+    
+    Не выполняет commit и запросов к БД: записи фиксируются вместе
+    с транзакцией вызывающего кода.
+    
+    Args:
+        db: Сессия базы данных
+        notification: Данные уведомления
+        channels: Каналы доставки ('email', 'telegram')
+        priority: Приоритет (больше - раньше)
+        scheduled_at: Время отправки (по умолчанию сейчас)
+    
+    Returns:
+        Добавленное уведомление
+    """
+    scheduled_at = scheduled_at or datetime.now(timezone.utc)
+    db_notification = Notification(
+        user_id=notification.user_id,
+        event_type=notification.event_type,
+        entity_type=notification.entity_type,
+        entity_id=notification.entity_id,
+        title=notification.title,
+        message=notification.message,
+        notification_config=notification.notification_config,
+        queues=[
+            NotificationQueue(
+                channel=channel,
+                status="pending",
+                priority=priority,
+                scheduled_at=scheduled_at
+            )
+            for channel in channels
+        ]
+    )
+    
+    db.add(db_notification)
+    return db_notification
+
+
+async def claim_notification_batch(
+    db: AsyncSession,
+    channel: str,
+    limit: int = 50
+) -> List[NotificationQueue]:
+    """
+    Захватить пакет готовых к отправке элементов очереди одного канала.
+    
+    Строки выбираются с FOR UPDATE SKIP LOCKED в порядке priority и scheduled_at
+    и сразу переводятся в статус processing, поэтому параллельные воркеры
+    получают непересекающиеся пакеты, а каналы не вытесняют друг друга.
+    
+    Args:
+        db: Сессия базы данных
+        channel: Канал доставки
+        limit: Размер пакета
+    
+    Returns:
+        Захваченные элементы очереди с загруженными уведомлением и пользователем
+    """
+    claimable = (
+        select(NotificationQueue.id)
+        .where(
+            NotificationQueue.channel == channel,
+            NotificationQueue.status == "pending",
+            NotificationQueue.scheduled_at <= func.now(),
+            NotificationQueue.deleted_at.is_(None)
+        )
+        .order_by(NotificationQueue.priority.desc(), NotificationQueue.scheduled_at.asc())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    stmt = (
+        update(NotificationQueue)
+        .where(NotificationQueue.id.in_(claimable))
+        .values(status="processing", updated_at=func.now())
+        .returning(NotificationQueue.id)
+    )
+    result = await db.execute(stmt)
+    claimed_ids = list(result.scalars().all())
+    await db.commit()
+    
+    if not claimed_ids:
+        return []
+    
+    stmt_items = (
+        select(NotificationQueue)
+        .where(NotificationQueue.id.in_(claimed_ids))
+        .options(selectinload(NotificationQueue.notification).selectinload(Notification.user))
+        .order_by(NotificationQueue.priority.desc(), NotificationQueue.scheduled_at.asc())
+    )
+    result_items = await db.execute(stmt_items)
+    return list(result_items.scalars().all())
+
+
+async def hold_notification_queue_item(db: AsyncSession, queue_item: NotificationQueue, until: datetime) -> None:
+    """
+    Вернуть захваченный элемент в pending с отложенным временем отправки.
+    
+    Args:
+        db: Сессия базы данных
+        queue_item: Захваченный элемент очереди
+        until: Новое время отправки
+    """
+    queue_item.status = "pending"
+    queue_item.scheduled_at = until
+    await db.commit()
+
+
+async def coalesce_notification_queue(
+    db: AsyncSession,
+    lead: NotificationQueue,
+    user_id: UUID,
+    limit: int = 50
+) -> List[NotificationQueue]:
+    """
+    Присоединить к элементу очереди остальные ожидающие элементы того же
+    пользователя и канала для отправки одной сводкой.
+    
+    Уведомления с notification_config {"digest": false} не присоединяются.
+    Захват выполняется с FOR UPDATE SKIP LOCKED, поэтому элементы, уже взятые
+    другим воркером, пропускаются.
+    
+    Args:
+        db: Сессия базы данных
+        lead: Захваченный элемент, в который объединяются остальные
+        user_id: ID получателя
+        limit: Максимальное число элементов в сводке
+    
+    Returns:
+        Все элементы, объединенные в lead (включая объединенные ранее), по времени создания
+    """
+    absorbable = (
+        select(NotificationQueue.id)
+        .join(Notification, Notification.id == NotificationQueue.notification_id)
+        .where(
+            NotificationQueue.channel == lead.channel,
+            NotificationQueue.status == "pending",
+            NotificationQueue.id != lead.id,
+            NotificationQueue.deleted_at.is_(None),
+            Notification.user_id == user_id,
+            func.coalesce(Notification.notification_config["digest"].astext, "true") != "false"
+        )
+        .order_by(NotificationQueue.created_at.asc())
+        .limit(limit)
+        .with_for_update(of=NotificationQueue, skip_locked=True)
+        .scalar_subquery()
+    )
+    stmt = (
+        update(NotificationQueue)
+        .where(NotificationQueue.id.in_(absorbable))
+        .values(status="coalesced", coalesced_into_id=lead.id, updated_at=func.now())
+    )
+    await db.execute(stmt)
+    await db.commit()
+    
+    stmt_items = (
+        select(NotificationQueue)
+        .where(NotificationQueue.coalesced_into_id == lead.id)
+        .options(selectinload(NotificationQueue.notification))
+        .order_by(NotificationQueue.created_at.asc())
+    )
+    result = await db.execute(stmt_items)
+    return list(result.scalars().all())
+
+
+async def mark_coalesced_sent(db: AsyncSession, lead: NotificationQueue) -> int:
+    """
+    Отметить элементы, объединенные в lead, как отправленные (без commit).
+    
+    Args:
+        db: Сессия базы данных
+        lead: Отправленный элемент-сводка
+    
+    Returns:
+        Количество обновленных элементов
+    """
+    stmt = (
+        update(NotificationQueue)
+        .where(NotificationQueue.coalesced_into_id == lead.id, NotificationQueue.status == "coalesced")
+        .values(status="sent", sent_at=lead.sent_at)
+    )
+    result = await db.execute(stmt)
+    return result.rowcount
+
+
+async def mark_coalesced_dead(db: AsyncSession, lead: NotificationQueue) -> int:
+    """
+    Перевести элементы, объединенные в lead, в dead вместе с ним (без commit).
+    
+    Args:
+        db: Сессия базы данных
+        lead: Элемент-сводка, исчерпавший попытки
+    
+    Returns:
+        Количество обновленных элементов
+    """
+    stmt = (
+        update(NotificationQueue)
+        .where(NotificationQueue.coalesced_into_id == lead.id, NotificationQueue.status == "coalesced")
+        .values(status="dead", error_message=lead.error_message)
+    )
+    result = await db.execute(stmt)
+    return result.rowcount
+
+
+async def requeue_due_notification_retries(db: AsyncSession, limit: int = 500) -> Dict[str, int]:
+    """
+    Вернуть в pending неудачные элементы очереди, у которых наступило время
+    следующей попытки (scheduled_at) и остались попытки (retry_count < max_retries).
+    
+    Строки выбираются с FOR UPDATE SKIP LOCKED, поэтому параллельные запуски
+    планировщика не возвращают один элемент дважды.
+    
+    Args:
+        db: Сессия базы данных
+        limit: Максимальное число возвращаемых элементов
+    
+    Returns:
+        Количество возвращенных в очередь элементов по каналам
+    """
+    due = (
+        select(NotificationQueue.id)
+        .where(
+            NotificationQueue.status == "failed",
+            NotificationQueue.scheduled_at <= func.now(),
+            NotificationQueue.retry_count < NotificationQueue.max_retries,
+            NotificationQueue.deleted_at.is_(None)
+        )
+        .order_by(NotificationQueue.scheduled_at.asc())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    stmt = (
+        update(NotificationQueue)
+        .where(NotificationQueue.id.in_(due))
+        .values(status="pending", updated_at=func.now())
+        .returning(NotificationQueue.channel)
+    )
+    result = await db.execute(stmt)
+    requeued: Dict[str, int] = {}
+    for channel in result.scalars().all():
+        requeued[channel] = requeued.get(channel, 0) + 1
+    await db.commit()
+    return requeued
+
+
+async def dead_letter_exhausted_notifications(db: AsyncSession) -> int:
+    """
+    Перевести в dead неудачные элементы, исчерпавшие max_retries
+    (например, записанные до появления статуса dead или с уменьшенным max_retries).
+    
+    Args:
+        db: Сессия базы данных
+    
+    Returns:
+        Количество переведенных элементов
+    """
+    stmt = (
+        update(NotificationQueue)
+        .where(
+            NotificationQueue.status == "failed",
+            NotificationQueue.retry_count >= NotificationQueue.max_retries,
+            NotificationQueue.deleted_at.is_(None)
+        )
+        .values(status="dead", updated_at=func.now())
+    )
+    result = await db.execute(stmt)
+    await db.commit()
+    return result.rowcount
+
+
+async def get_notification_retry_histogram(db: AsyncSession) -> Dict[int, int]:
+    """
+    Распределение элементов очереди по числу выполненных повторных попыток.
+    
+    Returns:
+        {retry_count: количество элементов} для элементов с retry_count > 0
+    """
+    stmt = (
+        select(NotificationQueue.retry_count, func.count())
+        .where(NotificationQueue.retry_count > 0, NotificationQueue.deleted_at.is_(None))
+        .group_by(NotificationQueue.retry_count)
+        .order_by(NotificationQueue.retry_count)
+    )
+    result = await db.execute(stmt)
+    return {retry_count: count for retry_count, count in result.all()}
+
+
+async def release_stale_notification_claims(db: AsyncSession, timeout_seconds: int) -> int:
+    """
+    Вернуть в pending элементы, зависшие в processing дольше timeout_seconds
+    (например, после падения воркера).
+    
+    Args:
+        db: Сессия базы данных
+        timeout_seconds: Время владения захватом
+    
+    Returns:
+        Количество возвращенных элементов
+    """
+    stmt = (
+        update(NotificationQueue)
+        .where(
+            NotificationQueue.status == "processing",
+            NotificationQueue.updated_at < func.now() - timedelta(seconds=timeout_seconds)
+        )
+        .values(status="pending", updated_at=func.now())
+    )
+    result = await db.execute(stmt)
+    await db.commit()
+    return result.rowcount
+
+
 async def get_notification_queue(db: AsyncSession, queue_id: UUID) -> Optional[NotificationQueue]:
     stmt = select(NotificationQueue).where(NotificationQueue.id == queue_id)
     result = await db.execute(stmt)
@@ -188,6 +687,7 @@ async def get_notification_queue_list(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     notification_id: Optional[UUID] = None,
     channel: Optional[str] = None,
     status: Optional[str] = None
@@ -203,8 +703,7 @@ async def get_notification_queue_list(
     if status is not None:
         stmt = stmt.where(NotificationQueue.status == status)
     
-    stmt = stmt.order_by(NotificationQueue.created_at.desc())
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, NotificationQueue.created_at, NotificationQueue.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
@@ -238,28 +737,44 @@ async def get_pending_notifications(db: AsyncSession, limit: int = 100) -> List[
     return list(result.scalars().all())
 
 
-async def get_notification_queue_stats(db: AsyncSession) -> Dict[str, Any]:
-    stmt = select(NotificationQueue)
-    result = await db.execute(stmt)
-    queues = result.scalars().all()
-    
-    stats = {
-        "pending": sum(1 for q in queues if q.status == "pending"),
-        "processing": sum(1 for q in queues if q.status == "processing"),
-        "failed": sum(1 for q in queues if q.status == "failed"),
-        "size": len(queues),
-        "lag_minutes": None,
-        "speed_per_minute": None
+async def get_notification_queue_stats(db: AsyncSession, speed_window_minutes: int = 5) -> Dict[str, Any]:
+    """
+    Статистика очереди уведомлений, посчитанная одним агрегирующим запросом.
+    
+    lag_minutes - сколько ждет самый старый элемент, время отправки которого
+    уже наступило; speed_per_minute - число отправок (по sent_at) в минуту
+    за последние speed_window_minutes минут.
+    
+    Args:
+        db: Сессия базы данных
+        speed_window_minutes: Окно расчета скорости отправки
+    
+    Returns:
+        Счетчики по статусам, размер, отставание, скорость и гистограмма повторов
+    """
+    now = datetime.now(timezone.utc)
+    is_due = and_(NotificationQueue.status == "pending", NotificationQueue.scheduled_at <= now)
+    stmt = select(
+        func.count().filter(NotificationQueue.status == "pending").label("pending"),
+        func.count().filter(NotificationQueue.status == "processing").label("processing"),
+        func.count().filter(NotificationQueue.status == "failed").label("failed"),
+        func.count().filter(NotificationQueue.status == "dead").label("dead"),
+        func.count().label("size"),
+        func.min(NotificationQueue.scheduled_at).filter(is_due).label("oldest_due_at"),
+        func.count().filter(NotificationQueue.sent_at >= now - timedelta(minutes=speed_window_minutes)).label("sent_in_window")
+    )
+    row = (await db.execute(stmt)).one()
+    
+    return {
+        "pending": row.pending,
+        "processing": row.processing,
+        "failed": row.failed,
+        "dead": row.dead,
+        "size": row.size,
+        "lag_minutes": (now - row.oldest_due_at).total_seconds() / 60 if row.oldest_due_at else None,
+        "speed_per_minute": row.sent_in_window / speed_window_minutes,
+        "retry_histogram": await get_notification_retry_histogram(db)
     }
-    
-    if queues:
-        oldest_pending = min((q for q in queues if q.status == "pending"), 
-                            key=lambda q: q.scheduled_at, default=None)
-        if oldest_pending:
-            lag = datetime.now() - oldest_pending.scheduled_at
-            stats["lag_minutes"] = lag.total_seconds() / 60
-    
-    return stats
 
 
 async def delete_notification_queue(db: AsyncSession, queue_id: UUID) -> bool:
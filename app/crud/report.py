@@ -1,43 +1,71 @@
-from typing import List, Optional
+import json
+from typing import AsyncIterator, List, Optional, Tuple
 from uuid import UUID
-from datetime import date
-from sqlalchemy import select, func, and_, or_
+from datetime import date, datetime
+from sqlalchemy import select, func, text
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased
+
+from app.core.pagination import encode_cursor, paginate
 
 from app.models.finding import Finding
 from app.models.audit import Audit
 from app.models.user import User
 from app.models.status import Status
 from app.models.dictionary import Dictionary
+from app.models.findings_summary import FindingsSummary
+from app.crud.findings_summary import FINDING_DAY
 
 
-async def get_findings_report(
-    db: AsyncSession,
+def _filter_findings(
+    stmt,
     enterprise_id: Optional[UUID] = None,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
     status_id: Optional[UUID] = None,
     finding_type: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 1000
-) -> tuple[List[dict], int]:
-    """
-    Получить отчет по несоответствиям.
+    utc_day: bool = False
+):
+    stmt = stmt.where(Finding.deleted_at.is_(None))
+    created = FINDING_DAY if utc_day else Finding.created_at
     
-    Returns:
-        tuple: (список строк отчета, общее количество)
-    """
-    stmt = select(
-        Finding,
+    if enterprise_id:
+        stmt = stmt.where(Finding.enterprise_id == enterprise_id)
+    
+    if date_from:
+        stmt = stmt.where(created >= date_from)
+    
+    if date_to:
+        stmt = stmt.where(created <= date_to)
+    
+    if status_id:
+        stmt = stmt.where(Finding.status_id == status_id)
+    
+    if finding_type:
+        stmt = stmt.where(Finding.finding_type == finding_type)
+    
+    return stmt
+
+
+def _findings_report_select(*extra_columns):
+    approver = aliased(User)
+    return select(
+        Finding.finding_number,
         Audit.audit_number,
         Audit.title.label("audit_title"),
+        Finding.title,
+        Finding.finding_type,
         Dictionary.name.label("process_name"),
         Status.name.label("status_name"),
-        User.first_name_ru,
-        User.last_name_ru,
-        User_approver.first_name_ru.label("approver_first_name"),
-        User_approver.last_name_ru.label("approver_last_name")
+        User.first_name_ru.label("resolver_first_name"),
+        User.last_name_ru.label("resolver_last_name"),
+        approver.first_name_ru.label("approver_first_name"),
+        approver.last_name_ru.label("approver_last_name"),
+        Finding.deadline,
+        Finding.closing_date,
+        Finding.created_at,
+        *extra_columns
     ).join(
         Audit, Finding.audit_id == Audit.id
     ).join(
@@ -47,57 +75,181 @@ async def get_findings_report(
     ).join(
         User, Finding.resolver_id == User.id
     ).outerjoin(
-        User_approver := User.alias(), Finding.approver_id == User_approver.id
-    ).where(
-        Finding.deleted_at.is_(None)
+        approver, Finding.approver_id == approver.id
     )
+
+
+def _findings_report_row(row) -> dict:
+    approver_name = None
+    if row.approver_first_name and row.approver_last_name:
+        approver_name = f"{row.approver_first_name} {row.approver_last_name}"
     
-    if enterprise_id:
-        stmt = stmt.where(Finding.enterprise_id == enterprise_id)
+    return {
+        "finding_number": row.finding_number,
+        "audit_number": row.audit_number,
+        "audit_title": row.audit_title,
+        "title": row.title,
+        "finding_type": row.finding_type,
+        "process_name": row.process_name,
+        "status_name": row.status_name,
+        "resolver_name": f"{row.resolver_first_name} {row.resolver_last_name}",
+        "approver_name": approver_name,
+        "deadline": row.deadline,
+        "closing_date": row.closing_date,
+        "created_at": row.created_at.date()
+    }
+
+
+async def count_findings(
+    db: AsyncSession,
+    enterprise_id: Optional[UUID] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    status_id: Optional[UUID] = None,
+    finding_type: Optional[str] = None,
+    estimated: bool = False
+) -> int:
+    """
+    Количество несоответствий под фильтром отчета.
     
-    if date_from:
-        stmt = stmt.where(Finding.created_at >= date_from)
+    Считается по одной таблице findings: соединения отчета внутренние по
+    обязательным внешним ключам и число строк не меняют. При estimated=True
+    возвращается оценка планировщика PostgreSQL (EXPLAIN) без чтения строк.
+    """
+    stmt = _filter_findings(select(Finding.id), enterprise_id, date_from, date_to, status_id, finding_type)
     
-    if date_to:
-        stmt = stmt.where(Finding.created_at <= date_to)
+    if estimated:
+        compiled = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+        result = await db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
     
-    if status_id:
-        stmt = stmt.where(Finding.status_id == status_id)
+    result = await db.execute(select(func.count()).select_from(stmt.subquery()))
+    return result.scalar_one()
+
+
+async def get_findings_report(
+    db: AsyncSession,
+    enterprise_id: Optional[UUID] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    status_id: Optional[UUID] = None,
+    finding_type: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 1000,
+    cursor: Optional[str] = None,
+    estimated_total: bool = False
+) -> Tuple[List[dict], int, Optional[str]]:
+    """
+    Получить страницу отчета по несоответствиям.
     
-    if finding_type:
-        stmt = stmt.where(Finding.finding_type == finding_type)
+    Страница и общее количество получаются одним запросом с count(*) OVER ():
+    окно считается по всем строкам под фильтром до LIMIT. С курсором (keyset по
+    created_at, id) окно видело бы только строки после курсора, поэтому общее
+    количество считается отдельным запросом по findings без соединений; так же
+    и для пустой страницы. estimated_total=True заменяет точный подсчет оценкой
+    планировщика.
+    
+    Returns:
+        tuple: (строки отчета, общее количество, курсор следующей страницы или None)
+    """
+    filters = (enterprise_id, date_from, date_to, status_id, finding_type)
+    window_total = not cursor and not estimated_total
     
-    stmt_count = select(func.count()).select_from(stmt.subquery())
-    result_count = await db.execute(stmt_count)
-    total = result_count.scalar() or 0
+    extra_columns = [Finding.id]
+    if window_total:
+        extra_columns.append(func.count().over().label("total_count"))
     
-    stmt = stmt.order_by(Finding.created_at.desc()).offset(skip).limit(limit)
+    stmt = _filter_findings(_findings_report_select(*extra_columns), *filters)
+    stmt = paginate(stmt, Finding.created_at, Finding.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     rows = result.all()
     
-    report_data = []
-    for row in rows:
-        finding = row[0]
-        approver_name = None
-        if row[8] and row[9]:
-            approver_name = f"{row[8]} {row[9]}"
-        
-        report_data.append({
-            "finding_number": finding.finding_number,
-            "audit_number": row[1],
-            "audit_title": row[2],
-            "title": finding.title,
-            "finding_type": finding.finding_type,
-            "process_name": row[3],
-            "status_name": row[4],
-            "resolver_name": f"{row[5]} {row[6]}",
-            "approver_name": approver_name,
-            "deadline": finding.deadline,
-            "closing_date": finding.closing_date,
-            "created_at": finding.created_at.date()
-        })
-    
-    return report_data, total
+    if window_total and rows:
+        total = rows[0].total_count
+    else:
+        total = await count_findings(db, *filters, estimated=estimated_total)
+    
+    next_page = None
+    if len(rows) == limit:
+        next_page = encode_cursor(rows[-1].created_at, rows[-1].id)
+    
+    return [_findings_report_row(row) for row in rows], total, next_page
+
+
+async def get_findings_watermark(
+    db: AsyncSession,
+    enterprise_id: Optional[UUID] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    status_id: Optional[UUID] = None,
+    finding_type: Optional[str] = None,
+    utc_day: bool = False
+) -> Tuple[Optional[datetime], int]:
+    """
+    Отметка актуальности данных отчета: последнее изменение и число несоответствий под фильтром.
+    
+    Любое изменение несоответствия, в том числе мягкое удаление, сдвигает updated_at,
+    а число строк учитывает удаление записей из таблицы. Для отчетов из куба
+    findings_summary передается utc_day=True: период тогда фильтруется, как в кубе,
+    по дню создания (UTC) включительно.
+    
+    Returns:
+        tuple: (max(updated_at) или None, количество)
+    """
+    stmt = _filter_findings(
+        select(func.max(Finding.updated_at), func.count()).select_from(Finding),
+        enterprise_id, date_from, date_to, status_id, finding_type, utc_day=utc_day
+    )
+    result = await db.execute(stmt)
+    watermark, count = result.one()
+    return watermark, count
+
+
+async def stream_findings_report(
+    db: AsyncSession,
+    enterprise_id: Optional[UUID] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    status_id: Optional[UUID] = None,
+    finding_type: Optional[str] = None,
+    chunk_size: int = 2000
+) -> AsyncIterator[List[dict]]:
+    """
+    Строки отчета по несоответствиям пачками из серверного курсора.
+    
+    Выбираются только колонки отчета, без загрузки объектов Finding,
+    поэтому память ограничена размером пачки при любом числе строк.
+    
+    Yields:
+        Пачки строк отчета (не больше chunk_size)
+    """
+    stmt = _filter_findings(
+        _findings_report_select(), enterprise_id, date_from, date_to, status_id, finding_type
+    )
+    stmt = stmt.order_by(Finding.created_at.desc(), Finding.id.desc()).execution_options(yield_per=chunk_size)
+    result = await db.stream(stmt)
+    async for partition in result.partitions(chunk_size):
+        yield [_findings_report_row(row) for row in partition]
+
+
+def _filter_summary(stmt, enterprise_id: Optional[UUID], date_from: Optional[date], date_to: Optional[date]):
+    if enterprise_id:
+        stmt = stmt.where(FindingsSummary.enterprise_id == enterprise_id)
+    
+    if date_from:
+        stmt = stmt.where(FindingsSummary.day >= date_from)
+    
+    if date_to:
+        stmt = stmt.where(FindingsSummary.day <= date_to)
+    
+    return stmt.having(func.sum(FindingsSummary.findings_count) > 0)
+
+
+def _summary_count(*criteria):
+    return func.coalesce(func.sum(FindingsSummary.findings_count).filter(*criteria), 0)
 
 
 async def get_process_report(
@@ -107,7 +259,9 @@ async def get_process_report(
     date_to: Optional[date] = None
 ) -> List[dict]:
     """
-    Получить отчет по процессам.
+    Получить отчет по процессам из куба findings_summary.
+    
+    Период фильтруется по дню создания несоответствия (UTC) включительно.
     
     Returns:
         Список строк отчета
@@ -116,49 +270,33 @@ async def get_process_report(
     
     stmt = select(
         Dictionary.name.label("process_name"),
-        func.count(Finding.id).label("total_findings"),
-        func.sum(func.cast(Finding.finding_type == "CAR1", func.Integer)).label("car1_count"),
-        func.sum(func.cast(Finding.finding_type == "CAR2", func.Integer)).label("car2_count"),
-        func.sum(func.cast(Finding.finding_type == "OFI", func.Integer)).label("ofi_count"),
-        func.sum(func.cast(Status.is_final == True, func.Integer)).label("closed_count"),
-        func.sum(func.cast(and_(Status.is_final == False, Finding.deadline < today), func.Integer)).label("overdue_count")
-    ).join(
-        Audit, Finding.audit_id == Audit.id
+        _summary_count().label("total_findings"),
+        _summary_count(FindingsSummary.finding_type == "CAR1").label("car1_count"),
+        _summary_count(FindingsSummary.finding_type == "CAR2").label("car2_count"),
+        _summary_count(FindingsSummary.finding_type == "OFI").label("ofi_count"),
+        _summary_count(FindingsSummary.status_is_final.is_(True)).label("closed_count"),
+        _summary_count(FindingsSummary.status_is_final.is_(False), FindingsSummary.deadline < today).label("overdue_count")
     ).join(
-        Dictionary, Finding.process_id == Dictionary.id
-    ).join(
-        Status, Finding.status_id == Status.id
-    ).where(
-        Finding.deleted_at.is_(None)
+        Dictionary, FindingsSummary.process_id == Dictionary.id
     ).group_by(
         Dictionary.id, Dictionary.name
     )
-    
-    if enterprise_id:
-        stmt = stmt.where(Finding.enterprise_id == enterprise_id)
-    
-    if date_from:
-        stmt = stmt.where(Finding.created_at >= date_from)
-    
-    if date_to:
-        stmt = stmt.where(Finding.created_at <= date_to)
+    stmt = _filter_summary(stmt, enterprise_id, date_from, date_to)
     
     result = await db.execute(stmt)
-    rows = result.all()
-    
-    report_data = []
-    for row in rows:
-        report_data.append({
-            "process_name": row[0],
-            "total_findings": row[1] or 0,
-            "car1_count": row[2] or 0,
-            "car2_count": row[3] or 0,
-            "ofi_count": row[4] or 0,
-            "closed_count": row[5] or 0,
-            "overdue_count": row[6] or 0
-        })
     
-    return report_data
+    return [
+        {
+            "process_name": row.process_name,
+            "total_findings": row.total_findings,
+            "car1_count": row.car1_count,
+            "car2_count": row.car2_count,
+            "ofi_count": row.ofi_count,
+            "closed_count": row.closed_count,
+            "overdue_count": row.overdue_count
+        }
+        for row in result.all()
+    ]
 
 
 async def get_solver_report(
@@ -168,7 +306,9 @@ async def get_solver_report(
     date_to: Optional[date] = None
 ) -> List[dict]:
     """
-    Получить отчет по исполнителям.
+    Получить отчет по исполнителям из куба findings_summary.
+    
+    Период фильтруется по дню создания несоответствия (UTC) включительно.
     
     Returns:
         Список строк отчета
@@ -178,43 +318,26 @@ async def get_solver_report(
     stmt = select(
         User.first_name_ru,
         User.last_name_ru,
-        func.count(Finding.id).label("total_findings"),
-        func.sum(func.cast(Status.is_final == False, func.Integer)).label("active_findings"),
-        func.sum(func.cast(and_(Status.is_final == False, Finding.deadline < today), func.Integer)).label("overdue_findings"),
-        func.sum(func.cast(Status.is_final == True, func.Integer)).label("closed_findings")
-    ).join(
-        Audit, Finding.audit_id == Audit.id
-    ).join(
-        User, Finding.resolver_id == User.id
+        _summary_count().label("total_findings"),
+        _summary_count(FindingsSummary.status_is_final.is_(False)).label("active_findings"),
+        _summary_count(FindingsSummary.status_is_final.is_(False), FindingsSummary.deadline < today).label("overdue_findings"),
+        _summary_count(FindingsSummary.status_is_final.is_(True)).label("closed_findings")
     ).join(
-        Status, Finding.status_id == Status.id
-    ).where(
-        Finding.deleted_at.is_(None)
+        User, FindingsSummary.resolver_id == User.id
     ).group_by(
         User.id, User.first_name_ru, User.last_name_ru
     )
-    
-    if enterprise_id:
-        stmt = stmt.where(Finding.enterprise_id == enterprise_id)
-    
-    if date_from:
-        stmt = stmt.where(Finding.created_at >= date_from)
-    
-    if date_to:
-        stmt = stmt.where(Finding.created_at <= date_to)
+    stmt = _filter_summary(stmt, enterprise_id, date_from, date_to)
     
     result = await db.execute(stmt)
-    rows = result.all()
     
-    report_data = []
-    for row in rows:
-        report_data.append({
-            "solver_name": f"{row[0]} {row[1]}",
-            "total_findings": row[2] or 0,
-            "active_findings": row[3] or 0,
-            "overdue_findings": row[4] or 0,
-            "closed_findings": row[5] or 0
-        })
-    
-    return report_data
-
+    return [
+        {
+            "solver_name": f"{row.first_name_ru} {row.last_name_ru}",
+            "total_findings": row.total_findings,
+            "active_findings": row.active_findings,
+            "overdue_findings": row.overdue_findings,
+            "closed_findings": row.closed_findings
+        }
+        for row in result.all()
+    ]
@@ -4,6 +4,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.role import Role, Permission
 from app.schemas.role import RoleCreate, RoleUpdate, PermissionCreate
+from app.services.permissions import permission_service
+from app.core.pagination import paginate
 
 
 async def create_role(db: AsyncSession, role: RoleCreate) -> Role:
@@ -35,6 +37,7 @@ async def get_roles(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     is_system: Optional[bool] = None
 ) -> List[Role]:
     stmt = select(Role)
@@ -42,7 +45,7 @@ async def get_roles(
     if is_system is not None:
         stmt = stmt.where(Role.is_system == is_system)
     
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, Role.created_at, Role.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
@@ -61,6 +64,7 @@ async def update_role(db: AsyncSession, role_id: UUID, role_update: RoleUpdate)
         setattr(db_role, field, value)
     
     await db.commit()
+    await permission_service.invalidate_all()
     await db.refresh(db_role)
     return db_role
 
@@ -75,6 +79,7 @@ async def delete_role(db: AsyncSession, role_id: UUID) -> bool:
     
     db_role.soft_delete()
     await db.commit()
+    await permission_service.invalidate_all()
     return True
 
 
@@ -87,6 +92,7 @@ async def create_permission(db: AsyncSession, permission: PermissionCreate, role
     )
     db.add(db_permission)
     await db.commit()
+    await permission_service.invalidate_all()
     await db.refresh(db_permission)
     return db_permission
 
@@ -107,5 +113,6 @@ async def delete_permission(db: AsyncSession, permission_id: UUID) -> bool:
     
     await db.delete(db_permission)
     await db.commit()
+    await permission_service.invalidate_all()
     return True
 
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.s3_storage import S3Storage
 from app.schemas.s3_storage import S3StorageCreate, S3StorageUpdate
 from app.core.security import encrypt_value, decrypt_value
+from app.core.pagination import paginate
 
 
 async def create_s3_storage(db: AsyncSession, storage: S3StorageCreate) -> S3Storage:
@@ -37,6 +38,7 @@ async def get_s3_storages(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     enterprise_id: Optional[UUID] = None,
     division_id: Optional[UUID] = None,
     is_active: Optional[bool] = None
@@ -52,7 +54,7 @@ async def get_s3_storages(
     if is_active is not None:
         stmt = stmt.where(S3Storage.is_active == is_active)
     
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, S3Storage.created_at, S3Storage.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.system_setting import SystemSetting
 from app.schemas.system_setting import SystemSettingCreate, SystemSettingUpdate
 from app.core.security import encrypt_value, decrypt_value
+from app.core.pagination import paginate
 
 
 async def create_system_setting(db: AsyncSession, setting: SystemSettingCreate, updated_by_id: Optional[UUID] = None) -> SystemSetting:
@@ -40,6 +41,7 @@ async def get_system_settings(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     category: Optional[str] = None,
     is_public: Optional[bool] = None
 ) -> List[SystemSetting]:
@@ -51,7 +53,7 @@ async def get_system_settings(
     if is_public is not None:
         stmt = stmt.where(SystemSetting.is_public == is_public)
     
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, SystemSetting.created_at, SystemSetting.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
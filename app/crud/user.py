@@ -5,6 +5,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 from app.core.security import get_password_hash
+from app.services.principal_cache import principal_cache
+from app.core.pagination import paginate
 
 
 async def create_user(db: AsyncSession, user: UserCreate) -> User:
@@ -18,6 +20,7 @@ async def create_user(db: AsyncSession, user: UserCreate) -> User:
         last_name_en=user.last_name_en,
         location_id=user.location_id,
         language=user.language,
+        notification_digest_minutes=user.notification_digest_minutes,
         is_auditor=user.is_auditor,
         is_expert=user.is_expert,
         is_active=user.is_active,
@@ -53,6 +56,7 @@ async def get_users(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     is_active: Optional[bool] = None,
     location_id: Optional[UUID] = None
 ) -> List[User]:
@@ -64,7 +68,7 @@ async def get_users(
     if location_id is not None:
         stmt = stmt.where(User.location_id == location_id)
     
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = paginate(stmt, User.created_at, User.id, cursor=cursor, skip=skip, limit=limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
@@ -83,6 +87,7 @@ async def update_user(db: AsyncSession, user_id: UUID, user_update: UserUpdate)
         setattr(db_user, field, value)
     
     await db.commit()
+    await principal_cache.invalidate(db_user.id)
     await db.refresh(db_user)
     return db_user
 
@@ -94,6 +99,7 @@ async def delete_user(db: AsyncSession, user_id: UUID) -> bool:
     
     db_user.soft_delete()
     await db.commit()
+    await principal_cache.invalidate(db_user.id)
     return True
 
 
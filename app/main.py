@@ -1,6 +1,27 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+from app.core.database import init_db, close_db, get_pool_metrics, replica_monitor, async_session_maker
+from app.crud.findings_summary import ensure_findings_summary
+from app.core.pagination import InvalidCursorError
+from app.services.partitions import ensure_partitions
+from app.services.smtp_pool import close_smtp_pools
+from app.services.telegram_dispatcher import telegram_dispatcher
 from app.api import users, enterprises, roles, auth, auth_otp, telegram, workflow, dictionaries, audit_plans, auditor_qualifications, audits, audit_components, findings, attachments, settings, integrations, change_history, notifications, api_tokens, dashboard, reports
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_db()
+    await ensure_partitions()
+    async with async_session_maker() as db:
+        await ensure_findings_summary(db)
+    yield
+    await close_smtp_pools()
+    await telegram_dispatcher.close()
+    await close_db()
+
+
 app = FastAPI(
     title="MGC Audits API",
     description="API для системы управления аудитами качества и несоответствиями",
@@ -8,8 +29,24 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    lifespan=lifespan,
 )
 
+
+@app.middleware("http")
+async def db_engine_header(request: Request, call_next):
+    response = await call_next(request)
+    db_engine = getattr(request.state, "db_engine", None)
+    if db_engine:
+        response.headers["X-DB-Engine"] = db_engine
+    return response
+
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc)})
+
+
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(auth_otp.router, prefix="/api/v1")
 app.include_router(telegram.router, prefix="/api/v1")
@@ -46,3 +83,7 @@ async def root():
 async def health_check():
     return {"status": "ok"}
 
+
+@app.get("/health/db")
+async def health_db():
+    return {"pools": get_pool_metrics(), "served": replica_monitor.served}
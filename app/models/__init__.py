@@ -28,6 +28,8 @@ from app.models.ldap_connection import LdapConnection
 from app.models.notification import Notification
 from app.models.notification_queue import NotificationQueue
 from app.models.export_task import ExportTask
+from app.models.dashboard_rollup import DashboardRollup
+from app.models.findings_summary import FindingsSummary
 
 __all__ = [
     "Enterprise",
@@ -63,5 +65,7 @@ __all__ = [
     "Notification",
     "NotificationQueue",
     "ExportTask",
+    "DashboardRollup",
+    "FindingsSummary",
 ]
 
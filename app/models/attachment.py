@@ -1,10 +1,13 @@
-from sqlalchemy import Column, String, ForeignKey, BigInteger
+from sqlalchemy import Column, String, ForeignKey, BigInteger, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.core.base import AbstractBaseModel
 
 
 class Attachment(AbstractBaseModel):
     __tablename__ = "attachments"
+    __table_args__ = (
+        Index("ix_attachments_object_id_created_at_id", "object_id", "created_at", "id"),
+    )
 
     object_id = Column(UUID(as_uuid=True), nullable=False)
     content_type = Column(String(100), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Date, Integer, ForeignKey, Text, Table, DateTime, Numeric
+from sqlalchemy import Column, String, Date, Integer, ForeignKey, Text, Table, DateTime, Numeric, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.base import AbstractBaseModel
@@ -28,6 +28,10 @@ audit_shifts = Table(
 
 class Audit(AbstractBaseModel):
     __tablename__ = "audits"
+    __table_args__ = (
+        Index("ix_audits_created_at_id", "created_at", "id"),
+        Index("ix_audits_enterprise_id_created_at_id", "enterprise_id", "created_at", "id"),
+    )
 
     title = Column(String(500), nullable=False)
     audit_number = Column(String(100), unique=True, nullable=False)
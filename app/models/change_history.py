@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, ForeignKey, Text, DateTime
+import uuid
+from sqlalchemy import Column, String, ForeignKey, Text, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.base import AbstractBaseModel
@@ -6,14 +7,22 @@ from app.core.base import AbstractBaseModel
 
 class ChangeHistory(AbstractBaseModel):
     __tablename__ = "change_history"
+    __table_args__ = (
+        Index("ix_change_history_changed_at_id", "changed_at", "id"),
+        Index("ix_change_history_entity_changed_at_id", "entity_type", "entity_id", "changed_at", "id"),
+        {"postgresql_partition_by": "RANGE (changed_at)"},
+    )
 
+    # Таблица партиционирована по месяцам (см. services/partitions),
+    # поэтому ключ партиционирования входит в первичный ключ.
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    changed_at = Column(DateTime(timezone=True), primary_key=True, nullable=False)
     entity_type = Column(String(50), nullable=False)
     entity_id = Column(UUID(as_uuid=True), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     field_name = Column(String(100), nullable=False)
     old_value = Column(Text, nullable=True)
     new_value = Column(Text, nullable=True)
-    changed_at = Column(DateTime(timezone=True), nullable=False)
 
     user = relationship("User", foreign_keys=[user_id])
 
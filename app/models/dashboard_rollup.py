@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from app.core.base import AbstractBaseModel
+
+
+class DashboardRollup(AbstractBaseModel):
+    __tablename__ = "dashboard_rollups"
+
+    enterprise_id = Column(UUID(as_uuid=True), ForeignKey("enterprises.id"), unique=True, nullable=False)
+    total_audits = Column(Integer, default=0, nullable=False)
+    total_findings = Column(Integer, default=0, nullable=False)
+    active_findings = Column(Integer, default=0, nullable=False)
+    overdue_findings = Column(Integer, default=0, nullable=False)
+    refreshed_at = Column(DateTime(timezone=True), nullable=False)
+
+    enterprise = relationship("Enterprise", foreign_keys=[enterprise_id])
@@ -16,8 +16,12 @@ class ExportTaskStatus(str, enum.Enum):
 class ExportTask(AbstractBaseModel):
     __tablename__ = "export_tasks"
     
-    user_id = Column(UUID(as_uuid=True), ForeignKey("user.id"), nullable=False)
-    audit_id = Column(UUID(as_uuid=True), ForeignKey("audit.id"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    audit_id = Column(UUID(as_uuid=True), ForeignKey("audits.id"), nullable=True)
+    report_type = Column(String(50), nullable=True)
+    params = Column(JSON, nullable=True)
+    cache_key = Column(String(64), nullable=True, index=True)
+    data_watermark = Column(DateTime(timezone=True), nullable=True)
     status = Column(Enum(ExportTaskStatus), default=ExportTaskStatus.PENDING, nullable=False)
     celery_task_id = Column(String(255), nullable=True)
     file_path = Column(String(500), nullable=True)
@@ -25,5 +29,5 @@ class ExportTask(AbstractBaseModel):
     completed_at = Column(DateTime(timezone=True), nullable=True)
     
     def __repr__(self):
-        return f"<ExportTask(id={self.id}, audit_id={self.audit_id}, status={self.status})>"
+        return f"<ExportTask(id={self.id}, audit_id={self.audit_id}, report_type={self.report_type}, status={self.status})>"
 
@@ -1,13 +1,23 @@
-from sqlalchemy import Column, String, ForeignKey, Text, Date, Integer
+from sqlalchemy import Column, String, ForeignKey, Text, Date, Integer, Index, Sequence
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.base import AbstractBaseModel
 
 
+finding_number_seq = Sequence("findings_finding_number_seq")
+
+
 class Finding(AbstractBaseModel):
     __tablename__ = "findings"
+    __table_args__ = (
+        Index("ix_findings_created_at_id", "created_at", "id"),
+        Index("ix_findings_enterprise_id_created_at_id", "enterprise_id", "created_at", "id"),
+        Index("ix_findings_audit_id_created_at_id", "audit_id", "created_at", "id"),
+        Index("ix_findings_status_id_created_at_id", "status_id", "created_at", "id"),
+        Index("ix_findings_resolver_id", "resolver_id"),
+    )
 
-    finding_number = Column(Integer, unique=True, nullable=False, autoincrement=True)
+    finding_number = Column(Integer, finding_number_seq, unique=True, nullable=False)
     audit_id = Column(UUID(as_uuid=True), ForeignKey("audits.id"), nullable=False)
     enterprise_id = Column(UUID(as_uuid=True), ForeignKey("enterprises.id"), nullable=False)
     title = Column(Text, nullable=False)
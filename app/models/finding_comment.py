@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Text, ForeignKey
+from sqlalchemy import Column, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.base import AbstractBaseModel
@@ -6,6 +6,9 @@ from app.core.base import AbstractBaseModel
 
 class FindingComment(AbstractBaseModel):
     __tablename__ = "finding_comments"
+    __table_args__ = (
+        Index("ix_finding_comments_finding_id_created_at_id", "finding_id", "created_at", "id"),
+    )
 
     finding_id = Column(UUID(as_uuid=True), ForeignKey("findings.id"), nullable=False)
     author_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, Boolean, Date, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.base import AbstractBaseModel
+
+
+class FindingsSummary(AbstractBaseModel):
+    """
+    Куб количества несоответствий для отчетов по процессам и исполнителям.
+
+    Ключ - (предприятие, процесс, исполнитель, тип, финальность статуса, день создания по UTC,
+    дедлайн); дедлайн нужен для подсчета просроченных на текущую дату.
+    """
+    __tablename__ = "findings_summary"
+    __table_args__ = (
+        UniqueConstraint(
+            "enterprise_id", "process_id", "resolver_id", "finding_type", "status_is_final", "day", "deadline",
+            name="uq_findings_summary_key"
+        ),
+        Index("ix_findings_summary_enterprise_id_day", "enterprise_id", "day"),
+    )
+
+    enterprise_id = Column(UUID(as_uuid=True), ForeignKey("enterprises.id"), nullable=False)
+    process_id = Column(UUID(as_uuid=True), ForeignKey("dictionaries.id"), nullable=False)
+    resolver_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    finding_type = Column(String(20), nullable=False)
+    status_is_final = Column(Boolean, nullable=False)
+    day = Column(Date, nullable=False)
+    deadline = Column(Date, nullable=False)
+    findings_count = Column(Integer, default=0, nullable=False)
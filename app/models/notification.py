@@ -1,4 +1,6 @@
-from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, DateTime
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, DateTime, Index, text, func
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from app.core.base import AbstractBaseModel
@@ -6,6 +8,28 @@ from app.core.base import AbstractBaseModel
 
 class Notification(AbstractBaseModel):
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_notifications_user_id_unread", "user_id", postgresql_where=text("is_read = false")),
+        Index("ix_notifications_user_id_entity", "user_id", "entity_type", "entity_id"),
+        Index(
+            "ix_notifications_failed_created_at_id",
+            "created_at", "id",
+            postgresql_where=text("email_error IS NOT NULL OR telegram_error IS NOT NULL")
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    # Таблица партиционирована по месяцам (см. services/partitions), поэтому
+    # ключ партиционирования входит в первичный ключ, а внешние ключи на нее не ссылаются.
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    created_at = Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        nullable=False
+    )
 
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     event_type = Column(String(100), nullable=False)
@@ -25,5 +49,10 @@ class Notification(AbstractBaseModel):
     notification_config = Column(JSONB, nullable=True)
 
     user = relationship("User")
-    queues = relationship("NotificationQueue", back_populates="notification", cascade="all, delete-orphan")
+    queues = relationship(
+        "NotificationQueue",
+        primaryjoin="Notification.id == foreign(NotificationQueue.notification_id)",
+        back_populates="notification",
+        cascade="all, delete-orphan"
+    )
 
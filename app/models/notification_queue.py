@@ -1,4 +1,6 @@
-from sqlalchemy import Column, String, Text, Integer, ForeignKey, DateTime
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, Text, Integer, DateTime, Index, text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.base import AbstractBaseModel
@@ -6,8 +8,33 @@ from app.core.base import AbstractBaseModel
 
 class NotificationQueue(AbstractBaseModel):
     __tablename__ = "notification_queue"
+    __table_args__ = (
+        Index("ix_notification_queue_created_at_id", "created_at", "id"),
+        Index(
+            "ix_notification_queue_pending_claim",
+            "channel", text("priority DESC"), "scheduled_at",
+            postgresql_where=text("status = 'pending' AND deleted_at IS NULL")
+        ),
+        Index(
+            "ix_notification_queue_retry_due",
+            "scheduled_at",
+            postgresql_where=text("status = 'failed' AND deleted_at IS NULL")
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    notification_id = Column(UUID(as_uuid=True), ForeignKey("notifications.id"), nullable=False, index=True)
+    # Таблица партиционирована по месяцам (см. services/partitions), поэтому
+    # ключ партиционирования входит в первичный ключ, а связи заданы без внешних ключей.
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    created_at = Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        nullable=False
+    )
+
+    notification_id = Column(UUID(as_uuid=True), nullable=False, index=True)
     channel = Column(String(20), nullable=False, index=True)
     status = Column(String(20), nullable=False, index=True)
     priority = Column(Integer, default=0, nullable=False)
@@ -16,6 +43,15 @@ class NotificationQueue(AbstractBaseModel):
     error_message = Column(Text, nullable=True)
     retry_count = Column(Integer, default=0, nullable=False)
     max_retries = Column(Integer, default=3, nullable=False)
+    coalesced_into_id = Column(UUID(as_uuid=True), nullable=True, index=True)
 
-    notification = relationship("Notification", back_populates="queues")
+    notification = relationship(
+        "Notification",
+        primaryjoin="foreign(NotificationQueue.notification_id) == Notification.id",
+        back_populates="queues"
+    )
+    coalesced_items = relationship(
+        "NotificationQueue",
+        primaryjoin="NotificationQueue.id == foreign(NotificationQueue.coalesced_into_id)"
+    )
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, BigInteger, ForeignKey, DateTime
+from sqlalchemy import Column, String, Boolean, BigInteger, Integer, ForeignKey, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -7,6 +7,9 @@ from app.core.base import AbstractBaseModel
 
 class User(AbstractBaseModel):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
 
     email = Column(String(255), unique=True, nullable=False, index=True)
     username = Column(String(150), unique=True, nullable=False)
@@ -28,6 +31,8 @@ class User(AbstractBaseModel):
     telegram_chat_id = Column(BigInteger, nullable=True, index=True)
     telegram_linked_at = Column(DateTime(timezone=True), nullable=True)
     
+    notification_digest_minutes = Column(Integer, nullable=True)
+    
     is_auditor = Column(Boolean, default=False, nullable=False)
     is_expert = Column(Boolean, default=False, nullable=False)
     
@@ -134,6 +134,36 @@ class SimpleUser(BaseModel):
         from_attributes = True
 
 
+class SimpleEnterprise(BaseModel):
+    id: UUID
+    name: str
+    code: str
+
+    class Config:
+        from_attributes = True
+
+
+class SimpleStatus(BaseModel):
+    id: UUID
+    name: str
+    code: str
+    color: str
+    is_final: bool
+
+    class Config:
+        from_attributes = True
+
+
+class SimpleAuditPlanItem(BaseModel):
+    id: UUID
+    audit_plan_id: UUID
+    planned_date_from: date
+    planned_date_to: date
+
+    class Config:
+        from_attributes = True
+
+
 class AuditResponse(AuditBase):
     id: UUID
     created_by_id: UUID
@@ -141,20 +171,20 @@ class AuditResponse(AuditBase):
     updated_at: datetime
     deleted_at: Optional[datetime] = None
 
-    enterprise: Optional[dict] = None
-    audit_type: Optional[dict] = None
-    process: Optional[dict] = None
-    product: Optional[dict] = None
-    project: Optional[dict] = None
-    norm: Optional[dict] = None
-    status: Optional[dict] = None
-    auditor: Optional[dict] = None
-    responsible_user: Optional[dict] = None
-    audit_plan_item: Optional[dict] = None
-    rescheduled_by: Optional[dict] = None
-    approver: Optional[dict] = None
-    creator: Optional[dict] = None
-    risk_level: Optional[dict] = None
+    enterprise: Optional[SimpleEnterprise] = None
+    audit_type: Optional[SimpleDictionary] = None
+    process: Optional[SimpleDictionary] = None
+    product: Optional[SimpleDictionary] = None
+    project: Optional[SimpleDictionary] = None
+    norm: Optional[SimpleDictionary] = None
+    status: Optional[SimpleStatus] = None
+    auditor: Optional[SimpleUser] = None
+    responsible_user: Optional[SimpleUser] = None
+    audit_plan_item: Optional[SimpleAuditPlanItem] = None
+    rescheduled_by: Optional[SimpleUser] = None
+    approver: Optional[SimpleUser] = None
+    creator: Optional[SimpleUser] = None
+    risk_level: Optional[SimpleDictionary] = None
 
     locations: List[SimpleLocation] = []
     clients: List[SimpleDictionary] = []
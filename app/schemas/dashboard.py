@@ -1,4 +1,4 @@
-from datetime import date
+from datetime import date, datetime
 from typing import Optional, List
 from uuid import UUID
 from pydantic import BaseModel, Field
@@ -11,6 +11,7 @@ class DashboardStatsResponse(BaseModel):
     overdue_findings: int = Field(..., description="Количество просроченных несоответствий")
     total_users: int = Field(..., description="Общее количество пользователей")
     active_users: int = Field(..., description="Количество активных пользователей")
+    refreshed_at: Optional[datetime] = Field(None, description="Время обновления сверток (None - данные посчитаны на лету)")
 
 
 class MyTaskResponse(BaseModel):
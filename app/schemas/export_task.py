@@ -1,17 +1,22 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field
 from app.models.export_task import ExportTaskStatus
 
 
 class ExportTaskBase(BaseModel):
-    audit_id: UUID
+    audit_id: Optional[UUID] = None
+    report_type: Optional[str] = None
+    params: Optional[Dict[str, Any]] = None
     status: ExportTaskStatus = ExportTaskStatus.PENDING
 
 
 class ExportTaskCreate(ExportTaskBase):
-    pass
+    cache_key: Optional[str] = None
+    data_watermark: Optional[datetime] = None
+    file_path: Optional[str] = None
+    completed_at: Optional[datetime] = None
 
 
 class ExportTaskUpdate(BaseModel):
@@ -29,6 +34,7 @@ class ExportTaskResponse(ExportTaskBase):
     file_path: Optional[str] = None
     error_message: Optional[str] = None
     completed_at: Optional[datetime] = None
+    data_watermark: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
     deleted_at: Optional[datetime] = None
@@ -44,4 +50,4 @@ class ExportTaskStatusResponse(BaseModel):
     file_path: Optional[str] = None
     error_message: Optional[str] = None
     completed_at: Optional[datetime] = None
-
+    download_url: Optional[str] = None
@@ -1,7 +1,8 @@
 from datetime import date, datetime
-from typing import Optional
+from typing import Annotated, Optional, List, Dict, Any
 from uuid import UUID
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, WithJsonSchema, model_validator
+from app.schemas.audit import SimpleDictionary, SimpleEnterprise, SimpleStatus, SimpleUser
 
 
 class FindingBase(BaseModel):
@@ -75,6 +76,37 @@ class FindingCreate(FindingBase):
         return self
 
 
+FINDINGS_BULK_MAX_ITEMS = 5000
+
+# Строка пакета принимается как словарь и проверяется по FindingCreate в эндпоинте,
+# а в OpenAPI описывается схемой FindingBase.
+FindingBulkItem = Annotated[Dict[str, Any], WithJsonSchema(FindingBase.model_json_schema())]
+
+
+class FindingBulkCreate(BaseModel):
+    """
+    Пакетное создание несоответствий.
+
+    Элементы проверяются по схеме FindingCreate построчно, поэтому ошибка
+    в одной строке не отклоняет весь запрос. created_by_id берется из текущего пользователя.
+    """
+    items: List[FindingBulkItem] = Field(..., min_length=1, max_length=FINDINGS_BULK_MAX_ITEMS)
+
+
+class FindingBulkItemResult(BaseModel):
+    index: int
+    success: bool
+    id: Optional[UUID] = None
+    finding_number: Optional[int] = None
+    errors: List[str] = []
+
+
+class FindingBulkCreateResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[FindingBulkItemResult]
+
+
 class FindingUpdate(BaseModel):
     title: Optional[str] = Field(None, min_length=1)
     description: Optional[str] = Field(None, min_length=1)
@@ -99,6 +131,15 @@ class FindingUpdate(BaseModel):
     preventive_measures: Optional[str] = None
 
 
+class SimpleAudit(BaseModel):
+    id: UUID
+    audit_number: str
+    title: str
+
+    class Config:
+        from_attributes = True
+
+
 class FindingResponse(FindingBase):
     id: UUID
     finding_number: int
@@ -108,13 +149,13 @@ class FindingResponse(FindingBase):
     updated_at: datetime
     deleted_at: Optional[datetime] = None
 
-    audit: Optional[dict] = None
-    enterprise: Optional[dict] = None
-    process: Optional[dict] = None
-    status: Optional[dict] = None
-    resolver: Optional[dict] = None
-    approver: Optional[dict] = None
-    creator: Optional[dict] = None
+    audit: Optional[SimpleAudit] = None
+    enterprise: Optional[SimpleEnterprise] = None
+    process: Optional[SimpleDictionary] = None
+    status: Optional[SimpleStatus] = None
+    resolver: Optional[SimpleUser] = None
+    approver: Optional[SimpleUser] = None
+    creator: Optional[SimpleUser] = None
 
     class Config:
         from_attributes = True
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, List, Dict, Any
 from uuid import UUID
 from pydantic import BaseModel, Field
 
@@ -29,6 +29,18 @@ class NotificationUpdate(BaseModel):
     last_retry_at: Optional[datetime] = None
 
 
+NOTIFICATIONS_BULK_MAX_IDS = 1000
+
+
+class NotificationBulkRead(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1, max_length=NOTIFICATIONS_BULK_MAX_IDS)
+
+
+class NotificationEntityRead(BaseModel):
+    entity_type: str = Field(..., max_length=50)
+    entity_id: UUID
+
+
 class NotificationResponse(NotificationBase):
     id: UUID
     is_read: bool
@@ -54,13 +66,14 @@ class NotificationResponse(NotificationBase):
 class NotificationQueueBase(BaseModel):
     notification_id: UUID
     channel: str = Field(..., pattern="^(email|telegram)$")
-    status: str = Field(..., pattern="^(pending|processing|sent|failed)$")
+    status: str = Field(..., pattern="^(pending|processing|sent|failed|dead|skipped|coalesced)$")
     priority: int = Field(default=0)
     scheduled_at: datetime
     sent_at: Optional[datetime] = None
     error_message: Optional[str] = None
     retry_count: int = Field(default=0)
     max_retries: int = Field(default=3)
+    coalesced_into_id: Optional[UUID] = None
 
 
 class NotificationQueueCreate(NotificationQueueBase):
@@ -68,7 +81,7 @@ class NotificationQueueCreate(NotificationQueueBase):
 
 
 class NotificationQueueUpdate(BaseModel):
-    status: Optional[str] = Field(None, pattern="^(pending|processing|sent|failed)$")
+    status: Optional[str] = Field(None, pattern="^(pending|processing|sent|failed|dead|skipped|coalesced)$")
     sent_at: Optional[datetime] = None
     error_message: Optional[str] = None
     retry_count: Optional[int] = None
@@ -101,7 +114,9 @@ class NotificationQueueStatsResponse(BaseModel):
     pending: int
     processing: int
     failed: int
+    dead: int = 0
     lag_minutes: Optional[float] = None
     size: int
     speed_per_minute: Optional[float] = None
+    retry_histogram: Dict[int, int] = Field(default_factory=dict)
 
@@ -1,9 +1,12 @@
 from datetime import date
-from typing import Optional, List
+from typing import Literal, Optional, List
 from uuid import UUID
 from pydantic import BaseModel, Field
 
 
+ReportFormatName = Literal["xlsx", "csv", "jsonl", "parquet"]
+
+
 class ReportFilter(BaseModel):
     enterprise_id: Optional[UUID] = None
     date_from: Optional[date] = None
@@ -12,6 +15,11 @@ class ReportFilter(BaseModel):
     finding_type: Optional[str] = Field(None, pattern="^(CAR1|CAR2|OFI)$")
 
 
+class ReportExportCreate(ReportFilter):
+    report_type: Literal["findings", "by_processes", "by_solvers"]
+    format: ReportFormatName = "xlsx"
+
+
 class FindingReportRow(BaseModel):
     finding_number: int
     audit_number: str
@@ -14,6 +14,7 @@ class UserBase(BaseModel):
     last_name_en: str = Field(..., max_length=150)
     location_id: Optional[UUID] = None
     language: str = Field(default="ru", max_length=5)
+    notification_digest_minutes: Optional[int] = Field(None, ge=0, le=1440)
     is_auditor: bool = False
     is_expert: bool = False
     is_active: bool = True
@@ -35,6 +36,7 @@ class UserUpdate(BaseModel):
     last_name_en: Optional[str] = Field(None, max_length=150)
     location_id: Optional[UUID] = None
     language: Optional[str] = Field(None, max_length=5)
+    notification_digest_minutes: Optional[int] = Field(None, ge=0, le=1440)
     is_auditor: Optional[bool] = None
     is_expert: Optional[bool] = None
     is_active: Optional[bool] = None
@@ -73,6 +75,7 @@ class UserMeResponse(BaseModel):
     last_name_en: str
     location_id: Optional[UUID]
     language: str
+    notification_digest_minutes: Optional[int] = None
     is_auditor: bool
     is_expert: bool
     is_active: bool
@@ -1,7 +1,133 @@
-from typing import Optional, Any, Dict
-from uuid import UUID
+import logging
+from typing import Optional, Any, Dict, List
+from uuid import UUID, uuid4
+from datetime import datetime, timezone
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.crud.change_history import log_change
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.crud.change_history import create_change_history_bulk
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXCLUDE_FIELDS = ['id', 'created_at', 'updated_at', 'deleted_at']
+PENDING_CHANGE_HISTORY_KEY = "pending_change_history"
+
+
+def _send_change_history(session: Session) -> None:
+    rows = session.info.pop(PENDING_CHANGE_HISTORY_KEY, None)
+    if not rows:
+        return
+    
+    from app.services.tasks import write_change_history_batch
+    try:
+        write_change_history_batch.delay(rows)
+    except Exception as e:
+        logger.error("Failed to queue %s change history rows: %s", len(rows), e)
+
+
+def _discard_change_history(session: Session) -> None:
+    session.info.pop(PENDING_CHANGE_HISTORY_KEY, None)
+
+
+class ChangeHistoryBatch:
+    """
+    Сборщик записей истории изменений.
+
+    Сравнивает старое и новое состояние сущностей и копит строки истории,
+    которые flush() записывает одним INSERT в транзакции вызывающего кода.
+    В отложенном режиме строки копятся в сессии и передаются задаче Celery
+    после commit транзакции вызывающего кода; при откате они отбрасываются.
+    Отложенный режим (CHANGE_HISTORY_DEFERRED) не атомарен: если задача не
+    запишет пакет, изменение останется без истории. По умолчанию история
+    пишется в транзакции изменения.
+    """
+
+    def __init__(self, db: AsyncSession, user_id: UUID, deferred: Optional[bool] = None):
+        self.db = db
+        self.user_id = user_id
+        self.deferred = settings.CHANGE_HISTORY_DEFERRED if deferred is None else deferred
+        self.changed_at = datetime.now(timezone.utc)
+        self.rows: List[Dict[str, Any]] = []
+
+    def add_changes(
+        self,
+        entity_type: str,
+        entity_id: UUID,
+        old_data: Dict[str, Any],
+        new_data: Dict[str, Any],
+        exclude_fields: Optional[list] = None
+    ) -> int:
+        """
+        Добавить изменения сущности в пакет.
+
+        Args:
+            entity_type: Тип сущности (например, 'audit', 'finding')
+            entity_id: ID сущности
+            old_data: Словарь старых значений полей
+            new_data: Словарь новых значений полей
+            exclude_fields: Список полей, которые не нужно логировать
+
+        Returns:
+            Количество добавленных изменений
+        """
+        if exclude_fields is None:
+            exclude_fields = DEFAULT_EXCLUDE_FIELDS
+
+        added = 0
+        for field in sorted(set(old_data.keys()) | set(new_data.keys())):
+            if field in exclude_fields:
+                continue
+
+            old_value = old_data.get(field)
+            new_value = new_data.get(field)
+            if old_value == new_value:
+                continue
+
+            self.rows.append({
+                "id": uuid4(),
+                "entity_type": entity_type,
+                "entity_id": entity_id,
+                "user_id": self.user_id,
+                "field_name": field,
+                "old_value": str(old_value) if old_value is not None else None,
+                "new_value": str(new_value) if new_value is not None else None,
+                "changed_at": self.changed_at
+            })
+            added += 1
+
+        return added
+
+    async def flush(self) -> int:
+        """
+        Записать накопленные изменения и очистить пакет.
+
+        Returns:
+            Количество записанных (или отложенных до commit) изменений
+        """
+        rows, self.rows = self.rows, []
+        if not rows:
+            return 0
+
+        if self.deferred:
+            sync_session = self.db.sync_session
+            sync_session.info.setdefault(PENDING_CHANGE_HISTORY_KEY, []).extend(
+                {
+                    **row,
+                    "id": str(row["id"]),
+                    "entity_id": str(row["entity_id"]),
+                    "user_id": str(row["user_id"]),
+                    "changed_at": row["changed_at"].isoformat()
+                }
+                for row in rows
+            )
+            if not event.contains(sync_session, "after_commit", _send_change_history):
+                event.listen(sync_session, "after_commit", _send_change_history)
+                event.listen(sync_session, "after_rollback", _discard_change_history)
+            return len(rows)
+
+        return await create_change_history_bulk(self.db, rows)
 
 
 async def log_entity_changes(
@@ -15,7 +141,11 @@ async def log_entity_changes(
 ) -> None:
     """
     Централизованное логирование изменений сущности.
-    
+
+    Все изменённые поля записываются одним INSERT без commit (в отложенном
+    режиме - задачей Celery после commit): записи фиксируются вместе
+    с транзакцией вызывающего кода.
+
     Args:
         db: Сессия базы данных
         entity_type: Тип сущности (например, 'audit', 'finding')
@@ -25,31 +155,6 @@ async def log_entity_changes(
         new_data: Словарь новых значений полей
         exclude_fields: Список полей, которые не нужно логировать
     """
-    if exclude_fields is None:
-        exclude_fields = ['id', 'created_at', 'updated_at', 'deleted_at']
-    
-    all_fields = set(old_data.keys()) | set(new_data.keys())
-    
-    for field in all_fields:
-        if field in exclude_fields:
-            continue
-        
-        old_value = old_data.get(field)
-        new_value = new_data.get(field)
-        
-        # Сравниваем значения
-        if old_value != new_value:
-            # Преобразуем значения в строки для хранения
-            old_str = str(old_value) if old_value is not None else None
-            new_str = str(new_value) if new_value is not None else None
-            
-            await log_change(
-                db=db,
-                entity_type=entity_type,
-                entity_id=entity_id,
-                user_id=user_id,
-                field_name=field,
-                old_value=old_str,
-                new_value=new_str
-            )
-
+    batch = ChangeHistoryBatch(db, user_id)
+    batch.add_changes(entity_type, entity_id, old_data, new_data, exclude_fields)
+    await batch.flush()
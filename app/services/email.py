@@ -1,7 +1,6 @@
 from typing import Optional
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
 from app.models.email_account import EmailAccount
-from app.crud.email_account import get_email_credentials
+from app.services.smtp_pool import build_message, get_smtp_pool
 
 
 async def send_email(
@@ -13,37 +12,16 @@ async def send_email(
     """
     Отправка email через указанный аккаунт.
     
+    Письмо отправляется через пул постоянных соединений аккаунта.
+    
     Args:
         account: Email аккаунт для отправки
         recipients: Список получателей
         subject: Тема письма
         body: Текст письма
     """
-    credentials = get_email_credentials(account)
-    
-    config = ConnectionConfig(
-        MAIL_USERNAME=account.smtp_user,
-        MAIL_PASSWORD=credentials['smtp_password'],
-        MAIL_FROM=account.from_email,
-        MAIL_PORT=account.smtp_port,
-        MAIL_SERVER=account.smtp_host,
-        MAIL_FROM_NAME=account.from_name,
-        MAIL_STARTTLS=account.use_tls,
-        MAIL_SSL_TLS=False,
-        USE_CREDENTIALS=True,
-        VALIDATE_CERTS=True
-    )
-    
-    fast_mail = FastMail(config)
-    
-    message = MessageSchema(
-        subject=subject,
-        recipients=recipients,
-        body=body,
-        subtype="plain"
-    )
-    
-    await fast_mail.send_message(message)
+    pool = await get_smtp_pool(account)
+    await pool.send_messages([build_message(account, recipients, subject, body)])
 
 
 async def send_registration_invite(
@@ -0,0 +1,69 @@
+"""
+Объединение уведомлений в сводки.
+
+Уведомления пользователя по одному каналу, накопившиеся за окно сводки,
+отправляются одним сообщением. Окно задается пользователем
+(User.notification_digest_minutes, 0 - без сводок) или настройкой
+NOTIFICATION_DIGEST_WINDOW_MINUTES, которая по умолчанию равна 0: без явной
+настройки уведомления отправляются сразу. Уведомление с notification_config
+{"digest": false} отправляется сразу и в сводки не попадает.
+"""
+from datetime import timedelta
+from typing import List, Optional
+from app.core.config import settings
+from app.models.notification import Notification
+from app.models.user import User
+
+
+DIGEST_MESSAGE_PREVIEW_LENGTH = 300
+
+
+def digest_window(user: User, notification: Notification) -> Optional[timedelta]:
+    """
+    Окно сводки для уведомления или None, если оно отправляется сразу.
+
+    Args:
+        user: Получатель
+        notification: Уведомление
+
+    Returns:
+        Длительность окна или None
+    """
+    config = notification.notification_config or {}
+    if config.get("digest") is False:
+        return None
+
+    minutes = user.notification_digest_minutes
+    if minutes is None:
+        minutes = settings.NOTIFICATION_DIGEST_WINDOW_MINUTES
+    return timedelta(minutes=minutes) if minutes else None
+
+
+def render_digest(notifications: List[Notification]) -> Notification:
+    """
+    Собрать сводку из нескольких уведомлений.
+
+    Возвращает несохраняемое уведомление, которое передается функции отправки
+    канала вместо исходных.
+
+    Args:
+        notifications: Уведомления в порядке создания
+
+    Returns:
+        Уведомление-сводка
+    """
+    lines = []
+    for index, notification in enumerate(notifications, start=1):
+        message = notification.message
+        if len(message) > DIGEST_MESSAGE_PREVIEW_LENGTH:
+            message = message[:DIGEST_MESSAGE_PREVIEW_LENGTH].rstrip() + "…"
+        lines.append(f"{index}. {notification.title}\n{message}")
+
+    return Notification(
+        user_id=notifications[0].user_id,
+        event_type="digest",
+        entity_type=notifications[0].entity_type,
+        entity_id=notifications[0].entity_id,
+        title=f"Сводка уведомлений: {len(notifications)}",
+        message="\n\n".join(lines)
+    )
@@ -0,0 +1,207 @@
+"""
+Воркеры очереди уведомлений (outbox).
+
+Каждый воркер в своей сессии захватывает пакет элементов одного канала
+через FOR UPDATE SKIP LOCKED и доставляет их последовательно, объединяя
+уведомления пользователя в сводки (см. notification_digest). Параллельность
+задается числом воркеров: захваты не пересекаются, поэтому воркеры не мешают
+друг другу, а отдельная обработка каналов не дает одному каналу вытеснить другой.
+
+На время отправки воркер не держит транзакцию: соединение возвращается в пул
+перед обращением к внешнему сервису, а результат записывается отдельной
+короткой транзакцией. Поэтому число воркеров может превышать размер пула БД.
+"""
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.crud import notification as crud_notification
+from app.models.notification import Notification
+from app.models.notification_queue import NotificationQueue
+from app.models.user import User
+from app.services.notification_digest import digest_window, render_digest
+from app.services.notification_service import send_notification_email, send_notification_telegram
+
+
+Sender = Callable[[AsyncSession, Notification, User], Awaitable[bool]]
+
+CHANNEL_SENDERS: Dict[str, Sender] = {
+    "email": send_notification_email,
+    "telegram": send_notification_telegram,
+}
+
+CHANNEL_CONCURRENCY = {
+    "telegram": settings.NOTIFICATION_TELEGRAM_CONCURRENCY,
+}
+
+CHANNEL_ERROR_FIELDS = {
+    "email": "email_error",
+    "telegram": "telegram_error",
+}
+
+
+CHANNEL_RESULT_FIELDS = {
+    "email": ("sent_email", "email_sent_at", "email_error"),
+    "telegram": ("sent_telegram", "telegram_sent_at", "telegram_error"),
+}
+
+
+def retry_delay(retry_count: int) -> timedelta:
+    """
+    Задержка перед следующей попыткой: экспоненциальная от числа неудач,
+    не больше NOTIFICATION_RETRY_MAX_SECONDS, со случайным разбросом в половину
+    задержки, чтобы элементы, упавшие одновременно, не повторялись разом.
+    """
+    delay = min(
+        settings.NOTIFICATION_RETRY_MAX_SECONDS,
+        settings.NOTIFICATION_RETRY_BASE_SECONDS * 2 ** max(retry_count - 1, 0)
+    )
+    return timedelta(seconds=random.uniform(delay / 2, delay))
+
+
+async def deliver_queue_item(db: AsyncSession, queue_item: NotificationQueue, sender: Sender) -> str:
+    """
+    Доставить захваченный элемент очереди и записать результат.
+
+    Перед вызовом sender транзакция сессии завершается, чтобы соединение
+    не удерживалось на время отправки; результат фиксируется отдельным commit.
+
+    Если для получателя действует окно сводки, элемент откладывается до конца
+    окна, а при наступлении окна к нему присоединяются остальные ожидающие
+    уведомления пользователя по этому каналу и отправляется одна сводка.
+
+    Args:
+        db: Сессия, в которой элемент был захвачен
+        queue_item: Элемент очереди в статусе processing
+        sender: Функция отправки канала
+
+    Неудачная отправка планирует следующую попытку через retry_delay в
+    scheduled_at, а после max_retries неудач элемент переводится в dead.
+    
+    Returns:
+        Итоговый статус элемента: sent, failed, dead, skipped или pending (отложен до окна сводки)
+    """
+    notification = queue_item.notification
+    if not notification or not notification.user:
+        queue_item.status = "dead"
+        queue_item.error_message = "Notification not found" if not notification else "User not found"
+        await db.commit()
+        return queue_item.status
+
+    user = notification.user
+    if queue_item.channel == "telegram" and not user.telegram_chat_id:
+        queue_item.status = "skipped"
+        queue_item.error_message = "Telegram не привязан"
+        await db.commit()
+        return queue_item.status
+
+    window = digest_window(user, notification)
+    coalesced = []
+    if window:
+        due_at = queue_item.created_at + window
+        if due_at > datetime.now(timezone.utc):
+            await crud_notification.hold_notification_queue_item(db=db, queue_item=queue_item, until=due_at)
+            return queue_item.status
+        coalesced = await crud_notification.coalesce_notification_queue(
+            db=db,
+            lead=queue_item,
+            user_id=user.id,
+            limit=settings.NOTIFICATION_DIGEST_MAX_ITEMS
+        )
+
+    notifications = [notification] + [item.notification for item in coalesced]
+    message = render_digest(notifications) if coalesced else notification
+    await db.commit()
+    success = await sender(db, message, user)
+
+    if coalesced:
+        fields = CHANNEL_RESULT_FIELDS[queue_item.channel] if success else (CHANNEL_ERROR_FIELDS[queue_item.channel],)
+        for included in notifications:
+            for field in fields:
+                setattr(included, field, getattr(message, field))
+
+    if success:
+        queue_item.status = "sent"
+        queue_item.sent_at = datetime.now(timezone.utc)
+        queue_item.error_message = None
+        if coalesced:
+            await crud_notification.mark_coalesced_sent(db=db, lead=queue_item)
+    else:
+        queue_item.error_message = getattr(message, CHANNEL_ERROR_FIELDS[queue_item.channel], None)
+        queue_item.retry_count += 1
+        if queue_item.retry_count >= queue_item.max_retries:
+            queue_item.status = "dead"
+            if coalesced:
+                await crud_notification.mark_coalesced_dead(db=db, lead=queue_item)
+        else:
+            queue_item.status = "failed"
+            queue_item.scheduled_at = datetime.now(timezone.utc) + retry_delay(queue_item.retry_count)
+
+    await db.commit()
+    return queue_item.status
+
+
+async def _worker(channel: str, sender: Sender, batch_size: int, max_batches: Optional[int]) -> Dict[str, int]:
+    counts = {"sent": 0, "failed": 0, "dead": 0, "skipped": 0, "pending": 0}
+    batches = 0
+
+    async with async_session_maker() as db:
+        while max_batches is None or batches < max_batches:
+            queue_items = await crud_notification.claim_notification_batch(db=db, channel=channel, limit=batch_size)
+            if not queue_items:
+                break
+            batches += 1
+
+            for queue_item in queue_items:
+                counts[await deliver_queue_item(db, queue_item, sender)] += 1
+
+    return counts
+
+
+async def process_outbox(
+    channel: str,
+    concurrency: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+    sender: Optional[Sender] = None
+) -> Dict[str, int]:
+    """
+    Обработать очередь канала пулом воркеров до ее опустошения.
+
+    Args:
+        channel: Канал доставки ('email', 'telegram')
+        concurrency: Число параллельных воркеров (по умолчанию из настроек)
+        batch_size: Размер захватываемого пакета (по умолчанию из настроек)
+        max_batches: Ограничение числа пакетов на воркера (None - без ограничения)
+        sender: Функция отправки (по умолчанию отправка канала)
+
+    Returns:
+        dict: Количество отправленных, неудачных, исчерпавших попытки, пропущенных
+        и отложенных до сводки элементов
+    """
+    concurrency = concurrency or CHANNEL_CONCURRENCY.get(channel, settings.NOTIFICATION_OUTBOX_CONCURRENCY)
+    batch_size = batch_size or settings.NOTIFICATION_OUTBOX_BATCH_SIZE
+    sender = sender or CHANNEL_SENDERS[channel]
+
+    async with async_session_maker() as db:
+        released = await crud_notification.release_stale_notification_claims(
+            db=db,
+            timeout_seconds=settings.NOTIFICATION_CLAIM_TIMEOUT_SECONDS
+        )
+
+    results = await asyncio.gather(*(
+        _worker(channel, sender, batch_size, max_batches)
+        for _ in range(concurrency)
+    ))
+
+    return {
+        "sent": sum(result["sent"] for result in results),
+        "failed": sum(result["failed"] for result in results),
+        "dead": sum(result["dead"] for result in results),
+        "skipped": sum(result["skipped"] for result in results),
+        "held": sum(result["pending"] for result in results),
+        "released": released
+    }
@@ -1,16 +1,63 @@
-from typing import Optional, Dict, Any
+import logging
+from typing import Optional, Dict, Any, List, Iterable
 from uuid import UUID
-from datetime import datetime, timedelta
-from sqlalchemy import select
+from datetime import datetime
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.models.notification import Notification
-from app.models.notification_queue import NotificationQueue
 from app.models.user import User
 from app.crud import notification as crud_notification
 from app.schemas.notification import NotificationCreate
 from app.services.email import send_email
-from app.services.telegram_bot import telegram_bot_service
-from app.crud.email_account import get_email_account
+from app.services.telegram_dispatcher import telegram_dispatcher
+from app.crud.email_account import get_default_email_account
+
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_CHANNELS = ("email", "telegram")
+PENDING_DELIVERY_KEY = "pending_notification_channels"
+
+
+def _start_delivery(session: Session) -> None:
+    channels = session.info.pop(PENDING_DELIVERY_KEY, None)
+    if not channels:
+        return
+    
+    from app.services.tasks import deliver_notifications
+    for channel in sorted(channels):
+        try:
+            deliver_notifications.delay(channel)
+        except Exception as e:
+            logger.warning("Failed to start %s notification delivery, left for beat: %s", channel, e)
+
+
+def _discard_delivery(session: Session) -> None:
+    session.info.pop(PENDING_DELIVERY_KEY, None)
+
+
+def schedule_delivery(db: AsyncSession, channels: Iterable[str]) -> None:
+    """
+    Запустить доставку каналов задачей Celery после commit текущей транзакции.
+    
+    При откате транзакции запуск отменяется. Если брокер недоступен или
+    NOTIFICATION_IMMEDIATE_DELIVERY выключен, элементы очереди остаются pending
+    и отправляются периодическими задачами.
+    
+    Args:
+        db: Сессия, в которой поставлены уведомления
+        channels: Каналы доставки
+    """
+    if not settings.NOTIFICATION_IMMEDIATE_DELIVERY:
+        return
+    
+    sync_session = db.sync_session
+    sync_session.info.setdefault(PENDING_DELIVERY_KEY, set()).update(channels)
+    if not event.contains(sync_session, "after_commit", _start_delivery):
+        event.listen(sync_session, "after_commit", _start_delivery)
+        event.listen(sync_session, "after_rollback", _discard_delivery)
 
 
 async def create_notification(
@@ -54,6 +101,68 @@ async def create_notification(
     return notification
 
 
+async def enqueue_notification(
+    db: AsyncSession,
+    user_id: UUID,
+    event_type: str,
+    entity_type: str,
+    entity_id: UUID,
+    title: str,
+    message: str,
+    priority: int = 0,
+    notification_config: Optional[Dict[str, Any]] = None
+) -> Notification:
+    """
+    Поставить уведомление в очередь отправки.
+    
+    Уведомление и элементы очереди по всем каналам добавляются в сессию без
+    обращений к БД и внешним сервисам: они фиксируются commit вызывающего кода,
+    после чего доставку выполняет задача Celery. Каналы, недоступные
+    пользователю, пропускаются при доставке.
+    
+    notification_config может ограничить каналы ({"channels": ["email"]})
+    и отключить объединение в сводку ({"digest": false}).
+    
+    Args:
+        db: Сессия базы данных
+        user_id: ID пользователя-получателя
+        event_type: Тип события
+        entity_type: Тип сущности
+        entity_id: ID сущности
+        title: Заголовок уведомления
+        message: Текст уведомления
+        priority: Приоритет в очереди
+        notification_config: Конфигурация уведомления
+    
+    Returns:
+        Уведомление, добавленное в сессию
+    """
+    notification_create = NotificationCreate(
+        user_id=user_id,
+        event_type=event_type,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        title=title,
+        message=message,
+        notification_config=notification_config
+    )
+    
+    channels = [
+        channel for channel in (notification_config or {}).get("channels", NOTIFICATION_CHANNELS)
+        if channel in NOTIFICATION_CHANNELS
+    ]
+    
+    notification = await crud_notification.enqueue_notification(
+        db=db,
+        notification=notification_create,
+        channels=channels,
+        priority=priority
+    )
+    if channels:
+        schedule_delivery(db, channels)
+    return notification
+
+
 async def send_notification_email(
     db: AsyncSession,
     notification: Notification,
@@ -62,6 +171,10 @@ async def send_notification_email(
     """
     Отправить уведомление по email.
     
+    Результат записывается в поля уведомления, commit выполняет вызывающий код.
+    Транзакция, открытая чтением аккаунта, завершается до подключения к SMTP,
+    чтобы соединение БД не удерживалось на время отправки.
+    
     Args:
         db: Сессия базы данных
         notification: Уведомление
@@ -71,10 +184,10 @@ async def send_notification_email(
         True если отправлено успешно, False в противном случае
     """
     try:
-        account = await get_email_account(db=db)
+        account = await get_default_email_account(db)
+        await db.commit()
         if not account:
             notification.email_error = "Email аккаунт не настроен"
-            await db.commit()
             return False
         
         await send_email(
@@ -87,12 +200,10 @@ async def send_notification_email(
         notification.sent_email = True
         notification.email_sent_at = datetime.now()
         notification.email_error = None
-        await db.commit()
         
         return True
     except Exception as e:
         notification.email_error = str(e)
-        await db.commit()
         return False
 
 
@@ -104,6 +215,8 @@ async def send_notification_telegram(
     """
     Отправить уведомление в Telegram.
     
+    Результат записывается в поля уведомления, commit выполняет вызывающий код.
+    
     Args:
         db: Сессия базы данных
         notification: Уведомление
@@ -114,13 +227,12 @@ async def send_notification_telegram(
     """
     if not user.telegram_chat_id:
         notification.telegram_error = "Telegram не привязан"
-        await db.commit()
         return False
     
     try:
-        success = await telegram_bot_service.send_message(
+        success = await telegram_dispatcher.send(
             chat_id=user.telegram_chat_id,
-            message=f"{notification.title}\n\n{notification.message}"
+            text=f"{notification.title}\n\n{notification.message}"
         )
         
         if success:
@@ -130,11 +242,9 @@ async def send_notification_telegram(
         else:
             notification.telegram_error = "Не удалось отправить сообщение"
         
-        await db.commit()
         return success
     except Exception as e:
         notification.telegram_error = str(e)
-        await db.commit()
         return False
 
 
@@ -146,7 +256,7 @@ async def notify_finding_created(
     description: str
 ) -> None:
     """
-    Отправить уведомление при создании finding.
+    Поставить в очередь уведомление при создании finding.
     
     Args:
         db: Сессия базы данных
@@ -155,7 +265,7 @@ async def notify_finding_created(
         title: Заголовок finding
         description: Описание finding
     """
-    notification = await create_notification(
+    await enqueue_notification(
         db=db,
         user_id=resolver_id,
         event_type="finding_created",
@@ -164,14 +274,52 @@ async def notify_finding_created(
         title=f"Новое несоответствие: {title}",
         message=f"Вам назначено новое несоответствие:\n\n{description}"
     )
+
+
+async def notify_findings_created_bulk(
+    db: AsyncSession,
+    findings: List[Dict[str, Any]],
+    users: Dict[UUID, User]
+) -> int:
+    """
+    Поставить в очередь уведомления о создании пакета findings.
     
-    stmt = select(User).where(User.id == resolver_id)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+    В отличие от notify_finding_created не отправляет сообщения сразу:
+    уведомления и элементы очереди вставляются пакетно в текущей транзакции,
+    отправку выполняют батчевые задачи Celery.
+    
+    Args:
+        db: Сессия базы данных
+        findings: Словари с полями id, resolver_id, title, description
+        users: Исполнители по ID (уже загруженные вызывающим кодом)
+    
+    Returns:
+        Количество созданных уведомлений
+    """
+    notifications = []
+    for finding in findings:
+        user = users.get(finding["resolver_id"])
+        if not user:
+            continue
+        
+        channels = ["email"]
+        if user.telegram_chat_id:
+            channels.append("telegram")
+        
+        notifications.append({
+            "user_id": user.id,
+            "event_type": "finding_created",
+            "entity_type": "finding",
+            "entity_id": finding["id"],
+            "title": f"Новое несоответствие: {finding['title']}",
+            "message": f"Вам назначено новое несоответствие:\n\n{finding['description']}",
+            "channels": channels
+        })
     
-    if user:
-        await send_notification_email(db=db, notification=notification, user=user)
-        await send_notification_telegram(db=db, notification=notification, user=user)
+    created = await crud_notification.create_notifications_bulk(db=db, notifications=notifications)
+    if created:
+        schedule_delivery(db, {channel for item in notifications for channel in item["channels"]})
+    return created
 
 
 async def notify_status_changed(
@@ -183,7 +331,7 @@ async def notify_status_changed(
     new_status: str
 ) -> None:
     """
-    Отправить уведомление при изменении статуса.
+    Поставить в очередь уведомление при изменении статуса.
     
     Args:
         db: Сессия базы данных
@@ -193,7 +341,7 @@ async def notify_status_changed(
         old_status: Старый статус
         new_status: Новый статус
     """
-    notification = await create_notification(
+    await enqueue_notification(
         db=db,
         user_id=user_id,
         event_type="status_changed",
@@ -202,14 +350,6 @@ async def notify_status_changed(
         title=f"Изменен статус {entity_type}",
         message=f"Статус изменен с '{old_status}' на '{new_status}'"
     )
-    
-    stmt = select(User).where(User.id == user_id)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
-    
-    if user:
-        await send_notification_email(db=db, notification=notification, user=user)
-        await send_notification_telegram(db=db, notification=notification, user=user)
 
 
 async def notify_deadline_approaching(
@@ -220,7 +360,7 @@ async def notify_deadline_approaching(
     title: str
 ) -> None:
     """
-    Отправить уведомление при приближении deadline.
+    Поставить в очередь уведомление при приближении deadline.
     
     Args:
         db: Сессия базы данных
@@ -229,7 +369,7 @@ async def notify_deadline_approaching(
         deadline: Дедлайн
         title: Заголовок finding
     """
-    notification = await create_notification(
+    await enqueue_notification(
         db=db,
         user_id=resolver_id,
         event_type="deadline_approaching",
@@ -238,14 +378,6 @@ async def notify_deadline_approaching(
         title=f"Приближается дедлайн: {title}",
         message=f"Дедлайн для несоответствия '{title}' наступает {deadline.strftime('%d.%m.%Y')}"
     )
-    
-    stmt = select(User).where(User.id == resolver_id)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
-    
-    if user:
-        await send_notification_email(db=db, notification=notification, user=user)
-        await send_notification_telegram(db=db, notification=notification, user=user)
 
 
 async def notify_deadline_overdue(
@@ -256,7 +388,7 @@ async def notify_deadline_overdue(
     title: str
 ) -> None:
     """
-    Отправить уведомление при просрочке deadline.
+    Поставить в очередь уведомление при просрочке deadline.
     
     Args:
         db: Сессия базы данных
@@ -265,7 +397,7 @@ async def notify_deadline_overdue(
         deadline: Дедлайн
         title: Заголовок finding
     """
-    notification = await create_notification(
+    await enqueue_notification(
         db=db,
         user_id=resolver_id,
         event_type="deadline_overdue",
@@ -274,14 +406,6 @@ async def notify_deadline_overdue(
         title=f"Просрочен дедлайн: {title}",
         message=f"Дедлайн для несоответствия '{title}' был {deadline.strftime('%d.%m.%Y')}"
     )
-    
-    stmt = select(User).where(User.id == resolver_id)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
-    
-    if user:
-        await send_notification_email(db=db, notification=notification, user=user)
-        await send_notification_telegram(db=db, notification=notification, user=user)
 
 
 async def notify_delegation(
@@ -293,7 +417,7 @@ async def notify_delegation(
     reason: str
 ) -> None:
     """
-    Отправить уведомление при делегировании.
+    Поставить в очередь уведомление при делегировании.
     
     Args:
         db: Сессия базы данных
@@ -303,7 +427,7 @@ async def notify_delegation(
         title: Заголовок finding
         reason: Причина делегирования
     """
-    notification = await create_notification(
+    await enqueue_notification(
         db=db,
         user_id=to_user_id,
         event_type="delegation",
@@ -312,14 +436,6 @@ async def notify_delegation(
         title=f"Делегировано несоответствие: {title}",
         message=f"Вам делегировано несоответствие '{title}'\n\nПричина: {reason}"
     )
-    
-    stmt = select(User).where(User.id == to_user_id)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
-    
-    if user:
-        await send_notification_email(db=db, notification=notification, user=user)
-        await send_notification_telegram(db=db, notification=notification, user=user)
 
 
 async def notify_comment_added(
@@ -331,7 +447,7 @@ async def notify_comment_added(
     comment_text: str
 ) -> None:
     """
-    Отправить уведомление при добавлении комментария.
+    Поставить в очередь уведомление при добавлении комментария.
     
     Args:
         db: Сессия базы данных
@@ -341,13 +457,11 @@ async def notify_comment_added(
         title: Заголовок finding
         comment_text: Текст комментария
     """
-    stmt_commenter = select(User).where(User.id == commenter_id)
-    result_commenter = await db.execute(stmt_commenter)
-    commenter = result_commenter.scalar_one_or_none()
+    commenter = await db.get(User, commenter_id)
     
     commenter_name = commenter.username if commenter else "Пользователь"
     
-    notification = await create_notification(
+    await enqueue_notification(
         db=db,
         user_id=recipient_id,
         event_type="comment_added",
@@ -356,12 +470,3 @@ async def notify_comment_added(
         title=f"Добавлен комментарий к: {title}",
         message=f"{commenter_name} добавил комментарий к несоответствию '{title}':\n\n{comment_text}"
     )
-    
-    stmt = select(User).where(User.id == recipient_id)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
-    
-    if user:
-        await send_notification_email(db=db, notification=notification, user=user)
-        await send_notification_telegram(db=db, notification=notification, user=user)
-
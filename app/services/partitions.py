@@ -0,0 +1,215 @@
+"""
+Помесячное партиционирование журналов: notifications, notification_queue, change_history.
+
+Таблицы объявлены в моделях как PARTITION BY RANGE по времени создания.
+Партиции называются <таблица>_pYYYYMM и покрывают календарный месяц по UTC.
+Обслуживание (задача maintain_partitions) заранее создает партиции на
+PARTITION_PREMAKE_MONTHS месяцев вперед. Партиции старше срока хранения таблицы
+отсоединяются (DETACH), выгружаются в S3 хранилище по умолчанию как JSONL,
+сжатый gzip, и удаляются. Запросы с сортировкой или фильтром по ключу
+партиционирования читают только последние партиции.
+"""
+import asyncio
+import gzip
+import logging
+import re
+import tempfile
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple, Union
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.crud.s3_storage import get_default_s3_storage
+from app.models.s3_storage import S3Storage
+from app.services.s3 import upload_fileobj_to_s3
+
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES: Dict[str, str] = {
+    "notifications": "NOTIFICATION_RETENTION_MONTHS",
+    "notification_queue": "NOTIFICATION_QUEUE_RETENTION_MONTHS",
+    "change_history": "CHANGE_HISTORY_RETENTION_MONTHS",
+}
+
+ARCHIVE_SPOOL_BYTES = 64 * 1024 * 1024
+ARCHIVE_FETCH_SIZE = 5000
+
+Executor = Union[AsyncSession, AsyncConnection]
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def retention_months(table: str) -> int:
+    return getattr(settings, PARTITIONED_TABLES[table])
+
+
+async def is_partitioned(db: Executor, table: str) -> bool:
+    result = await db.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": table}
+    )
+    return result.scalar_one_or_none() == "p"
+
+
+async def create_month_partitions(db: Executor, table: str, first_month: date, last_month: date) -> List[str]:
+    """
+    Создать недостающие партиции таблицы с first_month по last_month включительно (без commit).
+
+    Returns:
+        Имена партиций, которых не было
+    """
+    created = []
+    month = month_start(first_month)
+    while month <= last_month:
+        name = partition_name(table, month)
+        exists = await db.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name})
+        if not exists.scalar_one():
+            next_month = add_months(month, 1)
+            await db.execute(text(
+                f'CREATE TABLE "{name}" PARTITION OF "{table}" '
+                f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{next_month.isoformat()} 00:00:00+00')"
+            ))
+            created.append(name)
+        month = add_months(month, 1)
+    return created
+
+
+async def list_partitions(db: Executor, table: str) -> List[Tuple[str, date, bool]]:
+    """
+    Партиции таблицы, включая отсоединенные, но еще не удаленные.
+
+    Returns:
+        Список (имя, месяц, присоединена ли) по возрастанию месяца
+    """
+    result = await db.execute(
+        text(
+            "SELECT c.relname, i.inhparent IS NOT NULL "
+            "FROM pg_class c "
+            "LEFT JOIN pg_inherits i ON i.inhrelid = c.oid "
+            "WHERE c.relkind = 'r' AND c.relnamespace = current_schema()::regnamespace "
+            "AND c.relname ~ :pattern"
+        ),
+        {"pattern": f"^{table}_p[0-9]{{6}}$"}
+    )
+    partitions = []
+    for name, attached in result.all():
+        match = re.search(r"_p(\d{4})(\d{2})$", name)
+        partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1), attached))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+async def archive_partition(db: AsyncSession, table: str, name: str, storage: S3Storage) -> Optional[str]:
+    """
+    Выгрузить отсоединенную партицию в S3 как JSONL.gz и удалить ее.
+
+    Строки читаются серверным курсором и пишутся во временный файл,
+    поэтому память не зависит от размера партиции. Если загрузка не удалась,
+    партиция остается (отсоединенной) и будет выгружена при следующем запуске.
+
+    Returns:
+        Ключ объекта в S3 или None, если загрузка не удалась
+    """
+    key = f"{settings.PARTITION_ARCHIVE_PREFIX}{table}/{name}.jsonl.gz"
+
+    with tempfile.SpooledTemporaryFile(max_size=ARCHIVE_SPOOL_BYTES) as spool:
+        rows = 0
+        with gzip.GzipFile(fileobj=spool, mode="wb") as archive:
+            result = await db.stream(
+                text(f'SELECT row_to_json(t)::text FROM "{name}" t'),
+                execution_options={"yield_per": ARCHIVE_FETCH_SIZE}
+            )
+            async for (line,) in result:
+                archive.write(line.encode())
+                archive.write(b"\n")
+                rows += 1
+        spool.seek(0)
+
+        uploaded = await asyncio.to_thread(upload_fileobj_to_s3, storage, spool, key, "application/gzip")
+        if not uploaded:
+            logger.error("Failed to archive partition %s to S3, keeping it detached", name)
+            await db.rollback()
+            return None
+
+    await db.execute(text(f'DROP TABLE "{name}"'))
+    await db.commit()
+    logger.info("Archived partition %s (%s rows) to %s", name, rows, key)
+    return key
+
+
+async def ensure_partitions(months_ahead: Optional[int] = None) -> Dict[str, List[str]]:
+    """
+    Создать партиции на текущий и следующие months_ahead месяцев.
+    Таблицы, еще не переведенные на партиционирование, пропускаются.
+
+    Returns:
+        Созданные партиции по таблицам
+    """
+    months_ahead = settings.PARTITION_PREMAKE_MONTHS if months_ahead is None else months_ahead
+    current_month = month_start(datetime.now(timezone.utc).date())
+    created = {}
+
+    async with async_session_maker() as db:
+        for table in PARTITIONED_TABLES:
+            if not await is_partitioned(db, table):
+                logger.warning("Table %s is not partitioned, run scripts.partition_tables", table)
+                continue
+            created[table] = await create_month_partitions(
+                db, table, current_month, add_months(current_month, months_ahead)
+            )
+        await db.commit()
+
+    return created
+
+
+async def maintain_partitions() -> Dict[str, Any]:
+    """
+    Создать будущие партиции и архивировать партиции старше срока хранения.
+
+    Срок хранения таблицы в месяцах задается настройкой из PARTITIONED_TABLES
+    (0 - хранить без ограничения). Без S3 хранилища по умолчанию старые
+    партиции не трогаются.
+
+    Returns:
+        dict: Созданные и архивированные партиции по таблицам
+    """
+    created = await ensure_partitions()
+    archived: Dict[str, List[str]] = {}
+    current_month = month_start(datetime.now(timezone.utc).date())
+
+    async with async_session_maker() as db:
+        storage = await get_default_s3_storage(db)
+        if storage is not None:
+            db.expunge(storage)
+
+        for table in created:
+            months = retention_months(table)
+            if not months:
+                continue
+            if storage is None:
+                logger.warning("No default S3 storage, skipping archiving of %s partitions", table)
+                continue
+
+            cutoff = add_months(current_month, -months)
+            for name, month, attached in await list_partitions(db, table):
+                if month >= cutoff:
+                    break
+                if attached:
+                    await db.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+                    await db.commit()
+                if await archive_partition(db, table, name, storage):
+                    archived.setdefault(table, []).append(name)
+
+    return {"created": created, "archived": archived}
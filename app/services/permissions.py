@@ -0,0 +1,224 @@
+"""
+Проверка прав по скомпилированным наборам с кэшем в памяти процесса.
+
+Контракт инвалидации: код, который меняет роли или права, вызывает после
+commit permission_service.invalidate_all() (роли и права, см. crud.role), а код,
+который назначает или снимает роли пользователя (UserRole), -
+permission_service.invalidate_user(user_id). Изменения в обход этих путей
+(SQL-скрипты, прямые правки в БД) становятся видны не позже чем через
+PERMISSION_CACHE_TTL_SECONDS.
+"""
+import logging
+import time
+from typing import Optional, List, Tuple, Dict, Iterable, Union
+from uuid import UUID
+import redis.asyncio as redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.user import User
+from app.models.user_role import UserRole
+from app.models.role import Role, Permission
+
+
+logger = logging.getLogger(__name__)
+
+WILDCARD = "*"
+
+PermissionCheck = Tuple[str, str, Optional[Union[UUID, str]]]
+
+
+class PermissionSet:
+    """
+    Скомпилированный набор прав пользователя.
+
+    grants - frozenset кортежей (resource, action, enterprise_id), где
+    enterprise_id = None означает право на все предприятия, а resource/action
+    могут быть равны "*". Проверка выполняется поиском в множествах без обращения к БД.
+    """
+
+    def __init__(self, grants: Iterable[Tuple[str, str, Optional[str]]], is_superuser: bool = False):
+        self.grants = frozenset(grants)
+        self.any_enterprise = frozenset((resource, action) for resource, action, _ in self.grants)
+        self.is_superuser = is_superuser
+
+    def allows(self, resource: str, action: str, enterprise_id: Optional[Union[UUID, str]] = None) -> bool:
+        """
+        Проверить наличие права.
+
+        Args:
+            resource: Ресурс (например, 'audit', 'finding')
+            action: Действие (например, 'create', 'read')
+            enterprise_id: ID предприятия; None - проверка без ограничения по предприятию
+
+        Returns:
+            True если право есть
+        """
+        if self.is_superuser:
+            return True
+
+        for res in (resource, WILDCARD):
+            for act in (action, WILDCARD):
+                if enterprise_id is None:
+                    if (res, act) in self.any_enterprise:
+                        return True
+                elif (res, act, None) in self.grants or (res, act, str(enterprise_id)) in self.grants:
+                    return True
+
+        return False
+
+
+class PermissionService:
+    """
+    Кэш скомпилированных наборов прав с версионной инвалидацией.
+
+    Наборы хранятся в памяти процесса не дольше PERMISSION_CACHE_TTL_SECONDS.
+    Версии (глобальная и пользовательская) хранятся в Redis, поэтому изменение
+    ролей в одном воркере инвалидирует кэш во всех остальных.
+    """
+
+    GLOBAL_VERSION_KEY = "permissions:version"
+
+    def __init__(self):
+        self.redis_client = None
+        self._cache: Dict[UUID, Tuple[Tuple[int, int], float, PermissionSet]] = {}
+
+    async def get_redis(self):
+        if self.redis_client is None:
+            self.redis_client = await redis.from_url(settings.REDIS_URL)
+        return self.redis_client
+
+    @staticmethod
+    def _user_version_key(user_id: UUID) -> str:
+        return f"permissions:version:user:{user_id}"
+
+    async def _get_version(self, user_id: UUID) -> Optional[Tuple[int, int]]:
+        try:
+            redis_client = await self.get_redis()
+            global_version, user_version = await redis_client.mget(
+                self.GLOBAL_VERSION_KEY,
+                self._user_version_key(user_id)
+            )
+        except Exception as e:
+            logger.warning(f"Permission version lookup failed: {e}")
+            return None
+        return int(global_version or 0), int(user_version or 0)
+
+    async def compile(self, db: AsyncSession, user: User) -> PermissionSet:
+        """
+        Построить набор прав пользователя одним запросом UserRole→Role→Permission.
+
+        Args:
+            db: Сессия базы данных
+            user: Пользователь
+
+        Returns:
+            Скомпилированный набор прав
+        """
+        if user.is_superuser:
+            return PermissionSet((), is_superuser=True)
+
+        stmt = select(
+            Permission.resource,
+            Permission.action,
+            Permission.enterprise_id,
+            UserRole.enterprise_id
+        ).select_from(UserRole).join(
+            Role, UserRole.role_id == Role.id
+        ).join(
+            Permission, Permission.role_id == Role.id
+        ).where(
+            UserRole.user_id == user.id,
+            UserRole.deleted_at.is_(None),
+            Role.deleted_at.is_(None),
+            Permission.deleted_at.is_(None)
+        )
+        result = await db.execute(stmt)
+
+        grants = set()
+        for resource, action, permission_enterprise_id, role_enterprise_id in result.all():
+            if permission_enterprise_id and role_enterprise_id and permission_enterprise_id != role_enterprise_id:
+                continue
+            scope = permission_enterprise_id or role_enterprise_id
+            grants.add((resource, action, str(scope) if scope else None))
+
+        return PermissionSet(grants)
+
+    async def get_permission_set(self, db: AsyncSession, user: User) -> PermissionSet:
+        """
+        Получить набор прав пользователя из кэша или собрать его заново.
+
+        Args:
+            db: Сессия базы данных
+            user: Пользователь
+
+        Returns:
+            Скомпилированный набор прав
+        """
+        if user.is_superuser:
+            return PermissionSet((), is_superuser=True)
+
+        version = await self._get_version(user.id)
+        cached = self._cache.get(user.id)
+        if version is not None and cached is not None:
+            cached_version, expires_at, permission_set = cached
+            if cached_version == version and time.monotonic() < expires_at:
+                return permission_set
+
+        permission_set = await self.compile(db, user)
+        if version is not None:
+            expires_at = time.monotonic() + settings.PERMISSION_CACHE_TTL_SECONDS
+            self._cache[user.id] = (version, expires_at, permission_set)
+        return permission_set
+
+    async def can(
+        self,
+        db: AsyncSession,
+        user: User,
+        checks: List[PermissionCheck]
+    ) -> List[bool]:
+        """
+        Пакетная проверка прав для фильтрации строк в списочных эндпоинтах.
+
+        Args:
+            db: Сессия базы данных
+            user: Пользователь
+            checks: Список кортежей (resource, action, enterprise_id)
+
+        Returns:
+            Список результатов в порядке проверок
+        """
+        permission_set = await self.get_permission_set(db, user)
+        return [permission_set.allows(resource, action, enterprise_id) for resource, action, enterprise_id in checks]
+
+    async def invalidate_all(self) -> None:
+        """
+        Сбросить наборы прав всех пользователей (изменение ролей или прав).
+        """
+        self._cache.clear()
+        try:
+            redis_client = await self.get_redis()
+            await redis_client.incr(self.GLOBAL_VERSION_KEY)
+        except Exception as e:
+            logger.warning(f"Permission version bump failed: {e}")
+
+    async def invalidate_user(self, user_id: UUID) -> None:
+        """
+        Сбросить набор прав пользователя (изменение назначенных ролей).
+
+        Args:
+            user_id: ID пользователя
+        """
+        self._cache.pop(user_id, None)
+        try:
+            redis_client = await self.get_redis()
+            await redis_client.incr(self._user_version_key(user_id))
+        except Exception as e:
+            logger.warning(f"Permission version bump failed: {e}")
+
+
+permission_service = PermissionService()
+
+
+async def can(db: AsyncSession, user: User, checks: List[PermissionCheck]) -> List[bool]:
+    return await permission_service.can(db, user, checks)
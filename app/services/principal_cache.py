@@ -0,0 +1,187 @@
+import json
+import logging
+from datetime import datetime, date
+from typing import Optional, Dict, Any
+from uuid import UUID
+import redis.asyncio as redis
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from app.core.config import settings
+from app.models.user import User
+
+
+logger = logging.getLogger(__name__)
+
+# Поля, которые проверяет get_current_user и читают зависимые эндпоинты (профиль /users/me,
+# права, Telegram). Хэш пароля, LDAP DN и прочие колонки в Redis не попадают.
+PRINCIPAL_FIELDS = (
+    "id",
+    "email",
+    "username",
+    "first_name_ru",
+    "last_name_ru",
+    "patronymic_ru",
+    "first_name_en",
+    "last_name_en",
+    "location_id",
+    "language",
+    "telegram_chat_id",
+    "telegram_linked_at",
+    "notification_digest_minutes",
+    "is_auditor",
+    "is_expert",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+    "session_id",
+    "deleted_at",
+)
+
+
+class PrincipalCache:
+    """
+    Кэш проверенных пользователей для get_current_user.
+
+    Хранит поля PRINCIPAL_FIELDS пользователя в Redis-хэше principal:{user_id},
+    поле хэша - session_id. Инвалидация удаляет весь хэш пользователя,
+    поэтому старые сессии перестают приниматься сразу после входа/выхода.
+    """
+
+    def __init__(self):
+        self.redis_client = None
+        self.enabled = settings.PRINCIPAL_CACHE_ENABLED
+        self.ttl_seconds = settings.PRINCIPAL_CACHE_TTL_SECONDS
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    async def get_redis(self):
+        if self.redis_client is None:
+            self.redis_client = await redis.from_url(settings.REDIS_URL)
+        return self.redis_client
+
+    @staticmethod
+    def _key(user_id: UUID) -> str:
+        return f"principal:{user_id}"
+
+    @staticmethod
+    def _dump_user(user: User) -> str:
+        values = {}
+        for name in PRINCIPAL_FIELDS:
+            value = getattr(user, name, None)
+            if isinstance(value, UUID):
+                value = str(value)
+            elif isinstance(value, (datetime, date)):
+                value = value.isoformat()
+            values[name] = value
+        return json.dumps(values)
+
+    @staticmethod
+    def _load_values(raw: bytes) -> Dict[str, Any]:
+        stored = json.loads(raw)
+        values = {}
+        for name in PRINCIPAL_FIELDS:
+            value = stored.get(name)
+            if value is not None:
+                python_type = User.__table__.columns[name].type.python_type
+                if python_type is UUID:
+                    value = UUID(value)
+                elif python_type is datetime:
+                    value = datetime.fromisoformat(value)
+                elif python_type is date:
+                    value = date.fromisoformat(value)
+            values[name] = value
+        return values
+
+    async def get_user(self, db: AsyncSession, user_id: UUID, session_id: Optional[str]) -> Optional[User]:
+        """
+        Получить пользователя из кэша и присоединить его к сессии без запроса в БД.
+
+        Args:
+            db: Сессия базы данных
+            user_id: ID пользователя из токена
+            session_id: ID сессии из токена
+
+        Returns:
+            Пользователь или None при промахе кэша
+        """
+        if not self.enabled or not session_id:
+            return None
+
+        try:
+            redis_client = await self.get_redis()
+            raw = await redis_client.hget(self._key(user_id), session_id)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Principal cache read failed: {e}")
+            return None
+
+        if raw is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+
+        user = User(**self._load_values(raw))
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+
+    async def set_user(self, user: User) -> None:
+        """
+        Сохранить проверенного пользователя в кэш.
+
+        Args:
+            user: Пользователь с активной сессией
+        """
+        if not self.enabled or not user.session_id:
+            return
+
+        try:
+            redis_client = await self.get_redis()
+            key = self._key(user.id)
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.hset(key, user.session_id, self._dump_user(user))
+                pipe.expire(key, self.ttl_seconds)
+                await pipe.execute()
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Principal cache write failed: {e}")
+
+    async def invalidate(self, user_id: UUID) -> None:
+        """
+        Удалить все закэшированные сессии пользователя.
+
+        Вызывается при входе, выходе, деактивации и изменении пользователя.
+
+        Args:
+            user_id: ID пользователя
+        """
+        if not self.enabled:
+            return
+
+        self.invalidations += 1
+
+        try:
+            redis_client = await self.get_redis()
+            await redis_client.delete(self._key(user_id))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Principal cache invalidation failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Счетчики попаданий и промахов кэша текущего процесса.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+            "hit_ratio": self.hits / lookups if lookups else None
+        }
+
+
+principal_cache = PrincipalCache()
@@ -0,0 +1,523 @@
+"""
+Потоковая выгрузка отчетов в XLSX, CSV, JSON Lines и Parquet.
+
+Строки отчета приходят пачками (списками словарей) из асинхронного источника,
+как правило из серверного курсора БД, и сразу дописываются в книгу openpyxl
+в режиме write_only: строки листа сбрасываются во временный файл, а не
+накапливаются в памяти. Оформление задано именованными стилями, которые
+регистрируются в книге один раз, ячейки ссылаются на них по имени. Готовый
+файл отдается через StreamingResponse кусками и удаляется после отправки,
+поэтому пиковая память не зависит от числа строк.
+
+Все форматы используют одно описание колонок ReportLayout поверх строк,
+которые собирает crud.report. CSV и JSON Lines для BI выгрузок пишутся прямо
+в ответ по мере чтения курсора, Parquet - колоночными пачками (pyarrow).
+
+Большие выгрузки выполняются фоновой задачей export_report_task: файл
+загружается в S3 хранилище по умолчанию и скачивается по pre-signed URL.
+Готовые файлы переиспользуются по ключу кэша - хэшу фильтров отчета и отметки
+актуальности данных (max(updated_at) и число несоответствий под фильтром).
+"""
+import asyncio
+import csv
+import hashlib
+import io
+import json
+import os
+import tempfile
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
+from openpyxl.utils import get_column_letter
+from starlette.background import BackgroundTask
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.crud import report as crud_report
+from app.models.s3_storage import S3Storage
+from app.services.s3 import upload_fileobj_to_s3
+
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+FILE_CHUNK_SIZE = 64 * 1024
+COLUMN_WIDTH = 20
+
+HEADER_STYLE = "report_header"
+CELL_STYLE = "report_cell"
+DATE_CELL_STYLE = "report_date_cell"
+
+REPORT_EXPORT_S3_PREFIX = "exports/reports/"
+
+
+class ReportLayout:
+    """
+    Описание выгружаемого отчета: лист и колонки (заголовок, ключ строки, тип значения).
+
+    Тип значения (int, str, date) задает тип колонки в Parquet.
+    """
+
+    def __init__(self, name: str, sheet_title: str, columns: List[Tuple[str, str, str]], wrap_text: bool = False):
+        self.name = name
+        self.sheet_title = sheet_title
+        self.columns = columns
+        self.wrap_text = wrap_text
+
+    @property
+    def headers(self) -> List[str]:
+        return [header for header, _, _ in self.columns]
+
+    @property
+    def keys(self) -> List[str]:
+        return [key for _, key, _ in self.columns]
+
+    def values(self, row: Dict[str, Any]) -> List[Any]:
+        return [row.get(key) for _, key, _ in self.columns]
+
+
+FINDINGS_REPORT = ReportLayout(
+    name="findings_report",
+    sheet_title="Несоответствия",
+    columns=[
+        ("№", "finding_number", "int"),
+        ("№ Аудита", "audit_number", "str"),
+        ("Аудит", "audit_title", "str"),
+        ("Название", "title", "str"),
+        ("Тип", "finding_type", "str"),
+        ("Процесс", "process_name", "str"),
+        ("Статус", "status_name", "str"),
+        ("Исполнитель", "resolver_name", "str"),
+        ("Утверждающий", "approver_name", "str"),
+        ("Дедлайн", "deadline", "date"),
+        ("Дата закрытия", "closing_date", "date"),
+        ("Дата создания", "created_at", "date"),
+    ],
+    wrap_text=True
+)
+
+PROCESS_REPORT = ReportLayout(
+    name="process_report",
+    sheet_title="По процессам",
+    columns=[
+        ("Процесс", "process_name", "str"),
+        ("Всего", "total_findings", "int"),
+        ("CAR1", "car1_count", "int"),
+        ("CAR2", "car2_count", "int"),
+        ("OFI", "ofi_count", "int"),
+        ("Закрыто", "closed_count", "int"),
+        ("Просрочено", "overdue_count", "int"),
+    ]
+)
+
+SOLVER_REPORT = ReportLayout(
+    name="solver_report",
+    sheet_title="По исполнителям",
+    columns=[
+        ("Исполнитель", "solver_name", "str"),
+        ("Всего", "total_findings", "int"),
+        ("Активных", "active_findings", "int"),
+        ("Просрочено", "overdue_findings", "int"),
+        ("Закрыто", "closed_findings", "int"),
+    ]
+)
+
+
+def _register_styles(wb: Workbook, wrap_text: bool) -> None:
+    header = NamedStyle(name=HEADER_STYLE)
+    header.font = Font(bold=True, color="FFFFFF")
+    header.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    header.alignment = Alignment(horizontal="center", vertical="center")
+    wb.add_named_style(header)
+
+    cell = NamedStyle(name=CELL_STYLE)
+    cell.alignment = Alignment(horizontal="left", vertical="center", wrap_text=wrap_text)
+    wb.add_named_style(cell)
+
+    date_cell = NamedStyle(name=DATE_CELL_STYLE, number_format="DD.MM.YYYY")
+    date_cell.alignment = Alignment(horizontal="left", vertical="center", wrap_text=wrap_text)
+    wb.add_named_style(date_cell)
+
+
+def _styled_cell(ws, value: Any, style: str) -> WriteOnlyCell:
+    cell = WriteOnlyCell(ws, value=value)
+    cell.style = style
+    return cell
+
+
+def _append_rows(ws, layout: ReportLayout, rows: List[Dict[str, Any]]) -> None:
+    for row in rows:
+        ws.append([
+            _styled_cell(ws, value, DATE_CELL_STYLE if isinstance(value, (date, datetime)) else CELL_STYLE)
+            for value in layout.values(row)
+        ])
+
+
+async def rows_as_chunks(rows: List[Dict[str, Any]]) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Источник из уже загруженных строк (для небольших сводных отчетов)."""
+    yield rows
+
+
+async def write_xlsx(layout: ReportLayout, chunks: AsyncIterator[List[Dict[str, Any]]]) -> str:
+    """
+    Записать отчет в XLSX файл во временной директории.
+
+    Пачки дописываются в отдельном потоке, чтобы не блокировать event loop.
+
+    Args:
+        layout: Описание отчета
+        chunks: Асинхронный источник пачек строк
+
+    Returns:
+        Путь к файлу; удаление - на вызывающем коде (см. file_streaming_response)
+    """
+    wb = Workbook(write_only=True)
+    _register_styles(wb, layout.wrap_text)
+    ws = wb.create_sheet(layout.sheet_title)
+    for index in range(1, len(layout.columns) + 1):
+        ws.column_dimensions[get_column_letter(index)].width = COLUMN_WIDTH
+    ws.append([_styled_cell(ws, header, HEADER_STYLE) for header in layout.headers])
+
+    async for rows in chunks:
+        await asyncio.to_thread(_append_rows, ws, layout, rows)
+
+    path = _temp_path(layout, "xlsx")
+    try:
+        await asyncio.to_thread(wb.save, path)
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+
+def _iter_file(path: str) -> Iterator[bytes]:
+    with open(path, "rb") as file:
+        while chunk := file.read(FILE_CHUNK_SIZE):
+            yield chunk
+
+
+def file_streaming_response(path: str, filename: str, media_type: str = XLSX_MEDIA_TYPE) -> StreamingResponse:
+    """
+    Отдать файл кусками и удалить его после отправки.
+
+    Args:
+        path: Путь к временному файлу
+        filename: Имя файла для Content-Disposition
+        media_type: MIME тип
+
+    Returns:
+        StreamingResponse
+    """
+    return StreamingResponse(
+        _iter_file(path),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "Content-Length": str(os.path.getsize(path))
+        },
+        background=BackgroundTask(os.remove, path)
+    )
+
+
+def _csv_text(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _csv_chunk(layout: ReportLayout, rows: List[Dict[str, Any]]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_text(value) for value in layout.values(row)] for row in rows)
+    return buffer.getvalue().encode()
+
+
+async def stream_csv(layout: ReportLayout, chunks: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[bytes]:
+    """
+    CSV отчета по мере чтения пачек: строка заголовков с ключами колонок, даты в ISO 8601.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(layout.keys)
+    yield buffer.getvalue().encode()
+    async for rows in chunks:
+        yield _csv_chunk(layout, rows)
+
+
+def _jsonl_chunk(layout: ReportLayout, rows: List[Dict[str, Any]]) -> bytes:
+    return "".join(
+        json.dumps(dict(zip(layout.keys, layout.values(row))), ensure_ascii=False, default=_csv_text) + "\n"
+        for row in rows
+    ).encode()
+
+
+async def stream_jsonl(layout: ReportLayout, chunks: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[bytes]:
+    """
+    JSON Lines отчета по мере чтения пачек: объект с ключами колонок на строку.
+    """
+    async for rows in chunks:
+        yield _jsonl_chunk(layout, rows)
+
+
+def _temp_path(layout: ReportLayout, extension: str) -> str:
+    fd, path = tempfile.mkstemp(prefix=f"{layout.name}_", suffix=f".{extension}")
+    os.close(fd)
+    return path
+
+
+async def _write_stream(layout: ReportLayout, stream: AsyncIterator[bytes], extension: str) -> str:
+    path = _temp_path(layout, extension)
+    try:
+        with open(path, "wb") as file:
+            async for data in stream:
+                await asyncio.to_thread(file.write, data)
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+
+async def write_csv(layout: ReportLayout, chunks: AsyncIterator[List[Dict[str, Any]]]) -> str:
+    return await _write_stream(layout, stream_csv(layout, chunks), "csv")
+
+
+async def write_jsonl(layout: ReportLayout, chunks: AsyncIterator[List[Dict[str, Any]]]) -> str:
+    return await _write_stream(layout, stream_jsonl(layout, chunks), "jsonl")
+
+
+async def write_parquet(layout: ReportLayout, chunks: AsyncIterator[List[Dict[str, Any]]]) -> str:
+    """
+    Записать отчет в Parquet файл во временной директории.
+
+    Каждая пачка строк превращается в колоночный RecordBatch по типам колонок
+    ReportLayout и дописывается отдельной группой строк.
+
+    Returns:
+        Путь к файлу; удаление - на вызывающем коде (см. file_streaming_response)
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {"int": pa.int64(), "str": pa.string(), "date": pa.date32()}
+    schema = pa.schema([(key, types[kind]) for _, key, kind in layout.columns])
+
+    def batch(rows: List[Dict[str, Any]]):
+        return pa.record_batch(
+            [pa.array([row.get(key) for row in rows], type=field.type) for key, field in zip(layout.keys, schema)],
+            schema=schema
+        )
+
+    path = _temp_path(layout, "parquet")
+    try:
+        with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+            async for rows in chunks:
+                if rows:
+                    await asyncio.to_thread(lambda rows=rows: writer.write_batch(batch(rows)))
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+
+class ReportFormat:
+    """Формат выгрузки: MIME тип, расширение, запись в файл и, если возможно, потоковая отдача."""
+
+    def __init__(
+        self,
+        media_type: str,
+        extension: str,
+        write: Callable[[ReportLayout, AsyncIterator[List[Dict[str, Any]]]], Awaitable[str]],
+        stream: Optional[Callable[[ReportLayout, AsyncIterator[List[Dict[str, Any]]]], AsyncIterator[bytes]]] = None
+    ):
+        self.media_type = media_type
+        self.extension = extension
+        self.write = write
+        self.stream = stream
+
+
+REPORT_FORMATS: Dict[str, ReportFormat] = {
+    "xlsx": ReportFormat(XLSX_MEDIA_TYPE, "xlsx", write_xlsx),
+    "csv": ReportFormat("text/csv; charset=utf-8", "csv", write_csv, stream_csv),
+    "jsonl": ReportFormat("application/x-ndjson", "jsonl", write_jsonl, stream_jsonl),
+    "parquet": ReportFormat("application/vnd.apache.parquet", "parquet", write_parquet),
+}
+
+
+async def report_response(
+    layout: ReportLayout,
+    chunks: AsyncIterator[List[Dict[str, Any]]],
+    export_format: str = "xlsx",
+    filename: Optional[str] = None
+) -> StreamingResponse:
+    """
+    Ответ с выгрузкой отчета в заданном формате.
+
+    CSV и JSON Lines отдаются сразу по мере чтения пачек из БД, без временного
+    файла; XLSX и Parquet требуют файла целиком и отдаются после записи.
+
+    Args:
+        layout: Описание отчета
+        chunks: Асинхронный источник пачек строк
+        export_format: Ключ REPORT_FORMATS
+        filename: Имя файла без расширения (по умолчанию <отчет>_<дата>)
+
+    Returns:
+        StreamingResponse
+    """
+    report_format = REPORT_FORMATS[export_format]
+    filename = f"{filename or f'{layout.name}_{date.today().isoformat()}'}.{report_format.extension}"
+
+    if report_format.stream:
+        return StreamingResponse(
+            report_format.stream(layout, chunks),
+            media_type=report_format.media_type,
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
+
+    path = await report_format.write(layout, chunks)
+    return file_streaming_response(path, filename, report_format.media_type)
+
+
+class ReportExport:
+    """
+    Отчет, доступный для фоновой выгрузки.
+    
+    filters - параметры фильтра, которые принимает отчет; daily - отчет
+    зависит от текущей даты (просрочка), поэтому кэш действует до конца дня;
+    utc_day - отчет строится из куба findings_summary и фильтрует период по дню
+    создания (UTC), так же считается и отметка данных для кэша.
+    """
+
+    def __init__(
+        self,
+        layout: ReportLayout,
+        filters: Tuple[str, ...],
+        rows: Callable[..., AsyncIterator[List[Dict[str, Any]]]],
+        daily: bool = False,
+        utc_day: bool = False
+    ):
+        self.layout = layout
+        self.filters = filters
+        self.rows = rows
+        self.daily = daily
+        self.utc_day = utc_day
+
+    def filter_values(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {name: params.get(name) for name in self.filters}
+
+
+def _findings_rows(db: AsyncSession, **filters) -> AsyncIterator[List[Dict[str, Any]]]:
+    return crud_report.stream_findings_report(db=db, chunk_size=settings.REPORT_EXPORT_CHUNK_SIZE, **filters)
+
+
+async def _process_rows(db: AsyncSession, **filters) -> AsyncIterator[List[Dict[str, Any]]]:
+    yield await crud_report.get_process_report(db=db, **filters)
+
+
+async def _solver_rows(db: AsyncSession, **filters) -> AsyncIterator[List[Dict[str, Any]]]:
+    yield await crud_report.get_solver_report(db=db, **filters)
+
+
+REPORT_EXPORTS: Dict[str, ReportExport] = {
+    "findings": ReportExport(
+        FINDINGS_REPORT,
+        ("enterprise_id", "date_from", "date_to", "status_id", "finding_type"),
+        _findings_rows
+    ),
+    "by_processes": ReportExport(
+        PROCESS_REPORT, ("enterprise_id", "date_from", "date_to"), _process_rows, daily=True, utc_day=True
+    ),
+    "by_solvers": ReportExport(
+        SOLVER_REPORT, ("enterprise_id", "date_from", "date_to"), _solver_rows, daily=True, utc_day=True
+    ),
+}
+
+
+def report_cache_key(
+    report_type: str,
+    params: Dict[str, Any],
+    watermark: Optional[datetime],
+    count: int,
+    today: Optional[date] = None,
+    export_format: str = "xlsx"
+) -> str:
+    """
+    Ключ кэша выгрузки: sha256 от типа отчета, формата, значений фильтров отчета и отметки данных.
+    
+    Параметры, которые отчет не принимает, в ключ не входят.
+    """
+    export = REPORT_EXPORTS[report_type]
+    payload = {
+        "report_type": report_type,
+        "format": export_format,
+        "filters": export.filter_values(params),
+        "watermark": watermark.isoformat() if watermark else None,
+        "count": count,
+        "day": (today or date.today()).isoformat() if export.daily else None,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+async def get_report_cache_key(
+    db: AsyncSession,
+    report_type: str,
+    params: Dict[str, Any],
+    export_format: str = "xlsx"
+) -> Tuple[str, Optional[datetime]]:
+    """
+    Вычислить ключ кэша выгрузки по текущим данным.
+    
+    Returns:
+        tuple: (ключ кэша, max(updated_at) несоответствий под фильтром)
+    """
+    export = REPORT_EXPORTS[report_type]
+    watermark, count = await crud_report.get_findings_watermark(
+        db=db, utc_day=export.utc_day, **export.filter_values(params)
+    )
+    return report_cache_key(report_type, params, watermark, count, export_format=export_format), watermark
+
+
+def report_export_filename(report_type: str, completed_at: datetime, export_format: str = "xlsx") -> str:
+    layout = REPORT_EXPORTS[report_type].layout
+    return f"{layout.name}_{completed_at.date().isoformat()}.{REPORT_FORMATS[export_format].extension}"
+
+
+async def build_report_export(
+    db: AsyncSession,
+    storage: S3Storage,
+    report_type: str,
+    params: Dict[str, Any],
+    cache_key: str,
+    export_format: str = "xlsx"
+) -> str:
+    """
+    Сформировать файл отчета и загрузить его в S3.
+    
+    Args:
+        db: Сессия базы данных
+        storage: S3 хранилище
+        report_type: Тип отчета из REPORT_EXPORTS
+        params: Фильтры отчета
+        cache_key: Ключ кэша, из него строится ключ объекта
+        export_format: Ключ REPORT_FORMATS
+    
+    Returns:
+        Ключ объекта в S3
+    
+    Raises:
+        RuntimeError: Если загрузка в S3 не удалась
+    """
+    export = REPORT_EXPORTS[report_type]
+    report_format = REPORT_FORMATS[export_format]
+    s3_key = f"{REPORT_EXPORT_S3_PREFIX}{report_type}/{cache_key}.{report_format.extension}"
+    path = await report_format.write(export.layout, export.rows(db, **export.filter_values(params)))
+    try:
+        with open(path, "rb") as file:
+            uploaded = await asyncio.to_thread(upload_fileobj_to_s3, storage, file, s3_key, report_format.media_type)
+    finally:
+        os.remove(path)
+    
+    if not uploaded:
+        raise RuntimeError("Failed to upload report to S3")
+    return s3_key
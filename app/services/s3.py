@@ -150,15 +150,24 @@ def upload_fileobj_to_s3(storage: S3Storage, file_obj, s3_key: str, content_type
         return False
 
 
-def generate_presigned_url(storage: S3Storage, s3_key: str, expiration: int = 3600) -> Optional[str]:
+def generate_presigned_url(
+    storage: S3Storage,
+    s3_key: str,
+    expiration: int = 3600,
+    filename: Optional[str] = None
+) -> Optional[str]:
     try:
         client = get_s3_client(storage)
         
         full_key = f"{storage.prefix}{s3_key}" if storage.prefix else s3_key
         
+        params = {'Bucket': storage.bucket_name, 'Key': full_key}
+        if filename:
+            params['ResponseContentDisposition'] = f'attachment; filename="{filename}"'
+        
         url = client.generate_presigned_url(
             'get_object',
-            Params={'Bucket': storage.bucket_name, 'Key': full_key},
+            Params=params,
             ExpiresIn=expiration
         )
         
@@ -0,0 +1,210 @@
+"""
+Пул постоянных SMTP-соединений.
+
+Для каждого EmailAccount держится пул авторизованных соединений aiosmtplib,
+которые переиспользуются для последовательных писем: TCP/TLS/AUTH выполняется
+один раз на соединение, а не на письмо. Пароль расшифровывается при создании пула.
+Пул пересоздается, если у аккаунта изменился updated_at (смена настроек или пароля).
+
+Все пулы процесса живут в отдельном event loop фонового потока: задачи Celery
+выполняются каждая в своем event loop, и соединения, привязанные к loop задачи,
+нельзя было бы ни переиспользовать, ни корректно закрыть после ее завершения.
+Вызовы из других event loop передаются в loop пулов через run_coroutine_threadsafe.
+"""
+import asyncio
+import logging
+import os
+import threading
+from email.message import EmailMessage
+from email.utils import formataddr
+from typing import Any, Awaitable, Dict, List, Optional
+from uuid import UUID
+import aiosmtplib
+from app.core.config import settings
+from app.crud.email_account import get_email_credentials
+from app.models.email_account import EmailAccount
+
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_ERRORS = (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPConnectError, ConnectionError, asyncio.TimeoutError)
+
+
+async def _run_in_loop(coro: Awaitable[Any], loop: asyncio.AbstractEventLoop) -> Any:
+    if loop is asyncio.get_running_loop():
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
+def build_message(account: EmailAccount, recipients: List[str], subject: str, body: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = formataddr((account.from_name, account.from_email))
+    message["To"] = ", ".join(recipients)
+    message["Subject"] = subject
+    message.set_content(body)
+    return message
+
+
+class SMTPConnection:
+    def __init__(self, client: aiosmtplib.SMTP):
+        self.client = client
+        self.messages_sent = 0
+
+
+class SMTPConnectionPool:
+    """
+    Пул соединений одного email аккаунта.
+
+    Соединение берется из пула на время отправки пакета писем и возвращается
+    обратно. Разорванное соединение пересоздается и отправка повторяется один раз;
+    после max_messages_per_connection писем соединение закрывается и открывается заново.
+    """
+
+    def __init__(
+        self,
+        account: EmailAccount,
+        size: Optional[int] = None,
+        max_messages_per_connection: Optional[int] = None,
+        timeout: Optional[float] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ):
+        self.account_id = account.id
+        self.updated_at = account.updated_at
+        self.hostname = account.smtp_host
+        self.port = account.smtp_port
+        self.username = account.smtp_user
+        self.password = get_email_credentials(account)["smtp_password"]
+        self.start_tls = account.use_tls
+        self.size = size or settings.SMTP_POOL_SIZE
+        self.max_messages_per_connection = max_messages_per_connection or settings.SMTP_POOL_MAX_MESSAGES_PER_CONNECTION
+        self.timeout = timeout or settings.SMTP_TIMEOUT_SECONDS
+        self.loop = loop or asyncio.get_running_loop()
+        self.idle: asyncio.LifoQueue = asyncio.LifoQueue()
+        self.slots = asyncio.Semaphore(self.size)
+        self.closed = False
+
+    async def _connect(self) -> SMTPConnection:
+        client = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            start_tls=self.start_tls,
+            timeout=self.timeout
+        )
+        await client.connect()
+        return SMTPConnection(client)
+
+    async def _discard(self, connection: SMTPConnection) -> None:
+        try:
+            if connection.client.is_connected:
+                await connection.client.quit()
+        except Exception:
+            connection.client.close()
+
+    async def _acquire(self) -> SMTPConnection:
+        while not self.idle.empty():
+            connection = self.idle.get_nowait()
+            if connection.client.is_connected:
+                return connection
+        return await self._connect()
+
+    async def _release(self, connection: SMTPConnection) -> None:
+        if self.closed or connection.messages_sent >= self.max_messages_per_connection:
+            await self._discard(connection)
+        else:
+            self.idle.put_nowait(connection)
+
+    async def send_messages(self, messages: List[EmailMessage]) -> None:
+        """
+        Отправить письма через одно соединение пула.
+
+        Args:
+            messages: Письма для отправки
+        """
+        await _run_in_loop(self._send_messages(messages), self.loop)
+
+    async def _send_messages(self, messages: List[EmailMessage]) -> None:
+        async with self.slots:
+            connection = await self._acquire()
+            try:
+                for message in messages:
+                    try:
+                        await connection.client.send_message(message)
+                    except RECONNECT_ERRORS as e:
+                        logger.info("SMTP connection to %s:%s lost, reconnecting: %s", self.hostname, self.port, e)
+                        connection.client.close()
+                        connection = await self._connect()
+                        await connection.client.send_message(message)
+                    connection.messages_sent += 1
+            except Exception:
+                await self._discard(connection)
+                raise
+            await self._release(connection)
+
+    async def close(self) -> None:
+        await _run_in_loop(self._close(), self.loop)
+
+    async def _close(self) -> None:
+        self.closed = True
+        while not self.idle.empty():
+            await self._discard(self.idle.get_nowait())
+
+
+_pools: Dict[UUID, SMTPConnectionPool] = {}
+_pool_loop: Optional[asyncio.AbstractEventLoop] = None
+_pool_loop_pid: Optional[int] = None
+_pool_loop_lock = threading.Lock()
+
+
+def _get_pool_loop() -> asyncio.AbstractEventLoop:
+    """
+    Event loop пулов текущего процесса.
+
+    Запускается в фоновом потоке при первом обращении. После fork (prefork-воркеры
+    Celery) поток родителя в дочернем процессе не работает, поэтому loop и пулы
+    создаются заново.
+    """
+    global _pool_loop, _pool_loop_pid
+    with _pool_loop_lock:
+        if _pool_loop is None or _pool_loop_pid != os.getpid():
+            _pools.clear()
+            _pool_loop = asyncio.new_event_loop()
+            _pool_loop_pid = os.getpid()
+            threading.Thread(target=_pool_loop.run_forever, name="smtp-pool", daemon=True).start()
+        return _pool_loop
+
+
+async def get_smtp_pool(account: EmailAccount) -> SMTPConnectionPool:
+    """
+    Получить пул соединений аккаунта, пересоздав его при изменении аккаунта.
+
+    Args:
+        account: Email аккаунт
+
+    Returns:
+        Пул соединений
+    """
+    loop = _get_pool_loop()
+    pool = _pools.get(account.id)
+    if pool and pool.updated_at == account.updated_at:
+        return pool
+
+    if pool:
+        await pool.close()
+
+    pool = SMTPConnectionPool(account, loop=loop)
+    _pools[account.id] = pool
+    return pool
+
+
+async def close_smtp_pools() -> None:
+    """Закрыть все пулы соединений текущего процесса."""
+    if _pool_loop_pid != os.getpid():
+        _pools.clear()
+        return
+
+    pools = list(_pools.values())
+    _pools.clear()
+    for pool in pools:
+        await pool.close()
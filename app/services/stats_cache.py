@@ -0,0 +1,52 @@
+"""
+Кэш результатов статистических запросов на несколько секунд.
+
+Статистику запрашивают панели мониторинга с частым опросом, а точность до
+секунд не нужна, поэтому результат агрегирующего запроса переиспользуется
+в течение NOTIFICATION_STATS_CACHE_SECONDS. Кэш локален для процесса.
+"""
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from app.core.config import settings
+
+
+class TTLCache:
+    """Словарь значений с временем жизни; истекшие записи удаляются при переполнении."""
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_size: int = 1024):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.NOTIFICATION_STATS_CACHE_SECONDS
+        self.max_size = max_size
+        self._items: Dict[Hashable, Tuple[float, Any]] = {}
+
+    async def get_or_set(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Вернуть значение по ключу или вычислить его через factory и сохранить.
+
+        Args:
+            key: Ключ кэша
+            factory: Корутина, вычисляющая значение
+
+        Returns:
+            Закэшированное или вычисленное значение
+        """
+        if self.ttl_seconds <= 0:
+            return await factory()
+
+        now = time.monotonic()
+        cached = self._items.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        value = await factory()
+        if len(self._items) >= self.max_size:
+            self._items = {k: v for k, v in self._items.items() if v[0] > now}
+            if len(self._items) >= self.max_size:
+                self._items.clear()
+        self._items[key] = (now + self.ttl_seconds, value)
+        return value
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+notification_stats_cache = TTLCache()
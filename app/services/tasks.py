@@ -1,20 +1,29 @@
+import asyncio
 from datetime import date, datetime
 from typing import List
 from uuid import UUID
 from app.core.celery_worker import celery_app
+from app.core.config import settings
 from app.core.database import async_session_maker
 from app.models.auditor_qualification import AuditorQualification
 from app.models.status import Status
 from app.models.notification import Notification
 from app.models.notification_queue import NotificationQueue
-from app.models.user import User
 from app.models.export_task import ExportTask, ExportTaskStatus
 from app.crud import notification as crud_notification
 from app.crud import export_task as crud_export_task
 from app.crud import audit as crud_audit
-from app.services.notification_service import send_notification_email, send_notification_telegram
+from app.crud import dashboard as crud_dashboard
+from app.crud import findings_summary as crud_findings_summary
+from app.crud import change_history as crud_change_history
+from app.crud.s3_storage import get_default_s3_storage
+from app.schemas.report import ReportFilter
+from app.services.notification_outbox import process_outbox
+from app.services.telegram_dispatcher import telegram_dispatcher
 from app.services.export import export_audit_to_zip
-from app.services.s3 import s3_service
+from app.services import partitions
+from app.services.report_export import build_report_export
+from app.services.s3 import upload_fileobj_to_s3
 from sqlalchemy import select
 import os
 from datetime import datetime, timezone
@@ -61,165 +70,69 @@ async def check_expired_qualifications():
         return {"updated": updated_count}
 
 
+async def _process_channel(channel: str) -> dict:
+    """
+    Обработать очередь канала в loop текущей задачи.
+
+    Для Telegram соединения диспетчера закрываются до завершения loop задачи.
+    """
+    if channel != "telegram":
+        return await process_outbox(channel=channel)
+
+    try:
+        result = await process_outbox(channel=channel)
+    finally:
+        await telegram_dispatcher.close()
+    return {**result, "dispatcher": telegram_dispatcher.stats()}
+
+
 @celery_app.task
 async def send_email_notifications_batch():
     """
-    Батчевая отправка email уведомлений из очереди.
+    Отправка email уведомлений из очереди пулом воркеров с захватом пакетов.
     Выполняется каждую минуту через Celery Beat.
     """
-    async with async_session_maker() as db:
-        pending_queue = await crud_notification.get_pending_notifications(db=db, limit=50)
-        
-        if not pending_queue:
-            return {"sent": 0, "failed": 0}
-        
-        sent_count = 0
-        failed_count = 0
-        
-        for queue_item in pending_queue:
-            if queue_item.channel != "email":
-                continue
-            
-            notification = await crud_notification.get_notification(db=db, notification_id=queue_item.notification_id)
-            if not notification:
-                queue_item.status = "failed"
-                queue_item.error_message = "Notification not found"
-                failed_count += 1
-                continue
-            
-            user_stmt = select(User).where(User.id == notification.user_id)
-            user_result = await db.execute(user_stmt)
-            user = user_result.scalar_one_or_none()
-            
-            if not user:
-                queue_item.status = "failed"
-                queue_item.error_message = "User not found"
-                failed_count += 1
-                continue
-            
-            queue_item.status = "processing"
-            await db.commit()
-            
-            success = await send_notification_email(db=db, notification=notification, user=user)
-            
-            if success:
-                queue_item.status = "sent"
-                queue_item.sent_at = datetime.now()
-                sent_count += 1
-            else:
-                queue_item.status = "failed"
-                queue_item.error_message = notification.email_error
-                queue_item.retry_count += 1
-                failed_count += 1
-            
-            await db.commit()
-        
-        return {"sent": sent_count, "failed": failed_count}
+    return await process_outbox(channel="email")
 
 
 @celery_app.task
 async def send_telegram_notifications_batch():
     """
-    Батчевая отправка Telegram уведомлений из очереди.
+    Отправка Telegram уведомлений из очереди пулом воркеров с захватом пакетов.
+    Скорость ограничивается диспетчером Telegram, его состояние возвращается в результате.
     Выполняется каждую минуту через Celery Beat.
     """
-    async with async_session_maker() as db:
-        pending_queue = await crud_notification.get_pending_notifications(db=db, limit=50)
-        
-        if not pending_queue:
-            return {"sent": 0, "failed": 0}
-        
-        sent_count = 0
-        failed_count = 0
-        
-        for queue_item in pending_queue:
-            if queue_item.channel != "telegram":
-                continue
-            
-            notification = await crud_notification.get_notification(db=db, notification_id=queue_item.notification_id)
-            if not notification:
-                queue_item.status = "failed"
-                queue_item.error_message = "Notification not found"
-                failed_count += 1
-                continue
-            
-            user_stmt = select(User).where(User.id == notification.user_id)
-            user_result = await db.execute(user_stmt)
-            user = user_result.scalar_one_or_none()
-            
-            if not user:
-                queue_item.status = "failed"
-                queue_item.error_message = "User not found"
-                failed_count += 1
-                continue
-            
-            queue_item.status = "processing"
-            await db.commit()
-            
-            success = await send_notification_telegram(db=db, notification=notification, user=user)
-            
-            if success:
-                queue_item.status = "sent"
-                queue_item.sent_at = datetime.now()
-                sent_count += 1
-            else:
-                queue_item.status = "failed"
-                queue_item.error_message = notification.telegram_error
-                queue_item.retry_count += 1
-                failed_count += 1
-            
-            await db.commit()
-        
-        return {"sent": sent_count, "failed": failed_count}
+    return await _process_channel("telegram")
+
+
+@celery_app.task
+async def deliver_notifications(channel: str):
+    """
+    Доставка уведомлений канала сразу после их постановки в очередь.
+    Запускается после commit транзакции, в которой вызваны notify_*.
+    """
+    return await _process_channel(channel)
 
 
 @celery_app.task
 async def retry_failed_notifications():
     """
-    Повторная отправка неудачных уведомлений с retry механизмом.
-    Выполняется каждые 5 минут через Celery Beat.
+    Планировщик повторных попыток доставки уведомлений.
+    
+    Возвращает в очередь неудачные элементы, у которых наступило время следующей
+    попытки (scheduled_at рассчитывается с экспоненциальной задержкой при неудаче),
+    переводит исчерпавшие max_retries в dead и сразу доставляет возвращенные элементы.
+    Выполняется каждую минуту через Celery Beat.
     """
     async with async_session_maker() as db:
-        failed_notifications = await crud_notification.get_notifications(
+        requeued = await crud_notification.requeue_due_notification_retries(
             db=db,
-            skip=0,
-            limit=100,
-            user_id=None
+            limit=settings.NOTIFICATION_RETRY_BATCH_SIZE
         )
-        
-        retried_count = 0
-        
-        for notification in failed_notifications:
-            if notification.retry_count >= 3:
-                continue
-            
-            if notification.email_error and not notification.sent_email:
-                user_stmt = select(User).where(User.id == notification.user_id)
-                user_result = await db.execute(user_stmt)
-                user = user_result.scalar_one_or_none()
-                
-                if user:
-                    notification.retry_count += 1
-                    notification.last_retry_at = datetime.now()
-                    await db.commit()
-                    
-                    await send_notification_email(db=db, notification=notification, user=user)
-                    retried_count += 1
-            
-            if notification.telegram_error and not notification.sent_telegram:
-                user_stmt = select(User).where(User.id == notification.user_id)
-                user_result = await db.execute(user_stmt)
-                user = user_result.scalar_one_or_none()
-                
-                if user:
-                    notification.retry_count += 1
-                    notification.last_retry_at = datetime.now()
-                    await db.commit()
-                    
-                    await send_notification_telegram(db=db, notification=notification, user=user)
-                    retried_count += 1
-        
-        return {"retried": retried_count}
+        dead = await crud_notification.dead_letter_exhausted_notifications(db=db)
+    
+    delivered = {channel: await _process_channel(channel) for channel in requeued}
+    return {"requeued": requeued, "dead": dead, "delivered": delivered}
 
 
 @celery_app.task(bind=True)
@@ -270,11 +183,13 @@ async def export_audit_task(self, export_task_id: str):
             
             s3_key = f"exports/{filename}"
             
-            await s3_service.upload_file(
-                file_obj=zip_file,
-                s3_key=s3_key,
-                content_type="application/zip"
-            )
+            storage = await get_default_s3_storage(db)
+            if not storage:
+                raise RuntimeError("No default S3 storage configured")
+            
+            uploaded = await asyncio.to_thread(upload_fileobj_to_s3, storage, zip_file, s3_key, "application/zip")
+            if not uploaded:
+                raise RuntimeError("Failed to upload export to S3")
             
             db_export_task.status = ExportTaskStatus.COMPLETED
             db_export_task.file_path = s3_key
@@ -294,3 +209,111 @@ async def export_audit_task(self, export_task_id: str):
             await db.commit()
             return {"error": str(e)}
 
+
+@celery_app.task(bind=True)
+async def export_report_task(self, export_task_id: str):
+    """
+    Асинхронная задача для выгрузки отчета в файл (XLSX, CSV, JSON Lines или Parquet).
+    
+    Строки читаются из БД пачками, файл загружается в S3 хранилище по умолчанию
+    под ключом кэша задачи, чтобы повторные выгрузки с теми же фильтрами
+    и неизменившимися данными отдавались без пересчета.
+    
+    Args:
+        self: Экземпляр задачи Celery
+        export_task_id: ID задачи экспорта
+    
+    Returns:
+        dict: Результат выгрузки
+    """
+    async with async_session_maker() as db:
+        db_export_task = await crud_export_task.get_export_task(db, UUID(export_task_id))
+        
+        if not db_export_task:
+            return {"error": "Export task not found"}
+        
+        try:
+            db_export_task.status = ExportTaskStatus.PROCESSING
+            db_export_task.celery_task_id = self.request.id
+            await db.commit()
+            
+            storage = await get_default_s3_storage(db)
+            if not storage:
+                raise RuntimeError("No default S3 storage configured")
+            
+            params = ReportFilter.model_validate(db_export_task.params or {}).model_dump()
+            s3_key = await build_report_export(
+                db=db,
+                storage=storage,
+                report_type=db_export_task.report_type,
+                params=params,
+                cache_key=db_export_task.cache_key,
+                export_format=(db_export_task.params or {}).get("format", "xlsx")
+            )
+            
+            db_export_task.status = ExportTaskStatus.COMPLETED
+            db_export_task.file_path = s3_key
+            db_export_task.completed_at = datetime.now(timezone.utc)
+            await db.commit()
+            
+            return {"status": "completed", "file_path": s3_key}
+            
+        except Exception as e:
+            await db.rollback()
+            db_export_task.status = ExportTaskStatus.FAILED
+            db_export_task.error_message = str(e)[:1000]
+            db_export_task.completed_at = datetime.now(timezone.utc)
+            await db.commit()
+            return {"error": str(e)}
+
+
+@celery_app.task
+async def refresh_dashboard_rollups(full: bool = False):
+    """
+    Обновляет свертки статистики дашборда по предприятиям.
+    Выполняется каждую минуту через Celery Beat.
+    """
+    async with async_session_maker() as db:
+        refreshed = await crud_dashboard.refresh_dashboard_rollups(db, full=full)
+        return {"refreshed": refreshed}
+
+
+@celery_app.task
+async def reconcile_findings_summary():
+    """
+    Сверяет куб findings_summary с таблицей несоответствий и исправляет расхождения.
+    Выполняется раз в сутки через Celery Beat.
+    """
+    async with async_session_maker() as db:
+        return await crud_findings_summary.reconcile_findings_summary(db)
+
+
+@celery_app.task
+async def maintain_partitions():
+    """
+    Создает партиции журналов на следующие месяцы и архивирует в S3
+    партиции старше срока хранения.
+    Выполняется раз в сутки через Celery Beat.
+    """
+    return await partitions.maintain_partitions()
+
+
+@celery_app.task
+async def write_change_history_batch(changes: List[dict]):
+    """
+    Записывает пакет истории изменений, переданный ChangeHistoryBatch в отложенном режиме.
+    """
+    rows = [
+        {
+            **change,
+            "id": UUID(change["id"]),
+            "entity_id": UUID(change["entity_id"]),
+            "user_id": UUID(change["user_id"]),
+            "changed_at": datetime.fromisoformat(change["changed_at"])
+        }
+        for change in changes
+    ]
+    async with async_session_maker() as db:
+        written = await crud_change_history.create_change_history_bulk(db, rows)
+        await db.commit()
+        return {"written": written}
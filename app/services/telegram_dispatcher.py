@@ -0,0 +1,328 @@
+"""
+Отправка сообщений Telegram с учетом лимитов Bot API.
+
+Лимиты соблюдаются двумя уровнями token bucket: общий на бота
+(TELEGRAM_GLOBAL_RATE_PER_SECOND) и отдельный на каждый chat_id
+(TELEGRAM_CHAT_RATE_PER_SECOND, для групп - TELEGRAM_GROUP_RATE_PER_MINUTE).
+Отправки выполняются параллельно, пока это позволяют лимиты. Ответ 429
+с retry_after блокирует корзины чата и бота на указанное время, после чего
+отправка повторяется.
+
+При TELEGRAM_SHARED_RATE_LIMIT корзины хранятся в Redis и общие для всех
+процессов и задач Celery (каждая задача выполняется в своем event loop, и
+локальные корзины у нее были бы свои). Если Redis недоступен, используются
+локальные корзины процесса.
+"""
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+from telegram import Bot
+from telegram.error import RetryAfter, TelegramError
+from telegram.request import HTTPXRequest
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+RATE_WINDOW_SECONDS = 60.0
+IDLE_BUCKET_SECONDS = 60.0
+MAX_IDLE_BUCKETS = 10000
+SHARED_LIMIT_RETRY_SECONDS = 30.0
+
+# KEYS - корзины (чат, бот); ARGV - ttl ключей, затем rate и capacity каждой корзины.
+# Токен списывается из всех корзин сразу либо ни из одной; возвращается время ожидания.
+SHARED_ACQUIRE_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local ttl = tonumber(ARGV[1])
+local wait = 0
+local tokens = {}
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[i * 2])
+    local capacity = tonumber(ARGV[i * 2 + 1])
+    local state = redis.call('HMGET', key, 'tokens', 'updated', 'blocked_until')
+    local value = tonumber(state[1]) or capacity
+    local updated = tonumber(state[2]) or now
+    local blocked_until = tonumber(state[3]) or 0
+    value = math.min(capacity, value + math.max(0, now - updated) * rate)
+    tokens[i] = value
+    if blocked_until > now then
+        wait = math.max(wait, blocked_until - now)
+    elseif value < 1 then
+        wait = math.max(wait, (1 - value) / rate)
+    end
+end
+if wait > 0 then
+    return tostring(wait)
+end
+for i, key in ipairs(KEYS) do
+    redis.call('HSET', key, 'tokens', tokens[i] - 1, 'updated', now)
+    redis.call('EXPIRE', key, ttl)
+end
+return '0'
+"""
+
+# KEYS - корзины; ARGV - ttl ключей и длительность блокировки в секундах.
+SHARED_BLOCK_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local blocked_until = now + tonumber(ARGV[2])
+for _, key in ipairs(KEYS) do
+    blocked_until = math.max(blocked_until, tonumber(redis.call('HGET', key, 'blocked_until')) or 0)
+    redis.call('HSET', key, 'tokens', 0, 'updated', blocked_until, 'blocked_until', blocked_until)
+    redis.call('EXPIRE', key, tonumber(ARGV[1]))
+end
+return tostring(blocked_until - now)
+"""
+
+
+class TokenBucket:
+    """Token bucket: rate токенов в секунду, не более capacity накопленных."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def block(self, seconds: float) -> None:
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0
+        self.updated = time.monotonic()
+
+    def is_idle(self, now: float) -> bool:
+        return not self.lock.locked() and now - self.updated > IDLE_BUCKET_SECONDS
+
+
+class TelegramDispatcher:
+    """
+    Параллельная отправка сообщений Telegram с ограничением скорости.
+
+    Bot и клиент Redis создаются при первой отправке в текущем event loop
+    и пересоздаются при смене loop (например, между задачами Celery);
+    состояние общих корзин в Redis при этом сохраняется. Владелец loop
+    вызывает close() до его завершения, иначе соединения бота и Redis
+    останутся открытыми.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        base_url: Optional[str] = None,
+        global_rate: Optional[float] = None,
+        chat_rate: Optional[float] = None,
+        group_rate_per_minute: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        connection_pool_size: Optional[int] = None,
+        shared_limits: Optional[bool] = None
+    ):
+        self.token = token if token is not None else settings.TELEGRAM_BOT_TOKEN
+        self.base_url = base_url or settings.TELEGRAM_API_BASE_URL
+        self.chat_rate = chat_rate or settings.TELEGRAM_CHAT_RATE_PER_SECOND
+        self.group_rate = (group_rate_per_minute or settings.TELEGRAM_GROUP_RATE_PER_MINUTE) / 60
+        self.max_retries = max_retries if max_retries is not None else settings.TELEGRAM_MAX_RETRIES
+        self.connection_pool_size = connection_pool_size or settings.NOTIFICATION_TELEGRAM_CONCURRENCY
+        self.global_bucket = TokenBucket(global_rate or settings.TELEGRAM_GLOBAL_RATE_PER_SECOND)
+        self.chat_buckets: Dict[int, TokenBucket] = {}
+        self.shared_limits = settings.TELEGRAM_SHARED_RATE_LIMIT if shared_limits is None else shared_limits
+        self.redis_client = None
+        self.acquire_script = None
+        self.block_script = None
+        self.shared_retry_at = 0.0
+        self.bot: Optional[Bot] = None
+        self.bot_lock: Optional[asyncio.Lock] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.waiting = 0
+        self.in_flight = 0
+        self.sent = 0
+        self.failed = 0
+        self.rate_limited = 0
+        self.shared_limit_errors = 0
+        self.sent_times: Deque[float] = deque()
+
+    async def _get_bot(self) -> Bot:
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            self.loop = loop
+            self.bot = None
+            self.redis_client = None
+            self.bot_lock = asyncio.Lock()
+            self.global_bucket = TokenBucket(self.global_bucket.rate, self.global_bucket.capacity)
+            self.chat_buckets = {}
+
+        async with self.bot_lock:
+            if self.bot is None:
+                bot = Bot(
+                    token=self.token,
+                    base_url=self.base_url,
+                    request=HTTPXRequest(connection_pool_size=self.connection_pool_size)
+                )
+                await bot.initialize()
+                self.bot = bot
+        return self.bot
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self.chat_buckets) >= MAX_IDLE_BUCKETS:
+                now = time.monotonic()
+                self.chat_buckets = {
+                    key: value for key, value in self.chat_buckets.items() if not value.is_idle(now)
+                }
+            rate = self.group_rate if chat_id < 0 else self.chat_rate
+            bucket = self.chat_buckets[chat_id] = TokenBucket(rate, capacity=1)
+        return bucket
+
+    async def get_redis(self):
+        if self.redis_client is None:
+            self.redis_client = await redis.from_url(settings.REDIS_URL)
+            self.acquire_script = self.redis_client.register_script(SHARED_ACQUIRE_SCRIPT)
+            self.block_script = self.redis_client.register_script(SHARED_BLOCK_SCRIPT)
+        return self.redis_client
+
+    def _shared_buckets(self, chat_id: int) -> Tuple[List[str], List[float]]:
+        prefix = f"telegram_rate:{self.token.split(':', 1)[0]}"
+        chat_rate = self.group_rate if chat_id < 0 else self.chat_rate
+        keys = [f"{prefix}:chat:{chat_id}", f"{prefix}:global"]
+        rates = [chat_rate, 1.0, self.global_bucket.rate, self.global_bucket.capacity]
+        return keys, rates
+
+    def _use_shared_limits(self) -> bool:
+        return self.shared_limits and time.monotonic() >= self.shared_retry_at
+
+    def _shared_limit_failed(self, message: str, error: Exception) -> None:
+        self.shared_limit_errors += 1
+        self.shared_retry_at = time.monotonic() + SHARED_LIMIT_RETRY_SECONDS
+        logger.warning("%s, using local buckets for %ss: %s", message, SHARED_LIMIT_RETRY_SECONDS, error)
+
+    async def _acquire(self, chat_id: int, chat_bucket: TokenBucket) -> None:
+        if self._use_shared_limits():
+            try:
+                await self.get_redis()
+                keys, rates = self._shared_buckets(chat_id)
+                while True:
+                    wait = float(await self.acquire_script(keys=keys, args=[IDLE_BUCKET_SECONDS, *rates]))
+                    if wait <= 0:
+                        return
+                    await asyncio.sleep(wait)
+            except (RedisError, OSError) as e:
+                self._shared_limit_failed("Shared Telegram rate limit unavailable", e)
+
+        await chat_bucket.acquire()
+        await self.global_bucket.acquire()
+
+    async def _block(self, chat_id: int, chat_bucket: TokenBucket, seconds: float) -> None:
+        chat_bucket.block(seconds)
+        self.global_bucket.block(seconds)
+        if self._use_shared_limits():
+            try:
+                await self.get_redis()
+                keys, _ = self._shared_buckets(chat_id)
+                await self.block_script(keys=keys, args=[math.ceil(seconds + IDLE_BUCKET_SECONDS), seconds])
+            except (RedisError, OSError) as e:
+                self._shared_limit_failed("Failed to store Telegram rate limit block in Redis", e)
+
+    async def send(self, chat_id: int, text: str) -> bool:
+        """
+        Отправить сообщение, дождавшись разрешения лимитов.
+
+        Args:
+            chat_id: ID чата Telegram
+            text: Текст сообщения
+
+        Returns:
+            True если сообщение отправлено
+        """
+        if not self.token:
+            return False
+
+        bot = await self._get_bot()
+        chat_bucket = self._chat_bucket(chat_id)
+
+        for _ in range(self.max_retries + 1):
+            self.waiting += 1
+            try:
+                await self._acquire(chat_id, chat_bucket)
+            finally:
+                self.waiting -= 1
+
+            self.in_flight += 1
+            try:
+                await bot.send_message(chat_id=chat_id, text=text)
+                self.sent += 1
+                self.sent_times.append(time.monotonic())
+                self._prune_sent_times()
+                return True
+            except RetryAfter as e:
+                self.rate_limited += 1
+                retry_after = e.retry_after.total_seconds() if hasattr(e.retry_after, "total_seconds") else float(e.retry_after)
+                logger.info("Telegram rate limit for chat %s, retry after %ss", chat_id, retry_after)
+                await self._block(chat_id, chat_bucket, retry_after)
+            except TelegramError as e:
+                logger.warning("Failed to send Telegram message to %s: %s", chat_id, e)
+                break
+            finally:
+                self.in_flight -= 1
+
+        self.failed += 1
+        return False
+
+    async def close(self) -> None:
+        """Закрыть HTTP-соединения бота и клиент Redis, созданные в текущем event loop."""
+        if self.loop is asyncio.get_running_loop():
+            if self.bot is not None:
+                await self.bot.shutdown()
+            if self.redis_client is not None:
+                await self.redis_client.aclose()
+        self.bot = None
+        self.redis_client = None
+        self.loop = None
+
+    def _prune_sent_times(self) -> None:
+        now = time.monotonic()
+        while self.sent_times and now - self.sent_times[0] > RATE_WINDOW_SECONDS:
+            self.sent_times.popleft()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Состояние диспетчера: ожидающие лимитов и выполняемые отправки,
+        счетчики и фактическая скорость за последнюю минуту.
+        """
+        self._prune_sent_times()
+        now = time.monotonic()
+        window = min(RATE_WINDOW_SECONDS, now - self.sent_times[0]) if self.sent_times else 0
+        return {
+            "queue_depth": self.waiting,
+            "in_flight": self.in_flight,
+            "sent": self.sent,
+            "failed": self.failed,
+            "rate_limited": self.rate_limited,
+            "shared_limit_errors": self.shared_limit_errors,
+            "rate_per_second": len(self.sent_times) / max(window, 1.0),
+            "chats": len(self.chat_buckets)
+        }
+
+
+telegram_dispatcher = TelegramDispatcher()
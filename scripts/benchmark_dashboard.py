@@ -0,0 +1,56 @@
+"""
+Бенчмарк статистики дашборда.
+
+Сравнивает p50/p99 латентность живого подсчета get_dashboard_stats и чтения
+из сверток dashboard_rollups. Данные готовятся scripts.seed_benchmark_data.
+
+Запуск:
+    python -m scripts.seed_benchmark_data --findings 1000000
+    python -m scripts.benchmark_dashboard --iterations 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from app.core.database import async_session_maker
+from app.crud import dashboard as crud_dashboard
+
+
+def percentile(values: list[float], q: int) -> float:
+    return statistics.quantiles(values, n=100)[q - 1]
+
+
+async def measure(func, iterations: int) -> list[float]:
+    timings = []
+    async with async_session_maker() as db:
+        await func(db)
+        for _ in range(iterations):
+            started = time.perf_counter()
+            await func(db)
+            timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def main(iterations: int) -> None:
+    async with async_session_maker() as db:
+        started = time.perf_counter()
+        refreshed = await crud_dashboard.refresh_dashboard_rollups(db, full=True)
+        print(f"full rollup refresh: {refreshed} enterprises in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+        started = time.perf_counter()
+        refreshed = await crud_dashboard.refresh_dashboard_rollups(db)
+        print(f"incremental rollup refresh: {refreshed} enterprises in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    for name, func in (
+        ("live", crud_dashboard.get_dashboard_stats),
+        ("rollup", crud_dashboard.get_dashboard_stats_from_rollup),
+    ):
+        timings = await measure(func, iterations)
+        print(f"{name:<7}p50={percentile(timings, 50):.3f}ms p99={percentile(timings, 99):.3f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
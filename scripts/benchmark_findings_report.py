@@ -0,0 +1,84 @@
+"""
+Бенчмарк страницы отчета по несоответствиям.
+
+Сравнивает p50/p99 латентность прежней схемы (COUNT(*) по подзапросу со всеми
+соединениями плюс отдельный запрос страницы), get_findings_report с
+count(*) OVER (), с оценкой количества и с переходом на глубокую страницу по
+offset и по курсору. Данные готовятся scripts.seed_benchmark_data.
+
+Запуск:
+    python -m scripts.seed_benchmark_data --findings 1000000
+    python -m scripts.benchmark_findings_report --iterations 20 --limit 100 --deep-skip 100000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from sqlalchemy import func, select
+from app.core.database import async_session_maker
+from app.crud import report as crud_report
+from app.crud.report import _filter_findings, _findings_report_select
+from app.models.finding import Finding
+
+
+def percentile(values: list[float], q: int) -> float:
+    return statistics.quantiles(values, n=100)[q - 1]
+
+
+async def legacy_page(db, limit: int, skip: int = 0):
+    stmt = _filter_findings(_findings_report_select())
+    total = (await db.execute(select(func.count()).select_from(stmt.subquery()))).scalar_one()
+    stmt = stmt.order_by(Finding.created_at.desc()).offset(skip).limit(limit)
+    return (await db.execute(stmt)).all(), total
+
+
+async def measure(func, iterations: int) -> list[float]:
+    timings = []
+    async with async_session_maker() as db:
+        await func(db)
+        for _ in range(iterations):
+            started = time.perf_counter()
+            await func(db)
+            timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def main(iterations: int, limit: int, deep_skip: int) -> None:
+    async with async_session_maker() as db:
+        _, total, _ = await crud_report.get_findings_report(db, limit=1)
+        _, estimated, _ = await crud_report.get_findings_report(db, limit=1, estimated_total=True)
+        print(f"findings: exact={total} estimated={estimated}")
+
+        started = time.perf_counter()
+        cursor = None
+        skipped = 0
+        while skipped < deep_skip:
+            data, _, cursor = await crud_report.get_findings_report(
+                db, limit=min(10000, deep_skip - skipped), cursor=cursor, estimated_total=True
+            )
+            skipped += len(data)
+            if not cursor:
+                break
+        print(f"cursor for offset {skipped} found in {time.perf_counter() - started:.1f}s")
+
+    cases = (
+        ("legacy", lambda db: legacy_page(db, limit)),
+        ("window", lambda db: crud_report.get_findings_report(db, limit=limit)),
+        ("estimated", lambda db: crud_report.get_findings_report(db, limit=limit, estimated_total=True)),
+        ("legacy-deep", lambda db: legacy_page(db, limit, skip=deep_skip)),
+        ("offset-deep", lambda db: crud_report.get_findings_report(db, limit=limit, skip=deep_skip)),
+        ("cursor-deep", lambda db: crud_report.get_findings_report(db, limit=limit, cursor=cursor)),
+        ("cursor-deep-est", lambda db: crud_report.get_findings_report(db, limit=limit, cursor=cursor, estimated_total=True)),
+    )
+    for name, case in cases:
+        timings = await measure(case, iterations)
+        print(f"{name:<16}p50={percentile(timings, 50):.1f}ms p99={percentile(timings, 99):.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--deep-skip", type=int, default=100000)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.limit, args.deep_skip))
@@ -0,0 +1,127 @@
+"""
+Бенчмарк очереди уведомлений.
+
+Ставит в очередь N уведомлений, распределенных между --users активными
+пользователями, обрабатывает очередь канала пулом воркеров с разной
+параллельностью и печатает число доставленных уведомлений и отправленных
+сообщений в секунду. Отправка заменяется задержкой --send-latency-ms, чтобы
+измерять накладные расходы очереди, а не внешний сервис. С --digest уведомления
+объединяются в сводки (окно считается истекшим), без него отправляются по одному.
+Созданные записи удаляются после каждого прогона.
+
+Запуск:
+    python -m scripts.benchmark_notification_outbox --notifications 5000 --concurrency 1 4 8
+    python -m scripts.benchmark_notification_outbox --notifications 5000 --users 20 --digest
+"""
+import argparse
+import asyncio
+import time
+from datetime import timedelta
+from sqlalchemy import select, delete, update, func
+from app.core.database import async_session_maker
+from app.crud import notification as crud_notification
+from app.models.notification import Notification
+from app.models.notification_queue import NotificationQueue
+from app.models.user import User
+from app.services.notification_outbox import process_outbox
+
+
+BENCHMARK_MARKER = "[benchmark]"
+
+
+class CountingSender:
+    def __init__(self, latency_ms: float):
+        self.latency_ms = latency_ms
+        self.messages = 0
+
+    async def __call__(self, db, notification, user) -> bool:
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        self.messages += 1
+        return True
+
+
+async def seed(user_ids: list, channel: str, count: int, digest: bool) -> None:
+    async with async_session_maker() as db:
+        await crud_notification.create_notifications_bulk(db=db, notifications=[
+            {
+                "user_id": user_ids[i % len(user_ids)],
+                "event_type": "benchmark",
+                "entity_type": "benchmark",
+                "entity_id": user_ids[i % len(user_ids)],
+                "title": f"{BENCHMARK_MARKER} {i}",
+                "message": BENCHMARK_MARKER,
+                "channels": [channel],
+                "priority": i % 3,
+                "notification_config": None if digest else {"digest": False}
+            }
+            for i in range(count)
+        ])
+        if digest:
+            notification_ids = select(Notification.id).where(Notification.title.like(f"{BENCHMARK_MARKER}%"))
+            await db.execute(
+                update(NotificationQueue)
+                .where(NotificationQueue.notification_id.in_(notification_ids))
+                .values(created_at=func.now() - timedelta(days=1))
+            )
+        await db.commit()
+
+
+async def cleanup() -> None:
+    async with async_session_maker() as db:
+        notification_ids = select(Notification.id).where(Notification.title.like(f"{BENCHMARK_MARKER}%"))
+        await db.execute(delete(NotificationQueue).where(NotificationQueue.notification_id.in_(notification_ids)))
+        await db.execute(delete(Notification).where(Notification.title.like(f"{BENCHMARK_MARKER}%")))
+        await db.commit()
+
+
+async def main(
+    count: int,
+    channel: str,
+    users: int,
+    digest: bool,
+    concurrency_levels: list[int],
+    batch_size: int,
+    latency_ms: float
+) -> None:
+    async with async_session_maker() as db:
+        result = await db.execute(select(User.id).where(User.is_active == True).limit(users))
+        user_ids = list(result.scalars().all())
+
+    try:
+        for concurrency in concurrency_levels:
+            await seed(user_ids, channel, count, digest)
+            sender = CountingSender(latency_ms)
+            started = time.perf_counter()
+            result = await process_outbox(channel=channel, concurrency=concurrency, batch_size=batch_size, sender=sender)
+            elapsed = time.perf_counter() - started
+            delivered = count - result["failed"] - result["dead"] - result["skipped"] - result["held"]
+            print(
+                f"concurrency={concurrency:<3} delivered={delivered} messages={sender.messages} "
+                f"failed={result['failed']} elapsed={elapsed:.2f}s "
+                f"rate={delivered / elapsed:.1f}/s messages_rate={sender.messages / elapsed:.1f}/s"
+            )
+            await cleanup()
+    finally:
+        await cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--notifications", type=int, default=5000)
+    parser.add_argument("--channel", choices=["email", "telegram"], default="email")
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--digest", action="store_true")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--send-latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    asyncio.run(main(
+        args.notifications,
+        args.channel,
+        args.users,
+        args.digest,
+        args.concurrency,
+        args.batch_size,
+        args.send_latency_ms
+    ))
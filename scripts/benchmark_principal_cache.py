@@ -0,0 +1,99 @@
+"""
+Бенчмарк кэша пользователей get_current_user.
+
+Сравнивает p50/p99 латентность аутентифицированного no-op эндпоинта
+с включенным и выключенным principal_cache. Требует доступные PostgreSQL и Redis
+из настроек (.env).
+
+Запуск:
+    python -m scripts.benchmark_principal_cache --requests 2000
+"""
+import argparse
+import asyncio
+import secrets
+import statistics
+import time
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from app.api.auth import get_current_user
+from app.core.database import async_session_maker
+from app.core.security import create_access_token
+from app.models.user import User
+from app.services.principal_cache import principal_cache
+
+
+bench_app = FastAPI()
+
+
+@bench_app.get("/noop")
+async def noop(current_user: User = Depends(get_current_user)):
+    return {"ok": True}
+
+
+async def create_bench_user() -> User:
+    suffix = secrets.token_hex(4)
+    async with async_session_maker() as db:
+        user = User(
+            email=f"bench_{suffix}@example.com",
+            username=f"bench_{suffix}",
+            first_name_ru="Бенч",
+            last_name_ru="Бенчев",
+            first_name_en="Bench",
+            last_name_en="Benchev",
+            session_id=secrets.token_urlsafe(32),
+            is_active=True
+        )
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
+        return user
+
+
+async def delete_bench_user(user: User) -> None:
+    async with async_session_maker() as db:
+        db_user = await db.get(User, user.id)
+        if db_user:
+            await db.delete(db_user)
+            await db.commit()
+    await principal_cache.invalidate(user.id)
+
+
+async def run(client: AsyncClient, headers: dict, requests: int) -> list[float]:
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get("/noop", headers=headers)
+        timings.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+    return timings
+
+
+def percentile(values: list[float], q: int) -> float:
+    return statistics.quantiles(values, n=100)[q - 1]
+
+
+async def main(requests: int) -> None:
+    user = await create_bench_user()
+    token = create_access_token({"sub": str(user.id), "session_id": user.session_id})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    try:
+        async with AsyncClient(transport=ASGITransport(app=bench_app), base_url="http://bench") as client:
+            for enabled in (False, True):
+                principal_cache.enabled = enabled
+                await run(client, headers, min(100, requests))
+                timings = await run(client, headers, requests)
+                print(
+                    f"cache={'on ' if enabled else 'off'} "
+                    f"p50={percentile(timings, 50):.3f}ms p99={percentile(timings, 99):.3f}ms"
+                )
+        print(f"stats: {principal_cache.stats()}")
+    finally:
+        await delete_bench_user(user)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,110 @@
+"""
+Бенчмарк выгрузки отчета по несоответствиям.
+
+Сравнивает прежний способ (Workbook в памяти со стилем на каждой ячейке
+и сохранением в BytesIO) и потоковую запись report_export во всех форматах
+(xlsx, csv, jsonl, parquet) на синтетических строках отчета. Каждый прогон
+выполняется в отдельном процессе, печатаются время, пиковый RSS процесса
+(ru_maxrss) и размер файла. Прежний способ запускается только до
+--legacy-max-rows строк.
+
+Запуск:
+    python -m scripts.benchmark_report_export --rows 10000 100000 1000000
+    python -m scripts.benchmark_report_export --rows 100000 --chunk-size 5000 --legacy-max-rows 0
+    python -m scripts.benchmark_report_export --rows 1000000 --modes csv jsonl parquet
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import resource
+import time
+from datetime import date, timedelta
+from io import BytesIO
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Font, PatternFill
+from app.services.report_export import FINDINGS_REPORT, REPORT_FORMATS
+
+
+def make_row(i: int) -> dict:
+    return {
+        "finding_number": i,
+        "audit_number": f"AUD-{i // 100:06d}",
+        "audit_title": f"Аудит процесса {i // 100}",
+        "title": f"Несоответствие {i}: нарушение требований процедуры",
+        "finding_type": ("CAR1", "CAR2", "OFI")[i % 3],
+        "process_name": f"Процесс {i % 40}",
+        "status_name": "Открыто" if i % 4 else "Закрыто",
+        "resolver_name": f"Исполнитель {i % 500}",
+        "approver_name": f"Утверждающий {i % 50}" if i % 2 else None,
+        "deadline": date(2026, 1, 1) + timedelta(days=i % 365),
+        "closing_date": None if i % 4 else date(2026, 6, 1),
+        "created_at": date(2025, 1, 1) + timedelta(days=i % 365)
+    }
+
+
+async def synthetic_chunks(count: int, chunk_size: int):
+    for start in range(0, count, chunk_size):
+        yield [make_row(i) for i in range(start, min(start + chunk_size, count))]
+
+
+def legacy_export(count: int) -> int:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(FINDINGS_REPORT.headers)
+    for cell in ws[1]:
+        cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        cell.font = Font(bold=True, color="FFFFFF")
+        cell.alignment = Alignment(horizontal="center", vertical="center")
+    for i in range(count):
+        ws.append(FINDINGS_REPORT.values(make_row(i)))
+    for row in ws.iter_rows(min_row=2):
+        for cell in row:
+            cell.alignment = Alignment(horizontal="left", vertical="center", wrap_text=True)
+    output = BytesIO()
+    wb.save(output)
+    return len(output.getvalue())
+
+
+def streaming_export(export_format: str, count: int, chunk_size: int) -> int:
+    write = REPORT_FORMATS[export_format].write
+    path = asyncio.run(write(FINDINGS_REPORT, synthetic_chunks(count, chunk_size)))
+    try:
+        return os.path.getsize(path)
+    finally:
+        os.remove(path)
+
+
+def run(mode: str, count: int, chunk_size: int, results: multiprocessing.Queue) -> None:
+    started = time.perf_counter()
+    size = legacy_export(count) if mode == "legacy" else streaming_export(mode, count, chunk_size)
+    elapsed = time.perf_counter() - started
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    results.put((elapsed, peak_mb, size))
+
+
+def main(row_counts: list[int], modes: list[str], chunk_size: int, legacy_max_rows: int) -> None:
+    context = multiprocessing.get_context("spawn")
+    for count in row_counts:
+        for mode in modes:
+            if mode == "legacy" and count > legacy_max_rows:
+                continue
+            results = context.Queue()
+            process = context.Process(target=run, args=(mode, count, chunk_size, results))
+            process.start()
+            elapsed, peak_mb, size = results.get()
+            process.join()
+            print(
+                f"rows={count:<8} mode={mode:<10} elapsed={elapsed:.1f}s "
+                f"peak_rss={peak_mb:.0f}MB file={size / 1024 / 1024:.1f}MB rate={count / elapsed:.0f} rows/s"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--modes", nargs="+", choices=["legacy", *REPORT_FORMATS], default=["legacy", *REPORT_FORMATS])
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--legacy-max-rows", type=int, default=100000)
+    args = parser.parse_args()
+    main(args.rows, args.modes, args.chunk_size, args.legacy_max_rows)
@@ -0,0 +1,109 @@
+"""
+Бенчмарк отправки email через пул SMTP-соединений.
+
+Поднимает локальный SMTP-сервер aiosmtpd (с AUTH без TLS) и сравнивает
+пропускную способность отправки с новым соединением на каждое письмо
+(как работал send_email через FastMail) и через SMTPConnectionPool.
+
+Запуск:
+    pip install aiosmtpd
+    python -m scripts.benchmark_smtp_pool --messages 500 --concurrency 8
+"""
+import argparse
+import asyncio
+import socket
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+import aiosmtplib
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+from app.core.security import encrypt_value
+from app.models.email_account import EmailAccount
+from app.services.smtp_pool import SMTPConnectionPool, build_message
+
+
+class CountingHandler:
+    def __init__(self):
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return "250 OK"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def accept_all(server, session, envelope, mechanism, auth_data):
+    return AuthResult(success=True)
+
+
+async def send_per_message(account: EmailAccount, password: str, messages, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(message):
+        async with semaphore:
+            await aiosmtplib.send(
+                message,
+                hostname=account.smtp_host,
+                port=account.smtp_port,
+                username=account.smtp_user,
+                password=password,
+                start_tls=False
+            )
+
+    await asyncio.gather(*(send(message) for message in messages))
+
+
+async def send_pooled(account: EmailAccount, messages, concurrency: int) -> None:
+    pool = SMTPConnectionPool(account, size=concurrency)
+    await asyncio.gather(*(pool.send_messages([message]) for message in messages))
+    await pool.close()
+
+
+async def main(count: int, concurrency: int) -> None:
+    handler = CountingHandler()
+    port = free_port()
+    controller = Controller(handler, hostname="127.0.0.1", port=port, authenticator=accept_all, auth_require_tls=False)
+    controller.start()
+    try:
+        account = EmailAccount(
+            id=uuid4(),
+            name="benchmark",
+            from_name="Benchmark",
+            from_email="benchmark@example.com",
+            smtp_host="127.0.0.1",
+            smtp_port=port,
+            smtp_user="benchmark",
+            smtp_password=encrypt_value("benchmark"),
+            use_tls=False,
+            updated_at=datetime.now(timezone.utc)
+        )
+        messages = [
+            build_message(account, [f"user{i}@example.com"], f"Уведомление {i}", "Текст уведомления")
+            for i in range(count)
+        ]
+
+        for name, run in (
+            ("per-message", lambda: send_per_message(account, "benchmark", messages, concurrency)),
+            ("pooled", lambda: send_pooled(account, messages, concurrency)),
+        ):
+            received = handler.received
+            started = time.perf_counter()
+            await run()
+            elapsed = time.perf_counter() - started
+            print(f"{name:<12}sent={handler.received - received} elapsed={elapsed:.2f}s rate={count / elapsed:.1f}/s")
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.messages, args.concurrency))
@@ -10,6 +10,28 @@ async def init_db():
     print("База данных инициализирована")
 
 
-if __name__ == "__main__":
-    asyncio.run(init_db())
+async def sync_finding_number_sequence():
+    """
+    Создает последовательность номеров несоответствий и сдвигает ее за max(finding_number).
+
+    Нужно один раз для баз, где номера выдавались через max(finding_number) + 1.
+    """
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE SEQUENCE IF NOT EXISTS findings_finding_number_seq"))
+        findings_exists = (await conn.execute(text("SELECT to_regclass('findings') IS NOT NULL"))).scalar()
+        if findings_exists:
+            await conn.execute(text(
+                "SELECT setval('findings_finding_number_seq', "
+                "greatest((SELECT coalesce(max(finding_number), 0) FROM findings) + 1, "
+                "nextval('findings_finding_number_seq')), false)"
+            ))
+    print("Последовательность номеров несоответствий синхронизирована")
+
 
+async def main():
+    await init_db()
+    await sync_finding_number_sequence()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
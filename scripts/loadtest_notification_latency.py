@@ -0,0 +1,186 @@
+"""
+Нагрузочный тест: латентность создания несоответствия при медленном SMTP.
+
+Поднимает локальный фейковый SMTP-сервер с задержкой ответа на DATA, отправляет
+POST /api/v1/findings/ через ASGI-транспорт и параллельно доставляет очередь email
+воркерами outbox в этом же процессе. Для каждой задержки SMTP печатает p50/p99
+латентности API и скорость доставки: латентность API не должна зависеть от SMTP.
+
+Несоответствия создаются копированием первого несоответствия в БД (с пометкой
+[benchmark] в заголовке) от имени его автора и удаляются после прогона.
+
+Запуск:
+    python -m scripts.loadtest_notification_latency --requests 200 --smtp-delays-ms 0 500 2000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import httpx
+from sqlalchemy import select, delete
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.dependencies import get_current_user
+from app.core.security import encrypt_value
+from app.main import app
+from app.models.email_account import EmailAccount
+from app.models.finding import Finding
+from app.models.notification import Notification
+from app.models.notification_queue import NotificationQueue
+from app.models.user import User
+from app.services import notification_service
+from app.services.notification_outbox import process_outbox
+
+
+BENCHMARK_MARKER = "[benchmark]"
+
+
+class FakeSMTPServer:
+    """Минимальный SMTP-сервер: принимает любые письма, отвечая на DATA с задержкой."""
+
+    def __init__(self, delay_seconds: float):
+        self.delay_seconds = delay_seconds
+        self.received = 0
+        self.server = None
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writer.write(b"220 fake-smtp ready\r\n")
+        while line := await reader.readline():
+            command = line.decode(errors="ignore").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                writer.write(b"250-fake-smtp\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n")
+            elif command.startswith("AUTH"):
+                writer.write(b"235 2.7.0 Authentication successful\r\n")
+            elif command.startswith("DATA"):
+                writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                await writer.drain()
+                while (await reader.readline()) not in (b".\r\n", b""):
+                    pass
+                await asyncio.sleep(self.delay_seconds)
+                self.received += 1
+                writer.write(b"250 OK\r\n")
+            elif command.startswith("QUIT"):
+                writer.write(b"221 Bye\r\n")
+                await writer.drain()
+                break
+            else:
+                writer.write(b"250 OK\r\n")
+            await writer.drain()
+        writer.close()
+
+
+def percentile(values: list[float], q: int) -> float:
+    return statistics.quantiles(values, n=100)[q - 1]
+
+
+async def cleanup() -> None:
+    async with async_session_maker() as db:
+        finding_ids = select(Finding.id).where(Finding.title.like(f"{BENCHMARK_MARKER}%"))
+        notification_ids = select(Notification.id).where(Notification.entity_id.in_(finding_ids))
+        await db.execute(delete(NotificationQueue).where(NotificationQueue.notification_id.in_(notification_ids)))
+        await db.execute(delete(Notification).where(Notification.entity_id.in_(finding_ids)))
+        await db.execute(delete(Finding).where(Finding.title.like(f"{BENCHMARK_MARKER}%")))
+        await db.commit()
+
+
+async def deliver_until(stop: asyncio.Event) -> int:
+    sent = 0
+    while not stop.is_set():
+        result = await process_outbox(channel="email")
+        sent += result["sent"]
+        await asyncio.sleep(0.05)
+    return sent + (await process_outbox(channel="email"))["sent"]
+
+
+async def run(requests: int, concurrency: int, smtp_delay_ms: float, template: Finding) -> None:
+    smtp = FakeSMTPServer(smtp_delay_ms / 1000)
+    port = await smtp.start()
+    account = EmailAccount(
+        name="loadtest",
+        from_name="Load test",
+        from_email="loadtest@example.com",
+        smtp_host="127.0.0.1",
+        smtp_port=port,
+        smtp_user="loadtest",
+        smtp_password=encrypt_value("loadtest"),
+        use_tls=False
+    )
+
+    async def fake_account(db):
+        return account
+
+    notification_service.get_default_email_account = fake_account
+
+    payload = {
+        "audit_id": str(template.audit_id),
+        "enterprise_id": str(template.enterprise_id),
+        "description": BENCHMARK_MARKER,
+        "process_id": str(template.process_id),
+        "status_id": str(template.status_id),
+        "finding_type": "OFI",
+        "resolver_id": str(template.resolver_id),
+        "deadline": template.deadline.isoformat(),
+        "created_by_id": str(template.created_by_id)
+    }
+
+    timings = []
+    semaphore = asyncio.Semaphore(concurrency)
+    stop = asyncio.Event()
+    delivery = asyncio.create_task(deliver_until(stop))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest") as client:
+        async def create(index: int) -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post("/api/v1/findings/", json={**payload, "title": f"{BENCHMARK_MARKER} {index}"})
+                timings.append((time.perf_counter() - started) * 1000)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(create(i) for i in range(requests)))
+        api_elapsed = time.perf_counter() - started
+
+    stop.set()
+    sent = await delivery
+    delivery_elapsed = time.perf_counter() - started
+    await smtp.stop()
+
+    print(
+        f"smtp_delay={smtp_delay_ms:>6.0f}ms api p50={percentile(timings, 50):.1f}ms p99={percentile(timings, 99):.1f}ms "
+        f"api_rps={requests / api_elapsed:.1f} delivered={sent}/{smtp.received} in {delivery_elapsed:.1f}s"
+    )
+
+
+async def main(requests: int, concurrency: int, smtp_delays_ms: list[float]) -> None:
+    settings.NOTIFICATION_IMMEDIATE_DELIVERY = False
+
+    async with async_session_maker() as db:
+        result = await db.execute(select(Finding).where(Finding.deleted_at.is_(None)).order_by(Finding.created_at).limit(1))
+        template = result.scalar_one()
+        creator = await db.get(User, template.created_by_id)
+
+    app.dependency_overrides[get_current_user] = lambda: creator
+    try:
+        for smtp_delay_ms in smtp_delays_ms:
+            await run(requests, concurrency, smtp_delay_ms, template)
+            await cleanup()
+    finally:
+        app.dependency_overrides.clear()
+        await cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--smtp-delays-ms", type=float, nargs="+", default=[0, 500, 2000])
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.smtp_delays_ms))
@@ -0,0 +1,107 @@
+"""
+Перевод существующих таблиц журналов на помесячное партиционирование.
+
+Для каждой таблицы из services.partitions.PARTITIONED_TABLES, которая еще не
+партиционирована: удаляются внешние ключи, ссылающиеся на нее (на партиционированную
+таблицу с составным первичным ключом ссылаться нельзя), таблица переименовывается
+в <таблица>_legacy, по модели создается партиционированная таблица с индексами,
+создаются партиции с месяца самой старой записи до PARTITION_PREMAKE_MONTHS
+вперед, данные копируются и старая таблица удаляется. Каждая таблица
+переводится в отдельной транзакции под ACCESS EXCLUSIVE блокировкой, поэтому
+запускать скрипт нужно в окно обслуживания. Для новой БД скрипт не нужен:
+таблицы создаются партиционированными миграцией, а партиции - при старте приложения.
+
+Запуск:
+    python -m scripts.partition_tables
+    python -m scripts.partition_tables --tables notifications notification_queue
+"""
+import argparse
+import asyncio
+from datetime import datetime, timezone
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from app.core.database import Base, engine
+from app.services.partitions import (
+    PARTITIONED_TABLES,
+    add_months,
+    create_month_partitions,
+    is_partitioned,
+    month_start
+)
+from app.core.config import settings
+import app.models  # noqa: F401
+
+
+async def drop_referencing_foreign_keys(conn: AsyncConnection, table: str) -> None:
+    result = await conn.execute(
+        text(
+            "SELECT conrelid::regclass::text, conname FROM pg_constraint "
+            "WHERE contype = 'f' AND confrelid = to_regclass(:table)"
+        ),
+        {"table": table}
+    )
+    for referencing_table, constraint in result.all():
+        await conn.execute(text(f'ALTER TABLE {referencing_table} DROP CONSTRAINT "{constraint}"'))
+        print(f"  dropped {referencing_table}.{constraint}")
+
+
+async def release_index_names(conn: AsyncConnection, legacy: str) -> None:
+    result = await conn.execute(
+        text("SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(:table) AND contype IN ('p', 'u')"),
+        {"table": legacy}
+    )
+    for constraint in result.scalars().all():
+        await conn.execute(text(f'ALTER TABLE "{legacy}" DROP CONSTRAINT "{constraint}"'))
+
+    result = await conn.execute(
+        text("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = :table"),
+        {"table": legacy}
+    )
+    for index in result.scalars().all():
+        await conn.execute(text(f'DROP INDEX "{index}"'))
+
+
+async def convert(table: str) -> None:
+    model_table = Base.metadata.tables[table]
+    key = model_table.dialect_options["postgresql"]["partition_by"].split("(")[1].rstrip(")").strip()
+    legacy = f"{table}_legacy"
+    columns = ", ".join(f'"{column.name}"' for column in model_table.columns)
+
+    async with engine.begin() as conn:
+        if await is_partitioned(conn, table):
+            print(f"{table}: already partitioned")
+            return
+
+        print(f"{table}: converting")
+        await conn.execute(text(f'LOCK TABLE "{table}" IN ACCESS EXCLUSIVE MODE'))
+        await drop_referencing_foreign_keys(conn, table)
+        await conn.execute(text(f'ALTER TABLE "{table}" RENAME TO "{legacy}"'))
+        await release_index_names(conn, legacy)
+        await conn.run_sync(lambda sync_conn: model_table.create(sync_conn))
+
+        oldest = (await conn.execute(text(f'SELECT min("{key}") FROM "{legacy}"'))).scalar_one()
+        current_month = month_start(datetime.now(timezone.utc).date())
+        first_month = month_start(oldest.astimezone(timezone.utc).date()) if oldest else current_month
+        created = await create_month_partitions(
+            conn, table, first_month, add_months(current_month, settings.PARTITION_PREMAKE_MONTHS)
+        )
+        print(f"  created {len(created)} partitions from {first_month:%Y-%m}")
+
+        result = await conn.execute(text(f'INSERT INTO "{table}" ({columns}) SELECT {columns} FROM "{legacy}"'))
+        print(f"  copied {result.rowcount} rows")
+        await conn.execute(text(f'DROP TABLE "{legacy}"'))
+
+
+async def main(tables: list[str]) -> None:
+    try:
+        for table in tables:
+            await convert(table)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tables", nargs="+", choices=list(PARTITIONED_TABLES), default=list(PARTITIONED_TABLES))
+    args = parser.parse_args()
+    asyncio.run(main(args.tables))
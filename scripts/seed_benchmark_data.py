@@ -0,0 +1,73 @@
+"""
+Наполнение БД несоответствиями для бенчмарков отчетов и дашборда.
+
+Копирует существующее несоответствие (шаблон) N раз одним INSERT ... SELECT
+через generate_series, распределяя статусы, сроки и даты создания.
+Требует хотя бы одно несоответствие в БД.
+
+Запуск:
+    python -m scripts.seed_benchmark_data --findings 1000000
+    python -m scripts.seed_benchmark_data --cleanup
+"""
+import argparse
+import asyncio
+import time
+from sqlalchemy import text
+from app.core.database import engine
+
+
+SEED_MARKER = "[benchmark]"
+
+SEED_SQL = text("""
+    INSERT INTO findings (
+        id, finding_number, audit_id, enterprise_id, title, description, process_id,
+        status_id, finding_type, resolver_id, approver_id, deadline, created_by_id,
+        created_at, updated_at
+    )
+    SELECT
+        gen_random_uuid(),
+        nextval('findings_finding_number_seq'),
+        t.audit_id,
+        t.enterprise_id,
+        :marker || ' ' || g,
+        t.description,
+        t.process_id,
+        (finding_statuses.ids)[1 + g % array_length(finding_statuses.ids, 1)],
+        t.finding_type,
+        t.resolver_id,
+        t.approver_id,
+        current_date + (g % 120 - 60),
+        t.created_by_id,
+        now() - (g % 730) * interval '1 day',
+        now() - (g % 730) * interval '1 day'
+    FROM generate_series(1, :count) AS g
+    CROSS JOIN (SELECT * FROM findings WHERE deleted_at IS NULL ORDER BY created_at LIMIT 1) AS t
+    CROSS JOIN (
+        SELECT array_agg(id) AS ids FROM statuses WHERE entity_type = 'finding' AND deleted_at IS NULL
+    ) AS finding_statuses
+""")
+
+CLEANUP_SQL = text("DELETE FROM findings WHERE title LIKE :marker || '%'")
+
+
+async def seed(count: int) -> None:
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        result = await conn.execute(SEED_SQL, {"marker": SEED_MARKER, "count": count})
+        await conn.execute(text("ANALYZE findings"))
+    print(f"inserted {result.rowcount} findings in {time.perf_counter() - started:.1f}s")
+
+
+async def cleanup() -> None:
+    async with engine.begin() as conn:
+        result = await conn.execute(CLEANUP_SQL, {"marker": SEED_MARKER})
+        await conn.execute(text("ANALYZE findings"))
+    print(f"deleted {result.rowcount} findings")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--findings", type=int, default=1_000_000)
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(cleanup() if args.cleanup else seed(args.findings))
@@ -23,3 +23,190 @@ async def test_get_findings_with_filters(client: AsyncClient, auth_headers):
     )
     assert response.status_code == 200
 
+
+
+async def _create_findings(db_session, test_user, count):
+    from datetime import date
+    from app.models.audit import Audit
+    from app.models.dictionary import Dictionary, DictionaryType
+    from app.models.enterprise import Enterprise
+    from app.models.finding import Finding
+    from app.models.status import Status
+
+    enterprise = Enterprise(name="Предприятие", code="ENT-QC")
+    dictionary_type = DictionaryType(name="Процессы", code="process-qc")
+    status = Status(name="Открыто", code="open", color="#FF0000", entity_type="finding", order=1)
+    db_session.add_all([enterprise, dictionary_type, status])
+    await db_session.flush()
+
+    process = Dictionary(dictionary_type_id=dictionary_type.id, name="Процесс", code="process-qc-1")
+    db_session.add(process)
+    await db_session.flush()
+
+    audit = Audit(
+        title="Аудит",
+        audit_number="A-QC-1",
+        subject="Тема",
+        enterprise_id=enterprise.id,
+        audit_type_id=process.id,
+        status_id=status.id,
+        auditor_id=test_user.id,
+        audit_date_from=date.today(),
+        audit_date_to=date.today(),
+        year=date.today().year,
+        audit_category="process_system",
+        created_by_id=test_user.id
+    )
+    db_session.add(audit)
+    await db_session.flush()
+
+    for number in range(1, count + 1):
+        db_session.add(Finding(
+            finding_number=number,
+            audit_id=audit.id,
+            enterprise_id=enterprise.id,
+            title=f"Несоответствие {number}",
+            description="Описание",
+            process_id=process.id,
+            status_id=status.id,
+            finding_type="CAR1",
+            resolver_id=test_user.id,
+            approver_id=test_user.id,
+            deadline=date.today(),
+            created_by_id=test_user.id
+        ))
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_get_findings_query_count(client: AsyncClient, db_session, test_user, query_counter):
+    await _create_findings(db_session, test_user, 10)
+    db_session.expunge_all()
+
+    with query_counter(max_queries=2):
+        response = await client.get("/api/v1/findings/?limit=10")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 10
+    assert data[0]["status"]["code"] == "open"
+    assert data[0]["resolver"]["id"] == str(test_user.id)
+    assert data[0]["creator"]["id"] == str(test_user.id)
+
+
+def _bulk_row(**overrides):
+    from datetime import date
+    from uuid import uuid4
+
+    row = {
+        "audit_id": str(uuid4()),
+        "enterprise_id": str(uuid4()),
+        "title": "Несоответствие",
+        "description": "Описание",
+        "process_id": str(uuid4()),
+        "status_id": str(uuid4()),
+        "finding_type": "OFI",
+        "resolver_id": str(uuid4()),
+        "deadline": date.today().isoformat()
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.mark.asyncio
+async def test_create_findings_bulk_reports_each_row(client: AsyncClient, auth_headers, test_user, monkeypatch):
+    from uuid import uuid4
+    from app.crud import finding as crud_finding
+
+    created_id = uuid4()
+    received = {}
+
+    async def fake_create_findings_bulk(db, findings):
+        received.update(findings)
+        return {0: (created_id, 101)}, {3: ["resolver_id: пользователь не найден"]}
+
+    monkeypatch.setattr(crud_finding, "create_findings_bulk", fake_create_findings_bulk)
+
+    rows = [
+        _bulk_row(),
+        _bulk_row(title=""),
+        _bulk_row(finding_type="CAR1"),
+        _bulk_row()
+    ]
+    response = await client.post("/api/v1/findings/bulk", json={"items": rows}, headers=auth_headers)
+
+    assert response.status_code == 201
+    assert set(received) == {0, 3}
+    assert all(finding.created_by_id == test_user.id for finding in received.values())
+
+    data = response.json()
+    assert data["created"] == 1
+    assert data["failed"] == 3
+    results = data["results"]
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert results[0] == {
+        "index": 0, "success": True, "id": str(created_id), "finding_number": 101, "errors": []
+    }
+    assert not results[1]["success"] and results[1]["errors"][0].startswith("title:")
+    assert not results[2]["success"] and "CAR1" in results[2]["errors"][0]
+    assert results[3]["success"] is False
+    assert results[3]["errors"] == ["resolver_id: пользователь не найден"]
+
+
+@pytest.mark.asyncio
+async def test_create_findings_bulk_rejects_oversized_batch(client: AsyncClient, auth_headers, monkeypatch):
+    from app.crud import finding as crud_finding
+    from app.schemas.finding import FINDINGS_BULK_MAX_ITEMS
+
+    async def fake_create_findings_bulk(db, findings):
+        raise AssertionError("crud must not be called")
+
+    monkeypatch.setattr(crud_finding, "create_findings_bulk", fake_create_findings_bulk)
+
+    rows = [_bulk_row()] * (FINDINGS_BULK_MAX_ITEMS + 1)
+    response = await client.post("/api/v1/findings/bulk", json={"items": rows}, headers=auth_headers)
+    assert response.status_code == 422
+
+    response = await client.post("/api/v1/findings/bulk", json={"items": []}, headers=auth_headers)
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_update_finding_commits_change_with_history(client: AsyncClient, db_session, test_user, auth_headers):
+    from sqlalchemy import select
+    from app.models.change_history import ChangeHistory
+    from app.models.finding import Finding
+
+    await _create_findings(db_session, test_user, 1)
+    finding = (await db_session.execute(select(Finding))).scalar_one()
+
+    response = await client.put(f"/api/v1/findings/{finding.id}", json={"title": "Новый заголовок"}, headers=auth_headers)
+
+    assert response.status_code == 200
+    history = (await db_session.execute(
+        select(ChangeHistory).where(ChangeHistory.entity_id == finding.id)
+    )).scalars().all()
+    assert [(change.field_name, change.new_value) for change in history] == [("title", "Новый заголовок")]
+
+
+@pytest.mark.asyncio
+async def test_update_finding_is_not_committed_without_history(
+    client: AsyncClient, db_session, test_user, auth_headers, monkeypatch
+):
+    from sqlalchemy import select
+    from app.models.finding import Finding
+    from app.services import change_history
+
+    async def failing_history(db, changes):
+        raise RuntimeError("history insert failed")
+
+    monkeypatch.setattr(change_history, "create_change_history_bulk", failing_history)
+    await _create_findings(db_session, test_user, 1)
+    finding_id = (await db_session.execute(select(Finding.id))).scalar_one()
+
+    with pytest.raises(RuntimeError):
+        await client.put(f"/api/v1/findings/{finding_id}", json={"title": "Новый заголовок"}, headers=auth_headers)
+
+    await db_session.rollback()
+    title = (await db_session.execute(select(Finding.title).where(Finding.id == finding_id))).scalar_one()
+    assert title == "Несоответствие 1"
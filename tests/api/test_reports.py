@@ -0,0 +1,124 @@
+from datetime import datetime, timezone
+
+import pytest
+from httpx import AsyncClient
+
+from app.models.export_task import ExportTask, ExportTaskStatus
+
+
+@pytest.fixture
+def queued_exports(monkeypatch):
+    from app.api import reports
+
+    queued = []
+    monkeypatch.setattr(reports.export_report_task, "delay", lambda task_id: queued.append(task_id))
+    return queued
+
+
+async def _other_user(db_session):
+    from app.models.user import User
+
+    user = User(
+        email="other@example.com",
+        username="otheruser",
+        first_name_ru="Другой",
+        last_name_ru="Пользователь",
+        first_name_en="Other",
+        last_name_en="User"
+    )
+    db_session.add(user)
+    await db_session.commit()
+    return user
+
+
+@pytest.mark.asyncio
+async def test_create_report_export_queues_task(client: AsyncClient, auth_headers, queued_exports):
+    response = await client.post(
+        "/api/v1/reports/exports",
+        json={"report_type": "findings", "format": "csv"},
+        headers=auth_headers
+    )
+
+    assert response.status_code == 202
+    data = response.json()
+    assert data["status"] == ExportTaskStatus.PENDING.value
+    assert data["params"]["format"] == "csv"
+    assert queued_exports == [data["id"]]
+
+
+@pytest.mark.asyncio
+async def test_create_report_export_reuses_cached_file(
+    client: AsyncClient, db_session, test_user, auth_headers, queued_exports
+):
+    from app.schemas.report import ReportExportCreate
+    from app.services.report_export import get_report_cache_key
+
+    export = ReportExportCreate(report_type="by_processes", format="xlsx")
+    cache_key, _ = await get_report_cache_key(db_session, export.report_type, export.model_dump(), export.format)
+    file_path = f"exports/reports/by_processes/{cache_key}.xlsx"
+    db_session.add(ExportTask(
+        user_id=test_user.id,
+        report_type="by_processes",
+        params={"format": "xlsx"},
+        cache_key=cache_key,
+        status=ExportTaskStatus.COMPLETED,
+        file_path=file_path,
+        completed_at=datetime.now(timezone.utc)
+    ))
+    await db_session.commit()
+
+    response = await client.post(
+        "/api/v1/reports/exports",
+        json={"report_type": "by_processes", "format": "xlsx"},
+        headers=auth_headers
+    )
+
+    assert response.status_code == 202
+    data = response.json()
+    assert data["status"] == ExportTaskStatus.COMPLETED.value
+    assert data["file_path"] == file_path
+    assert data["completed_at"] is not None
+    assert queued_exports == []
+
+
+@pytest.mark.asyncio
+async def test_report_export_of_other_user_is_forbidden(client: AsyncClient, db_session, auth_headers):
+    other = await _other_user(db_session)
+    export_task = ExportTask(
+        user_id=other.id,
+        report_type="findings",
+        params={"format": "xlsx"},
+        status=ExportTaskStatus.COMPLETED,
+        file_path="exports/reports/findings/other.xlsx",
+        completed_at=datetime.now(timezone.utc)
+    )
+    db_session.add(export_task)
+    await db_session.commit()
+
+    response = await client.get(f"/api/v1/reports/exports/{export_task.id}", headers=auth_headers)
+    assert response.status_code == 403
+
+    response = await client.get(f"/api/v1/reports/exports/{export_task.id}/download", headers=auth_headers)
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_download_of_unfinished_report_export_is_rejected(
+    client: AsyncClient, db_session, test_user, auth_headers
+):
+    export_task = ExportTask(
+        user_id=test_user.id,
+        report_type="findings",
+        params={"format": "xlsx"},
+        status=ExportTaskStatus.PROCESSING
+    )
+    db_session.add(export_task)
+    await db_session.commit()
+
+    response = await client.get(f"/api/v1/reports/exports/{export_task.id}", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["status"] == ExportTaskStatus.PROCESSING.value
+    assert response.json()["download_url"] is None
+
+    response = await client.get(f"/api/v1/reports/exports/{export_task.id}/download", headers=auth_headers)
+    assert response.status_code == 400
@@ -1,18 +1,20 @@
 import pytest
+from contextlib import contextmanager
 from typing import AsyncGenerator
-from httpx import AsyncClient
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.core.database import Base, get_session
+from app.core.database import Base, get_session, get_read_session
 from app.core.config import settings
 
 
 DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
 
-@pytest.fixture(scope="session")
+@pytest.fixture
 async def engine():
     engine = create_async_engine(
         DATABASE_URL,
@@ -41,8 +43,9 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         yield db_session
 
     app.dependency_overrides[get_session] = override_get_db
+    app.dependency_overrides[get_read_session] = override_get_db
 
-    async with AsyncClient(app=app, base_url="http://test") as client:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
         yield client
 
     app.dependency_overrides.clear()
@@ -56,7 +59,7 @@ async def test_user(db_session: AsyncSession):
     user = User(
         email="test@example.com",
         username="testuser",
-        hashed_password=get_password_hash("testpass123"),
+        password_hash=get_password_hash("testpass123"),
         first_name_ru="Тест",
         last_name_ru="Тестов",
         first_name_en="Test",
@@ -78,3 +81,31 @@ async def auth_headers(client: AsyncClient, test_user):
     token = create_access_token({"sub": str(test_user.id)})
     return {"Authorization": f"Bearer {token}"}
 
+
+@pytest.fixture
+def query_counter(engine):
+    """
+    Счетчик SQL-запросов: падает, если блок выполнил больше max_queries запросов.
+
+    Использование:
+        with query_counter(max_queries=3):
+            await client.get("/api/v1/findings")
+    """
+    @contextmanager
+    def counter(max_queries: int):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+        assert len(statements) <= max_queries, (
+            f"Expected at most {max_queries} queries, got {len(statements)}:\n" + "\n\n".join(statements)
+        )
+
+    return counter
@@ -0,0 +1,41 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core import database
+
+
+@pytest.fixture
+def broken_replica(monkeypatch, tmp_path):
+    primary = create_async_engine("sqlite+aiosqlite:///:memory:")
+    replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/replica.db")
+    monitor = database.ReplicaMonitor()
+    monkeypatch.setattr(database, "engine", primary)
+    monkeypatch.setattr(database, "replica_engine", replica)
+    monkeypatch.setattr(database, "replica_monitor", monitor)
+    yield monitor
+
+
+@pytest.mark.asyncio
+async def test_init_db_survives_unavailable_replica(broken_replica):
+    await database.init_db()
+    assert broken_replica.healthy is False
+
+
+@pytest.mark.asyncio
+async def test_read_session_falls_back_to_primary(broken_replica):
+    broken_replica.healthy = True
+    broken_replica.checked_at = time.monotonic()
+    request = SimpleNamespace(url=SimpleNamespace(path="/api/v1/reports/findings"), state=SimpleNamespace())
+
+    sessions = database.get_read_session(request)
+    session = await anext(sessions)
+    assert (await session.execute(text("SELECT 1"))).scalar() == 1
+    await sessions.aclose()
+
+    assert request.state.db_engine == "primary"
+    assert broken_replica.healthy is False
+    assert broken_replica.served == {"primary": 1, "replica": 0}
@@ -0,0 +1,38 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.core.pagination import InvalidCursorError, decode_cursor, encode_cursor, next_cursor, paginate
+from app.models.finding import Finding
+
+
+def test_cursor_roundtrip():
+    created_at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    row_id = uuid4()
+    cursor = encode_cursor(created_at, row_id)
+    assert decode_cursor(cursor, Finding.created_at) == (created_at, row_id)
+
+
+def test_invalid_cursor():
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor", Finding.created_at)
+
+
+def test_next_cursor_only_for_full_page():
+    rows = [SimpleNamespace(id=uuid4(), created_at=datetime.now(timezone.utc)) for _ in range(3)]
+    assert next_cursor(rows, limit=5) is None
+    cursor = next_cursor(rows, limit=3)
+    assert decode_cursor(cursor, Finding.created_at) == (rows[-1].created_at, rows[-1].id)
+
+
+def test_paginate_uses_keyset_instead_of_offset():
+    cursor = encode_cursor(datetime.now(timezone.utc), uuid4())
+    stmt = paginate(select(Finding), Finding.created_at, Finding.id, cursor=cursor, skip=40, limit=20)
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "(findings.created_at, findings.id) < (" in sql
+    assert "ORDER BY findings.created_at DESC, findings.id DESC" in sql
+    assert "OFFSET" not in sql
@@ -0,0 +1,84 @@
+import os
+import secrets
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.pagination import encode_cursor
+from app.crud import notification as crud_notification
+from app.models.notification import Notification
+from app.models.user import User
+
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL.startswith("postgresql"),
+    reason="Требуется TEST_DATABASE_URL с мигрированной PostgreSQL"
+)
+
+
+@pytest.mark.asyncio
+async def test_failed_notifications_pages_are_full_behind_successful_rows():
+    engine = create_async_engine(TEST_DATABASE_URL)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    suffix = secrets.token_hex(4)
+
+    async with session_maker() as db:
+        user = User(
+            email=f"failed_{suffix}@example.com",
+            username=f"failed_{suffix}",
+            first_name_ru="Тест",
+            last_name_ru="Тестов",
+            first_name_en="Test",
+            last_name_en="Testov"
+        )
+        db.add(user)
+        await db.flush()
+
+        now = datetime.now(timezone.utc)
+        notifications = [
+            Notification(
+                user_id=user.id,
+                event_type="finding_created",
+                entity_type="finding",
+                entity_id=uuid4(),
+                title=f"Уведомление {i}",
+                message="Текст",
+                email_error="SMTP timeout" if i % 50 == 0 else None,
+                telegram_error="Chat not found" if i % 75 == 0 else None,
+                created_at=now - timedelta(seconds=i)
+            )
+            for i in range(300)
+        ]
+        db.add_all(notifications)
+        await db.commit()
+        expected = [n.id for n in notifications if n.email_error or n.telegram_error]
+        start = encode_cursor(now + timedelta(seconds=1), uuid4())
+
+        try:
+            found = []
+            cursor = start
+            while len(found) < len(expected):
+                page = await crud_notification.get_failed_notifications(db=db, limit=2, cursor=cursor)
+                if not page:
+                    break
+                assert len(page) == 2 or len(found) + len(page) >= len(expected)
+                found.extend(n.id for n in page if n.user_id == user.id)
+                cursor = encode_cursor(page[-1].created_at, page[-1].id)
+
+            assert found == expected
+
+            email_only = await crud_notification.get_failed_notifications(db=db, limit=100, cursor=start, channel="email")
+            assert {n.id for n in email_only if n.user_id == user.id} == {
+                n.id for n in notifications if n.email_error
+            }
+        finally:
+            await db.execute(delete(Notification).where(Notification.user_id == user.id))
+            await db.execute(delete(User).where(User.id == user.id))
+            await db.commit()
+
+    await engine.dispose()
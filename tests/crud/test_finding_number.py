@@ -0,0 +1,101 @@
+import asyncio
+import os
+import secrets
+from datetime import date
+
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.crud import finding as crud_finding
+from app.models.audit import Audit
+from app.models.dictionary import Dictionary, DictionaryType
+from app.models.enterprise import Enterprise
+from app.models.finding import Finding
+from app.models.findings_summary import FindingsSummary
+from app.models.status import Status
+from app.models.user import User
+from app.schemas.finding import FindingCreate
+
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "")
+CONCURRENT_CREATES = 200
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL.startswith("postgresql"),
+    reason="Требуется TEST_DATABASE_URL с мигрированной PostgreSQL"
+)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_create_finding_numbers_are_unique():
+    engine = create_async_engine(TEST_DATABASE_URL, pool_size=20, max_overflow=CONCURRENT_CREATES)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    suffix = secrets.token_hex(4)
+
+    async with session_maker() as db:
+        user = User(
+            email=f"seq_{suffix}@example.com",
+            username=f"seq_{suffix}",
+            first_name_ru="Тест",
+            last_name_ru="Тестов",
+            first_name_en="Test",
+            last_name_en="Testov"
+        )
+        enterprise = Enterprise(name="Предприятие", code=f"SEQ-{suffix}")
+        dictionary_type = DictionaryType(name="Процессы", code=f"seq-{suffix}")
+        status = Status(name="Открыто", code=f"seq-{suffix}", color="#FF0000", entity_type="finding", order=1)
+        db.add_all([user, enterprise, dictionary_type, status])
+        await db.flush()
+
+        process = Dictionary(dictionary_type_id=dictionary_type.id, name="Процесс", code=f"seq-{suffix}")
+        db.add(process)
+        await db.flush()
+
+        audit = Audit(
+            title="Аудит",
+            audit_number=f"SEQ-{suffix}",
+            subject="Тема",
+            enterprise_id=enterprise.id,
+            audit_type_id=process.id,
+            status_id=status.id,
+            auditor_id=user.id,
+            audit_date_from=date.today(),
+            audit_date_to=date.today(),
+            year=date.today().year,
+            audit_category="process_system",
+            created_by_id=user.id
+        )
+        db.add(audit)
+        await db.commit()
+
+    finding_in = FindingCreate(
+        audit_id=audit.id,
+        enterprise_id=enterprise.id,
+        title="Несоответствие",
+        description="Описание",
+        process_id=process.id,
+        status_id=status.id,
+        finding_type="OFI",
+        resolver_id=user.id,
+        deadline=date.today(),
+        created_by_id=user.id
+    )
+
+    async def create_one() -> int:
+        async with session_maker() as db:
+            finding = await crud_finding.create_finding(db, finding_in)
+            return finding.finding_number
+
+    try:
+        numbers = await asyncio.gather(*(create_one() for _ in range(CONCURRENT_CREATES)))
+        assert len(set(numbers)) == CONCURRENT_CREATES
+    finally:
+        async with session_maker() as db:
+            await db.execute(delete(Finding).where(Finding.audit_id == audit.id))
+            await db.execute(delete(FindingsSummary).where(FindingsSummary.enterprise_id == enterprise.id))
+            for obj in (audit, process, dictionary_type, status, enterprise, user):
+                await db.delete(await db.get(type(obj), obj.id))
+                await db.flush()
+            await db.commit()
+        await engine.dispose()
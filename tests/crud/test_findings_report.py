@@ -0,0 +1,133 @@
+import os
+import secrets
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.crud import report as crud_report
+from app.models.audit import Audit
+from app.models.dictionary import Dictionary, DictionaryType
+from app.models.enterprise import Enterprise
+from app.models.finding import Finding
+from app.models.findings_summary import FindingsSummary
+from app.models.status import Status
+from app.models.user import User
+
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "")
+FINDINGS = 25
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL.startswith("postgresql"),
+    reason="Требуется TEST_DATABASE_URL с мигрированной PostgreSQL"
+)
+
+
+@pytest.mark.asyncio
+async def test_findings_report_pages_with_window_total_and_cursor():
+    engine = create_async_engine(TEST_DATABASE_URL)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    suffix = secrets.token_hex(4)
+
+    async with session_maker() as db:
+        resolver = User(
+            email=f"report_{suffix}@example.com",
+            username=f"report_{suffix}",
+            first_name_ru="Иван",
+            last_name_ru="Исполнителев",
+            first_name_en="Ivan",
+            last_name_en="Resolver"
+        )
+        approver = User(
+            email=f"report_approver_{suffix}@example.com",
+            username=f"report_approver_{suffix}",
+            first_name_ru="Петр",
+            last_name_ru="Утвердов",
+            first_name_en="Petr",
+            last_name_en="Approver"
+        )
+        enterprise = Enterprise(name="Предприятие", code=f"REP-{suffix}")
+        dictionary_type = DictionaryType(name="Процессы", code=f"rep-{suffix}")
+        status = Status(name="Открыто", code=f"rep-{suffix}", color="#FF0000", entity_type="finding", order=1)
+        db.add_all([resolver, approver, enterprise, dictionary_type, status])
+        await db.flush()
+
+        process = Dictionary(dictionary_type_id=dictionary_type.id, name="Процесс", code=f"rep-{suffix}")
+        db.add(process)
+        await db.flush()
+
+        audit = Audit(
+            title="Аудит",
+            audit_number=f"REP-{suffix}",
+            subject="Тема",
+            enterprise_id=enterprise.id,
+            audit_type_id=process.id,
+            status_id=status.id,
+            auditor_id=resolver.id,
+            audit_date_from=date.today(),
+            audit_date_to=date.today(),
+            year=date.today().year,
+            audit_category="process_system",
+            created_by_id=resolver.id
+        )
+        db.add(audit)
+        await db.flush()
+
+        now = datetime.now(timezone.utc)
+        findings = [
+            Finding(
+                audit_id=audit.id,
+                enterprise_id=enterprise.id,
+                title=f"Несоответствие {i}",
+                description="Описание",
+                process_id=process.id,
+                status_id=status.id,
+                finding_type="CAR1" if i % 5 == 0 else "OFI",
+                resolver_id=resolver.id,
+                approver_id=approver.id if i % 2 == 0 else None,
+                deadline=date.today(),
+                created_by_id=resolver.id,
+                created_at=now - timedelta(minutes=i)
+            )
+            for i in range(FINDINGS)
+        ]
+        db.add_all(findings)
+        await db.commit()
+
+        try:
+            data, total, cursor = await crud_report.get_findings_report(db=db, enterprise_id=enterprise.id, limit=10)
+            assert total == FINDINGS
+            assert [row["title"] for row in data] == [f"Несоответствие {i}" for i in range(10)]
+            assert data[0]["approver_name"] == "Петр Утвердов"
+            assert data[1]["approver_name"] is None
+            assert data[0]["resolver_name"] == "Иван Исполнителев"
+            assert data[0]["process_name"] == "Процесс"
+
+            titles = [row["title"] for row in data]
+            while cursor:
+                data, total, cursor = await crud_report.get_findings_report(
+                    db=db, enterprise_id=enterprise.id, limit=10, cursor=cursor
+                )
+                assert total == FINDINGS
+                titles.extend(row["title"] for row in data)
+            assert titles == [f"Несоответствие {i}" for i in range(FINDINGS)]
+
+            data, total, cursor = await crud_report.get_findings_report(
+                db=db, enterprise_id=enterprise.id, finding_type="CAR1", skip=100
+            )
+            assert data == [] and total == FINDINGS // 5 and cursor is None
+
+            _, estimated, _ = await crud_report.get_findings_report(
+                db=db, enterprise_id=enterprise.id, limit=1, estimated_total=True
+            )
+            assert estimated >= 0
+        finally:
+            await db.execute(delete(Finding).where(Finding.audit_id == audit.id))
+            await db.execute(delete(FindingsSummary).where(FindingsSummary.enterprise_id == enterprise.id))
+            for obj in (audit, process, dictionary_type, status, enterprise, approver, resolver):
+                await db.delete(await db.get(type(obj), obj.id))
+                await db.flush()
+            await db.commit()
+    await engine.dispose()
@@ -0,0 +1,167 @@
+import os
+import secrets
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import AppSession
+from app.crud import finding as crud_finding
+from app.crud import findings_summary as crud_findings_summary
+from app.crud import report as crud_report
+from app.models.audit import Audit
+from app.models.dictionary import Dictionary, DictionaryType
+from app.models.enterprise import Enterprise
+from app.models.finding import Finding
+from app.models.findings_summary import FindingsSummary
+from app.models.status import Status
+from app.models.user import User
+from app.schemas.finding import FindingCreate, FindingUpdate
+
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL.startswith("postgresql"),
+    reason="Требуется TEST_DATABASE_URL с мигрированной PostgreSQL"
+)
+
+
+async def _cells(db, enterprise_id):
+    result = await db.execute(
+        select(
+            FindingsSummary.resolver_id,
+            FindingsSummary.status_is_final,
+            FindingsSummary.findings_count
+        ).where(
+            FindingsSummary.enterprise_id == enterprise_id,
+            FindingsSummary.findings_count != 0
+        )
+    )
+    return {(row.resolver_id, row.status_is_final): row.findings_count for row in result.all()}
+
+
+@pytest.mark.asyncio
+async def test_findings_summary_follows_finding_changes():
+    engine = create_async_engine(TEST_DATABASE_URL)
+    session_maker = async_sessionmaker(
+        engine, class_=AsyncSession, sync_session_class=AppSession, expire_on_commit=False
+    )
+    suffix = secrets.token_hex(4)
+
+    async with session_maker() as db:
+        resolver = User(
+            email=f"cube_{suffix}@example.com",
+            username=f"cube_{suffix}",
+            first_name_ru="Иван",
+            last_name_ru="Исполнителев",
+            first_name_en="Ivan",
+            last_name_en="Resolver"
+        )
+        other_resolver = User(
+            email=f"cube_other_{suffix}@example.com",
+            username=f"cube_other_{suffix}",
+            first_name_ru="Петр",
+            last_name_ru="Другов",
+            first_name_en="Petr",
+            last_name_en="Other"
+        )
+        enterprise = Enterprise(name="Предприятие", code=f"CUBE-{suffix}")
+        dictionary_type = DictionaryType(name="Процессы", code=f"cube-{suffix}")
+        open_status = Status(name="Открыто", code=f"cube-open-{suffix}", color="#FF0000", entity_type="finding", order=1)
+        closed_status = Status(
+            name="Закрыто", code=f"cube-closed-{suffix}", color="#00FF00", entity_type="finding", order=2, is_final=True
+        )
+        db.add_all([resolver, other_resolver, enterprise, dictionary_type, open_status, closed_status])
+        await db.flush()
+
+        process = Dictionary(dictionary_type_id=dictionary_type.id, name="Процесс", code=f"cube-{suffix}")
+        db.add(process)
+        await db.flush()
+
+        audit = Audit(
+            title="Аудит",
+            audit_number=f"CUBE-{suffix}",
+            subject="Тема",
+            enterprise_id=enterprise.id,
+            audit_type_id=process.id,
+            status_id=open_status.id,
+            auditor_id=resolver.id,
+            audit_date_from=date.today(),
+            audit_date_to=date.today(),
+            year=date.today().year,
+            audit_category="process_system",
+            created_by_id=resolver.id
+        )
+        db.add(audit)
+        await db.commit()
+
+        def finding_create(i, deadline):
+            return FindingCreate(
+                audit_id=audit.id,
+                enterprise_id=enterprise.id,
+                title=f"Несоответствие {i}",
+                description="Описание",
+                process_id=process.id,
+                status_id=open_status.id,
+                finding_type="OFI",
+                resolver_id=resolver.id,
+                deadline=deadline,
+                created_by_id=resolver.id
+            )
+
+        try:
+            first = await crud_finding.create_finding(db, finding_create(0, date.today() - timedelta(days=1)))
+            await crud_finding.create_findings_bulk(
+                db, {i: finding_create(i, date.today() + timedelta(days=7)) for i in range(1, 4)}
+            )
+            assert await _cells(db, enterprise.id) == {(resolver.id, False): 4}
+
+            await crud_finding.update_finding(db, first.id, FindingUpdate(status_id=closed_status.id))
+            assert await _cells(db, enterprise.id) == {(resolver.id, False): 3, (resolver.id, True): 1}
+
+            db.expire(first, ["resolver_id"])
+            first.resolver_id = other_resolver.id
+            await db.commit()
+            assert await _cells(db, enterprise.id) == {(resolver.id, False): 3, (other_resolver.id, True): 1}
+
+            processes = await crud_report.get_process_report(db, enterprise_id=enterprise.id)
+            assert processes == [{
+                "process_name": "Процесс",
+                "total_findings": 4,
+                "car1_count": 0,
+                "car2_count": 0,
+                "ofi_count": 4,
+                "closed_count": 1,
+                "overdue_count": 0
+            }]
+
+            solvers = {
+                row["solver_name"]: row
+                for row in await crud_report.get_solver_report(db, enterprise_id=enterprise.id)
+            }
+            assert solvers["Иван Исполнителев"]["active_findings"] == 3
+            assert solvers["Петр Другов"]["closed_findings"] == 1
+
+            await crud_finding.delete_finding(db, first.id)
+            assert await _cells(db, enterprise.id) == {(resolver.id, False): 3}
+
+            await crud_findings_summary.reconcile_findings_summary(db)
+            assert await _cells(db, enterprise.id) == {(resolver.id, False): 3}
+
+            await db.execute(
+                update(Finding).where(Finding.enterprise_id == enterprise.id).values(status_id=closed_status.id)
+            )
+            await db.commit()
+            drift = await crud_findings_summary.reconcile_findings_summary(db)
+            assert drift["updated"] >= 1 and drift["removed"] >= 1
+            assert await _cells(db, enterprise.id) == {(resolver.id, True): 3}
+        finally:
+            await db.execute(delete(Finding).where(Finding.audit_id == audit.id))
+            await db.execute(delete(FindingsSummary).where(FindingsSummary.enterprise_id == enterprise.id))
+            for obj in (audit, process, dictionary_type, closed_status, open_status, enterprise, other_resolver, resolver):
+                await db.delete(await db.get(type(obj), obj.id))
+                await db.flush()
+            await db.commit()
+    await engine.dispose()
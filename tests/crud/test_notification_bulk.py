@@ -0,0 +1,103 @@
+import os
+import secrets
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.crud import notification as crud_notification
+from app.models.notification import Notification
+from app.models.user import User
+
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL.startswith("postgresql"),
+    reason="Требуется TEST_DATABASE_URL с мигрированной PostgreSQL"
+)
+
+
+@pytest.mark.asyncio
+async def test_bulk_notification_actions_are_scoped_to_user():
+    engine = create_async_engine(TEST_DATABASE_URL)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    suffix = secrets.token_hex(4)
+
+    async with session_maker() as db:
+        users = [
+            User(
+                email=f"bulk_{suffix}_{i}@example.com",
+                username=f"bulk_{suffix}_{i}",
+                first_name_ru="Тест",
+                last_name_ru="Тестов",
+                first_name_en="Test",
+                last_name_en="Testov"
+            )
+            for i in range(2)
+        ]
+        db.add_all(users)
+        await db.flush()
+
+        entity_id = uuid4()
+        old = datetime.now(timezone.utc) - timedelta(days=40)
+        notifications = [
+            Notification(
+                user_id=user.id,
+                event_type="finding_created",
+                entity_type="finding",
+                entity_id=entity_id if i < 2 else uuid4(),
+                title=f"Уведомление {i}",
+                message="Текст"
+            )
+            for user in users
+            for i in range(4)
+        ]
+        for notification in notifications[3::4]:
+            notification.created_at = old
+        db.add_all(notifications)
+        await db.commit()
+        owner, other = users
+        owner_notifications = [n for n in notifications if n.user_id == owner.id]
+
+        try:
+            count = await crud_notification.mark_notifications_as_read(
+                db=db,
+                user_id=owner.id,
+                notification_ids=[owner_notifications[2].id] + [n.id for n in notifications if n.user_id == other.id]
+            )
+            assert count == 1
+
+            count = await crud_notification.mark_entity_notifications_as_read(
+                db=db,
+                user_id=owner.id,
+                entity_type="finding",
+                entity_id=entity_id
+            )
+            assert count == 2
+
+            assert await crud_notification.mark_all_notifications_as_read(db=db, user_id=owner.id) == 1
+            assert await crud_notification.delete_notifications_older_than(db=db, user_id=owner.id, days=30) == 1
+
+            result = await db.execute(
+                select(Notification.is_read, Notification.deleted_at).where(Notification.user_id == other.id)
+            )
+            assert all(not is_read and deleted_at is None for is_read, deleted_at in result.all())
+
+            listed = await crud_notification.get_notifications(db=db, user_id=owner.id)
+            assert {n.id for n in listed} == {n.id for n in owner_notifications[:3]}
+            assert await crud_notification.get_notification(db=db, notification_id=owner_notifications[3].id) is None
+
+            assert await crud_notification.delete_notifications_older_than(db=db, user_id=other.id, days=30) == 1
+            assert await crud_notification.mark_all_notifications_as_read(db=db, user_id=other.id) == 3
+            stats = await crud_notification.get_notification_stats(db=db, user_id=other.id, days=60)
+            assert stats["total_notifications"] == 3
+            assert stats["unread_notifications"] == 0
+        finally:
+            await db.execute(delete(Notification).where(Notification.user_id.in_([u.id for u in users])))
+            await db.execute(delete(User).where(User.id.in_([u.id for u in users])))
+            await db.commit()
+
+    await engine.dispose()
@@ -0,0 +1,92 @@
+from uuid import uuid4
+
+import pytest
+
+from app.services.change_history import ChangeHistoryBatch
+
+
+def test_change_history_batch_collects_only_changed_fields():
+    user_id = uuid4()
+    entity_id = uuid4()
+    batch = ChangeHistoryBatch(db=None, user_id=user_id, deferred=False)
+
+    added = batch.add_changes(
+        "audit",
+        entity_id,
+        {"title": "Старое", "year": 2024, "subject": None, "updated_at": 1},
+        {"title": "Новое", "year": 2024, "subject": "Тема", "updated_at": 2}
+    )
+
+    assert added == 2
+    assert [row["field_name"] for row in batch.rows] == ["subject", "title"]
+    assert batch.rows[0]["old_value"] is None
+    assert batch.rows[0]["new_value"] == "Тема"
+    assert batch.rows[1]["old_value"] == "Старое"
+    assert all(row["entity_id"] == entity_id and row["user_id"] == user_id for row in batch.rows)
+    assert len({row["changed_at"] for row in batch.rows}) == 1
+
+
+@pytest.mark.asyncio
+async def test_change_history_batch_flush_inserts_once(monkeypatch):
+    calls = []
+
+    async def fake_bulk(db, rows):
+        calls.append(rows)
+        return len(rows)
+
+    monkeypatch.setattr("app.services.change_history.create_change_history_bulk", fake_bulk)
+    batch = ChangeHistoryBatch(db=None, user_id=uuid4(), deferred=False)
+    batch.add_changes("finding", uuid4(), {f"field_{i}": i for i in range(20)}, {f"field_{i}": i + 1 for i in range(20)})
+
+    assert await batch.flush() == 20
+    assert len(calls) == 1
+    assert batch.rows == []
+    assert await batch.flush() == 0
+    assert len(calls) == 1
+
+
+class FakeSession:
+    def __init__(self):
+        from sqlalchemy.orm import Session
+
+        self.sync_session = Session()
+        self.sync_session.begin()
+
+
+@pytest.mark.asyncio
+async def test_deferred_change_history_is_queued_after_commit(monkeypatch):
+    from app.services import tasks
+
+    sent = []
+    monkeypatch.setattr(tasks.write_change_history_batch, "delay", lambda rows: sent.append(rows))
+    db = FakeSession()
+
+    batch = ChangeHistoryBatch(db=db, user_id=uuid4(), deferred=True)
+    batch.add_changes("audit", uuid4(), {"title": "Старое"}, {"title": "Новое"})
+    assert await batch.flush() == 1
+    assert sent == []
+
+    db.sync_session.commit()
+    assert len(sent) == 1
+    assert sent[0][0]["field_name"] == "title"
+    assert isinstance(sent[0][0]["entity_id"], str)
+
+    db.sync_session.commit()
+    assert len(sent) == 1
+
+
+@pytest.mark.asyncio
+async def test_deferred_change_history_is_dropped_on_rollback(monkeypatch):
+    from app.services import tasks
+
+    sent = []
+    monkeypatch.setattr(tasks.write_change_history_batch, "delay", lambda rows: sent.append(rows))
+    db = FakeSession()
+
+    batch = ChangeHistoryBatch(db=db, user_id=uuid4(), deferred=True)
+    batch.add_changes("audit", uuid4(), {"title": "Старое"}, {"title": "Новое"})
+    await batch.flush()
+
+    db.sync_session.rollback()
+    db.sync_session.commit()
+    assert sent == []
@@ -0,0 +1,243 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.services import notification_outbox
+from app.services.notification_outbox import deliver_queue_item, retry_delay
+
+
+class FakeSession:
+    def __init__(self):
+        self.commits = 0
+
+    async def commit(self):
+        self.commits += 1
+
+
+def make_notification(user, title="Уведомление", notification_config=None):
+    return SimpleNamespace(
+        user=user,
+        user_id=user.id,
+        entity_type="finding",
+        entity_id=uuid4(),
+        title=title,
+        message="Текст",
+        notification_config=notification_config,
+        sent_email=False,
+        email_sent_at=None,
+        email_error=None,
+        telegram_error=None
+    )
+
+
+def make_queue_item(channel="email", digest_minutes=0, created_at=None, notification_config=None):
+    user = SimpleNamespace(
+        id=uuid4(),
+        email="user@example.com",
+        telegram_chat_id="100",
+        notification_digest_minutes=digest_minutes
+    )
+    return SimpleNamespace(
+        id=uuid4(),
+        channel=channel,
+        notification=make_notification(user, notification_config=notification_config),
+        status="processing",
+        created_at=created_at or datetime.now(timezone.utc),
+        scheduled_at=None,
+        sent_at=None,
+        error_message=None,
+        retry_count=0,
+        max_retries=3
+    )
+
+
+@pytest.mark.asyncio
+async def test_deliver_queue_item_marks_sent():
+    async def sender(db, notification, user):
+        return True
+
+    db = FakeSession()
+    queue_item = make_queue_item()
+    assert await deliver_queue_item(db, queue_item, sender) == "sent"
+    assert queue_item.sent_at is not None
+    assert db.commits == 2
+
+
+@pytest.mark.asyncio
+async def test_deliver_queue_item_records_channel_error():
+    async def sender(db, notification, user):
+        notification.telegram_error = "Не удалось отправить сообщение"
+        return False
+
+    db = FakeSession()
+    queue_item = make_queue_item("telegram")
+    assert await deliver_queue_item(db, queue_item, sender) == "failed"
+    assert queue_item.error_message == "Не удалось отправить сообщение"
+    assert queue_item.retry_count == 1
+    assert queue_item.scheduled_at > datetime.now(timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_deliver_queue_item_moves_exhausted_item_to_dead():
+    async def sender(db, notification, user):
+        return False
+
+    queue_item = make_queue_item()
+    queue_item.retry_count = 2
+    assert await deliver_queue_item(FakeSession(), queue_item, sender) == "dead"
+    assert queue_item.retry_count == 3
+    assert queue_item.scheduled_at is None
+
+
+def test_retry_delay_grows_exponentially_with_jitter(monkeypatch):
+    monkeypatch.setattr(notification_outbox.settings, "NOTIFICATION_RETRY_BASE_SECONDS", 60)
+    monkeypatch.setattr(notification_outbox.settings, "NOTIFICATION_RETRY_MAX_SECONDS", 600)
+
+    for retry_count, expected in ((1, 60), (2, 120), (3, 240), (5, 600), (10, 600)):
+        delays = [retry_delay(retry_count).total_seconds() for _ in range(50)]
+        assert all(expected / 2 <= delay <= expected for delay in delays)
+        assert len(set(delays)) > 1
+
+
+@pytest.mark.asyncio
+async def test_deliver_queue_item_skips_telegram_without_chat():
+    async def sender(db, notification, user):
+        raise AssertionError("sender must not be called")
+
+    db = FakeSession()
+    queue_item = make_queue_item("telegram")
+    queue_item.notification.user.telegram_chat_id = None
+    assert await deliver_queue_item(db, queue_item, sender) == "skipped"
+    assert db.commits == 1
+
+
+@pytest.mark.asyncio
+async def test_deliver_queue_item_holds_until_digest_window_ends():
+    async def sender(db, notification, user):
+        raise AssertionError("sender must not be called")
+
+    db = FakeSession()
+    queue_item = make_queue_item(digest_minutes=5)
+    assert await deliver_queue_item(db, queue_item, sender) == "pending"
+    assert queue_item.scheduled_at == queue_item.created_at + timedelta(minutes=5)
+
+
+@pytest.mark.asyncio
+async def test_deliver_queue_item_sends_digest(monkeypatch):
+    queue_item = make_queue_item(digest_minutes=5, created_at=datetime.now(timezone.utc) - timedelta(minutes=6))
+    user = queue_item.notification.user
+    others = [
+        SimpleNamespace(notification=make_notification(user, title=f"Событие {i}"))
+        for i in range(2)
+    ]
+    marked = []
+
+    async def fake_coalesce(db, lead, user_id, limit):
+        return others
+
+    async def fake_mark(db, lead):
+        marked.append(lead)
+        return len(others)
+
+    monkeypatch.setattr(notification_outbox.crud_notification, "coalesce_notification_queue", fake_coalesce)
+    monkeypatch.setattr(notification_outbox.crud_notification, "mark_coalesced_sent", fake_mark)
+    sent = []
+
+    async def sender(db, notification, user):
+        sent.append(notification)
+        notification.sent_email = True
+        notification.email_sent_at = datetime.now(timezone.utc)
+        notification.email_error = None
+        return True
+
+    assert await deliver_queue_item(FakeSession(), queue_item, sender) == "sent"
+    assert len(sent) == 1
+    assert sent[0].title == "Сводка уведомлений: 3"
+    assert "Событие 1" in sent[0].message
+    assert marked == [queue_item]
+    assert all(item.notification.sent_email for item in others)
+
+
+@pytest.mark.asyncio
+async def test_deliver_queue_item_sends_immediately_without_digest_setting():
+    async def sender(db, notification, user):
+        return True
+
+    queue_item = make_queue_item(digest_minutes=None)
+    assert await deliver_queue_item(FakeSession(), queue_item, sender) == "sent"
+
+
+@pytest.mark.asyncio
+async def test_deliver_queue_item_digest_disabled_by_config():
+    async def sender(db, notification, user):
+        return True
+
+    queue_item = make_queue_item(digest_minutes=5, notification_config={"digest": False})
+    assert await deliver_queue_item(FakeSession(), queue_item, sender) == "sent"
+
+
+class FakePool:
+    def __init__(self, size):
+        self.size = size
+        self.in_use = 0
+        self.max_in_use = 0
+
+
+class PooledSession:
+    """Сессия, занимающая соединение пула с первого запроса до commit или закрытия."""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.connected = False
+
+    def checkout(self):
+        if not self.connected:
+            if self.pool.in_use >= self.pool.size:
+                raise TimeoutError("QueuePool limit reached")
+            self.pool.in_use += 1
+            self.pool.max_in_use = max(self.pool.max_in_use, self.pool.in_use)
+            self.connected = True
+
+    async def commit(self):
+        if self.connected:
+            self.pool.in_use -= 1
+            self.connected = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.commit()
+
+
+@pytest.mark.asyncio
+async def test_process_outbox_runs_more_workers_than_pool_connections(monkeypatch):
+    pool = FakePool(size=2)
+    pending = [make_queue_item("telegram") for _ in range(24)]
+
+    async def fake_release(db, timeout_seconds):
+        db.checkout()
+        return 0
+
+    async def fake_claim(db, channel, limit):
+        db.checkout()
+        claimed = pending[:limit]
+        del pending[:limit]
+        return claimed
+
+    async def sender(db, notification, user):
+        await asyncio.sleep(0.01)
+        return True
+
+    monkeypatch.setattr(notification_outbox, "async_session_maker", lambda: PooledSession(pool))
+    monkeypatch.setattr(notification_outbox.crud_notification, "release_stale_notification_claims", fake_release)
+    monkeypatch.setattr(notification_outbox.crud_notification, "claim_notification_batch", fake_claim)
+
+    result = await notification_outbox.process_outbox("telegram", concurrency=8, batch_size=2, sender=sender)
+
+    assert result["sent"] == 24
+    assert pool.max_in_use <= pool.size
+    assert pool.in_use == 0
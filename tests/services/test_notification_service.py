@@ -0,0 +1,60 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.services.notification_service import PENDING_DELIVERY_KEY, notify_finding_created
+
+
+@pytest.mark.asyncio
+async def test_notify_finding_created_only_adds_to_session():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    executed = []
+
+    async with AsyncSession(engine) as db:
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: executed.append(args[2]))
+
+        await notify_finding_created(
+            db=db,
+            finding_id=uuid4(),
+            resolver_id=uuid4(),
+            title="Несоответствие",
+            description="Описание"
+        )
+
+        added = list(db.new)
+        assert executed == []
+        assert len(added) == 3
+        assert {item.channel for item in added if hasattr(item, "channel")} == {"email", "telegram"}
+        assert db.sync_session.info[PENDING_DELIVERY_KEY] == {"email", "telegram"}
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_bulk_notifications_are_scheduled_in_utc():
+    from app.crud.notification import create_notifications_bulk
+
+    class RecordingSession:
+        def __init__(self):
+            self.statements = []
+
+        async def execute(self, statement):
+            self.statements.append(statement)
+
+    db = RecordingSession()
+    created = await create_notifications_bulk(db=db, notifications=[{
+        "user_id": uuid4(),
+        "event_type": "finding_created",
+        "entity_type": "finding",
+        "entity_id": uuid4(),
+        "title": "Несоответствие",
+        "message": "Описание",
+        "channels": ["email"]
+    }])
+
+    queue_insert = next(stmt for stmt in db.statements if stmt.table.name == "notification_queue")
+    scheduled_at = queue_insert.compile().params["scheduled_at_m0"]
+    assert created == 1
+    assert scheduled_at.tzinfo is not None and scheduled_at.utcoffset().total_seconds() == 0
@@ -0,0 +1,127 @@
+import gzip
+import json
+import os
+import secrets
+from datetime import date, datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models.s3_storage import S3Storage
+from app.services import partitions
+from app.services.partitions import add_months, month_start, partition_name
+
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "")
+
+requires_postgres = pytest.mark.skipif(
+    not TEST_DATABASE_URL.startswith("postgresql"),
+    reason="Требуется TEST_DATABASE_URL с мигрированной PostgreSQL"
+)
+
+
+def test_add_months_crosses_year_boundaries():
+    assert add_months(date(2026, 11, 1), 1) == date(2026, 12, 1)
+    assert add_months(date(2026, 12, 1), 1) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert add_months(date(2026, 3, 1), -27) == date(2023, 12, 1)
+
+
+def test_partition_name_uses_month_of_date():
+    assert partition_name("notifications", month_start(date(2026, 2, 17))) == "notifications_p202602"
+
+
+@pytest.fixture
+async def partitioned_table(monkeypatch):
+    """Отдельная партиционированная таблица с архивом в подставном S3."""
+    engine = create_async_engine(TEST_DATABASE_URL)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+    table = f"partition_test_{secrets.token_hex(4)}"
+    uploads = {}
+
+    async def fake_default_storage(db):
+        storage = S3Storage(name="archive")
+        db.add(storage)
+        return storage
+
+    def fake_upload(storage, fileobj, key, content_type):
+        if uploads.get("fail"):
+            return False
+        uploads[key] = gzip.decompress(fileobj.read()).decode()
+        return True
+
+    monkeypatch.setattr(partitions, "PARTITIONED_TABLES", {table: "NOTIFICATION_RETENTION_MONTHS"})
+    monkeypatch.setattr(partitions, "async_session_maker", session_maker)
+    monkeypatch.setattr(partitions, "get_default_s3_storage", fake_default_storage)
+    monkeypatch.setattr(partitions, "upload_fileobj_to_s3", fake_upload)
+    monkeypatch.setattr(partitions.settings, "PARTITION_PREMAKE_MONTHS", 2)
+    monkeypatch.setattr(partitions.settings, "NOTIFICATION_RETENTION_MONTHS", 3)
+
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            f'CREATE TABLE "{table}" (id uuid NOT NULL, created_at timestamptz NOT NULL, title text) '
+            "PARTITION BY RANGE (created_at)"
+        ))
+
+    yield table, session_maker, uploads
+
+    async with session_maker() as db:
+        for name, _, _ in await partitions.list_partitions(db, table):
+            await db.execute(text(f'DROP TABLE "{name}"'))
+        await db.execute(text(f'DROP TABLE "{table}"'))
+        await db.commit()
+    await engine.dispose()
+
+
+async def _add_expired_row(session_maker, table):
+    current_month = month_start(datetime.now(timezone.utc).date())
+    expired_month = add_months(current_month, -6)
+    async with session_maker() as db:
+        await partitions.create_month_partitions(db, table, expired_month, expired_month)
+        await db.execute(
+            text(f'INSERT INTO "{table}" (id, created_at, title) VALUES (:id, :created_at, :title)'),
+            {
+                "id": uuid4(),
+                "created_at": datetime(expired_month.year, expired_month.month, 15, tzinfo=timezone.utc),
+                "title": "старое"
+            }
+        )
+        await db.commit()
+    return current_month, partition_name(table, expired_month)
+
+
+@requires_postgres
+@pytest.mark.asyncio
+async def test_maintain_partitions_premakes_months_and_archives_expired(partitioned_table):
+    table, session_maker, uploads = partitioned_table
+    current_month, expired = await _add_expired_row(session_maker, table)
+
+    result = await partitions.maintain_partitions()
+
+    expected = [partition_name(table, add_months(current_month, months)) for months in range(3)]
+    assert result["created"] == {table: expected}
+    assert result["archived"] == {table: [expired]}
+    async with session_maker() as db:
+        assert [name for name, _, _ in await partitions.list_partitions(db, table)] == expected
+
+    archive = uploads[f"{partitions.settings.PARTITION_ARCHIVE_PREFIX}{table}/{expired}.jsonl.gz"]
+    assert [json.loads(line)["title"] for line in archive.splitlines()] == ["старое"]
+
+
+@requires_postgres
+@pytest.mark.asyncio
+async def test_maintain_partitions_keeps_detached_partition_when_upload_fails(partitioned_table):
+    table, session_maker, uploads = partitioned_table
+    _, expired = await _add_expired_row(session_maker, table)
+    uploads["fail"] = True
+
+    result = await partitions.maintain_partitions()
+
+    assert result["archived"] == {}
+    async with session_maker() as db:
+        stored = {name: attached for name, _, attached in await partitions.list_partitions(db, table)}
+        rows = await db.execute(text(f'SELECT count(*) FROM "{expired}"'))
+        assert rows.scalar_one() == 1
+    assert stored[expired] is False
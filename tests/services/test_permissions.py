@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.services import permissions
+from app.services.permissions import PermissionService, PermissionSet
+
+
+def test_permission_set_exact_match():
+    permission_set = PermissionSet([("finding", "read", None)])
+    assert permission_set.allows("finding", "read")
+    assert not permission_set.allows("finding", "delete")
+    assert not permission_set.allows("audit", "read")
+
+
+def test_permission_set_wildcards():
+    permission_set = PermissionSet([("*", "read", None), ("audit", "*", None)])
+    assert permission_set.allows("finding", "read")
+    assert permission_set.allows("audit", "delete")
+    assert not permission_set.allows("finding", "delete")
+
+
+def test_permission_set_enterprise_scope():
+    enterprise_id = uuid4()
+    permission_set = PermissionSet([("finding", "update", str(enterprise_id))])
+    assert permission_set.allows("finding", "update")
+    assert permission_set.allows("finding", "update", enterprise_id)
+    assert not permission_set.allows("finding", "update", uuid4())
+
+
+def test_permission_set_multiple_roles():
+    enterprise_a = str(uuid4())
+    enterprise_b = str(uuid4())
+    permission_set = PermissionSet([
+        ("finding", "read", enterprise_a),
+        ("finding", "read", enterprise_b)
+    ])
+    assert permission_set.allows("finding", "read", enterprise_a)
+    assert permission_set.allows("finding", "read", enterprise_b)
+
+
+def test_permission_set_superuser():
+    permission_set = PermissionSet([], is_superuser=True)
+    assert permission_set.allows("anything", "delete", uuid4())
+
+
+@pytest.mark.asyncio
+async def test_permission_cache_expires_after_ttl(monkeypatch):
+    service = PermissionService()
+    user = SimpleNamespace(id=uuid4(), is_superuser=False)
+    compiled = []
+    now = [1000.0]
+
+    async def fake_version(user_id):
+        return 1, 1
+
+    async def fake_compile(db, user):
+        compiled.append(user.id)
+        return PermissionSet([("finding", "read", None)])
+
+    monkeypatch.setattr(service, "_get_version", fake_version)
+    monkeypatch.setattr(service, "compile", fake_compile)
+    monkeypatch.setattr(permissions, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    monkeypatch.setattr(permissions.settings, "PERMISSION_CACHE_TTL_SECONDS", 60)
+
+    await service.get_permission_set(None, user)
+    now[0] += 59
+    await service.get_permission_set(None, user)
+    assert len(compiled) == 1
+
+    now[0] += 2
+    await service.get_permission_set(None, user)
+    assert len(compiled) == 2
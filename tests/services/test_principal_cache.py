@@ -0,0 +1,41 @@
+import json
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from app.models.user import User
+from app.services.principal_cache import PRINCIPAL_FIELDS, PrincipalCache
+
+
+def test_principal_cache_stores_only_whitelisted_fields():
+    user = User(
+        id=uuid4(),
+        email="principal@example.com",
+        username="principal",
+        first_name_ru="Иван",
+        last_name_ru="Иванов",
+        first_name_en="Ivan",
+        last_name_en="Ivanov",
+        is_active=True,
+        is_superuser=False,
+        password_hash="secret-hash",
+        ldap_dn="cn=principal",
+        session_id="session",
+        telegram_linked_at=datetime(2026, 1, 1, tzinfo=timezone.utc)
+    )
+
+    raw = PrincipalCache._dump_user(user)
+    assert set(json.loads(raw)) == set(PRINCIPAL_FIELDS)
+    assert "secret-hash" not in raw
+
+    values = PrincipalCache._load_values(raw)
+    assert values["id"] == user.id
+    assert values["telegram_linked_at"] == user.telegram_linked_at
+    assert values["session_id"] == "session"
+
+
+def test_principal_cache_drops_unknown_fields_from_old_entries():
+    raw = json.dumps({"id": str(uuid4()), "session_id": "session", "password_hash": "secret-hash"})
+
+    values = PrincipalCache._load_values(raw)
+    assert "password_hash" not in values
+    assert set(values) == set(PRINCIPAL_FIELDS)
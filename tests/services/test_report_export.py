@@ -0,0 +1,156 @@
+import csv
+import io
+import json
+import os
+from datetime import date, datetime, timezone
+from uuid import uuid4
+
+import pytest
+from openpyxl import load_workbook
+
+from app.services import report_export
+from app.services.report_export import (
+    CELL_STYLE,
+    DATE_CELL_STYLE,
+    FINDINGS_REPORT,
+    HEADER_STYLE,
+    file_streaming_response,
+    get_report_cache_key,
+    report_cache_key,
+    stream_csv,
+    stream_jsonl,
+    write_parquet,
+    write_xlsx
+)
+
+
+def finding_row(i):
+    return {
+        "finding_number": i,
+        "audit_number": f"A-{i}",
+        "audit_title": "Аудит",
+        "title": f"Несоответствие {i}",
+        "finding_type": "OFI",
+        "process_name": "Процесс",
+        "status_name": "Открыто",
+        "resolver_name": "Иван Иванов",
+        "approver_name": None,
+        "deadline": date(2026, 1, 31),
+        "closing_date": None,
+        "created_at": date(2026, 1, 1)
+    }
+
+
+async def chunked(rows, size):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+@pytest.mark.asyncio
+async def test_write_xlsx_writes_all_chunks_with_named_styles():
+    rows = [finding_row(i) for i in range(1, 251)]
+    path = await write_xlsx(FINDINGS_REPORT, chunked(rows, 100))
+    try:
+        wb = load_workbook(path)
+        ws = wb["Несоответствия"]
+        assert [cell.value for cell in ws[1]] == FINDINGS_REPORT.headers
+        assert ws.max_row == 251
+        assert ws.cell(row=2, column=1).value == 1
+        assert ws.cell(row=251, column=4).value == "Несоответствие 250"
+        assert ws.cell(row=2, column=10).value.date() == date(2026, 1, 31)
+        assert ws.cell(row=1, column=1).style == HEADER_STYLE
+        assert ws.cell(row=2, column=1).style == CELL_STYLE
+        assert ws.cell(row=2, column=10).style == DATE_CELL_STYLE
+    finally:
+        os.remove(path)
+
+
+@pytest.mark.asyncio
+async def test_file_streaming_response_removes_file_after_sending():
+    path = await write_xlsx(FINDINGS_REPORT, chunked([finding_row(1)], 1))
+    size = os.path.getsize(path)
+    response = file_streaming_response(path, "report.xlsx")
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    await response.background()
+
+    assert len(body) == size
+    assert response.headers["content-disposition"] == "attachment; filename=report.xlsx"
+    assert not os.path.exists(path)
+
+
+def test_report_cache_key_depends_on_filters_and_watermark():
+    enterprise_id = uuid4()
+    watermark = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+    params = {"enterprise_id": enterprise_id, "date_from": date(2026, 1, 1), "finding_type": "CAR1"}
+    key = report_cache_key("findings", params, watermark, 10)
+
+    assert key == report_cache_key("findings", dict(params), watermark, 10)
+    assert key != report_cache_key("findings", {**params, "finding_type": "OFI"}, watermark, 10)
+    assert key != report_cache_key("findings", params, datetime(2026, 3, 2, tzinfo=timezone.utc), 10)
+    assert key != report_cache_key("findings", params, watermark, 9)
+    assert key == report_cache_key("findings", params, watermark, 10, today=date(2030, 1, 1))
+
+
+def test_report_cache_key_ignores_unused_filters_and_expires_daily_reports():
+    watermark = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    params = {"enterprise_id": uuid4()}
+    key = report_cache_key("by_processes", params, watermark, 5, today=date(2026, 3, 1))
+
+    assert key == report_cache_key("by_processes", {**params, "finding_type": "OFI"}, watermark, 5, today=date(2026, 3, 1))
+    assert key != report_cache_key("by_processes", params, watermark, 5, today=date(2026, 3, 2))
+    assert key != report_cache_key("by_solvers", params, watermark, 5, today=date(2026, 3, 1))
+
+
+@pytest.mark.asyncio
+async def test_cube_report_watermark_filters_by_utc_day(monkeypatch):
+    calls = []
+
+    async def fake_watermark(db, **filters):
+        calls.append(filters)
+        return None, 0
+
+    monkeypatch.setattr(report_export.crud_report, "get_findings_watermark", fake_watermark)
+    params = {"date_from": date(2026, 3, 1), "date_to": date(2026, 3, 31)}
+    await get_report_cache_key(None, "by_processes", params)
+    await get_report_cache_key(None, "findings", params)
+
+    assert calls[0]["utc_day"] is True and calls[0]["date_to"] == date(2026, 3, 31)
+    assert calls[1]["utc_day"] is False
+
+
+@pytest.mark.asyncio
+async def test_stream_csv_and_jsonl_share_layout_keys():
+    rows = [finding_row(i) for i in range(1, 6)]
+
+    csv_body = b"".join([chunk async for chunk in stream_csv(FINDINGS_REPORT, chunked(rows, 2))]).decode()
+    csv_rows = list(csv.reader(io.StringIO(csv_body)))
+    assert csv_rows[0] == FINDINGS_REPORT.keys
+    assert len(csv_rows) == 6
+    assert csv_rows[1][3] == "Несоответствие 1"
+    assert csv_rows[1][8] == ""
+    assert csv_rows[1][9] == "2026-01-31"
+
+    jsonl_body = b"".join([chunk async for chunk in stream_jsonl(FINDINGS_REPORT, chunked(rows, 2))]).decode()
+    objects = [json.loads(line) for line in jsonl_body.splitlines()]
+    assert len(objects) == 5
+    assert objects[4]["finding_number"] == 5
+    assert objects[0]["approver_name"] is None
+    assert objects[0]["deadline"] == "2026-01-31"
+
+
+@pytest.mark.asyncio
+async def test_write_parquet_uses_layout_types():
+    pq = pytest.importorskip("pyarrow.parquet")
+    rows = [finding_row(i) for i in range(1, 251)]
+    path = await write_parquet(FINDINGS_REPORT, chunked(rows, 100))
+    try:
+        table = pq.read_table(path)
+        assert table.column_names == FINDINGS_REPORT.keys
+        assert table.num_rows == 250
+        assert str(table.schema.field("finding_number").type) == "int64"
+        assert str(table.schema.field("approver_name").type) == "string"
+        assert table.column("deadline")[0].as_py() == date(2026, 1, 31)
+        assert pq.ParquetFile(path).num_row_groups == 3
+    finally:
+        os.remove(path)
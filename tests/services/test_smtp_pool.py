@@ -0,0 +1,110 @@
+import asyncio
+import socket
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+pytest.importorskip("aiosmtpd")
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+
+from app.core.security import encrypt_value
+from app.models.email_account import EmailAccount
+from app.services.smtp_pool import build_message, close_smtp_pools, get_smtp_pool
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = 0
+        self.sessions = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages += 1
+        self.sessions.add(id(session))
+        return "250 OK"
+
+
+@pytest.fixture
+def smtp_server():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    handler = RecordingHandler()
+    controller = Controller(
+        handler,
+        hostname="127.0.0.1",
+        port=port,
+        authenticator=lambda *args: AuthResult(success=True),
+        auth_require_tls=False
+    )
+    controller.start()
+    yield handler, port
+    controller.stop()
+
+
+def make_account(port):
+    return EmailAccount(
+        id=uuid4(),
+        name="test",
+        from_name="Test",
+        from_email="test@example.com",
+        smtp_host="127.0.0.1",
+        smtp_port=port,
+        smtp_user="test",
+        smtp_password=encrypt_value("secret"),
+        use_tls=False,
+        updated_at=datetime.now(timezone.utc)
+    )
+
+
+@pytest.mark.asyncio
+async def test_smtp_pool_reuses_connection(smtp_server):
+    handler, port = smtp_server
+    account = make_account(port)
+
+    for i in range(5):
+        pool = await get_smtp_pool(account)
+        await pool.send_messages([build_message(account, ["user@example.com"], f"Тема {i}", "Текст")])
+
+    assert handler.messages == 5
+    assert len(handler.sessions) == 1
+    await close_smtp_pools()
+
+
+@pytest.mark.asyncio
+async def test_smtp_pool_rebuilt_when_account_updated(smtp_server):
+    handler, port = smtp_server
+    account = make_account(port)
+
+    pool = await get_smtp_pool(account)
+    assert await get_smtp_pool(account) is pool
+
+    account.updated_at = account.updated_at + timedelta(seconds=1)
+    rebuilt = await get_smtp_pool(account)
+    assert rebuilt is not pool
+    assert pool.closed
+    await close_smtp_pools()
+
+
+def test_smtp_pool_shared_across_event_loops(smtp_server):
+    handler, port = smtp_server
+    account = make_account(port)
+    pools = []
+
+    async def task(i):
+        pool = await get_smtp_pool(account)
+        pools.append(pool)
+        await pool.send_messages([build_message(account, ["user@example.com"], f"Тема {i}", "Текст")])
+
+    for i in range(3):
+        asyncio.run(task(i))
+
+    assert all(pool is pools[0] for pool in pools)
+    assert handler.messages == 3
+    assert len(handler.sessions) == 1
+
+    asyncio.run(close_smtp_pools())
+    assert pools[0].closed
+    assert pools[0].idle.empty()
@@ -0,0 +1,41 @@
+import pytest
+
+from app.services.stats_cache import TTLCache
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return {"calls": self.calls}
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_reuses_value_within_ttl():
+    cache = TTLCache(ttl_seconds=60)
+    factory = Counter()
+
+    assert await cache.get_or_set("queue", factory) == {"calls": 1}
+    assert await cache.get_or_set("queue", factory) == {"calls": 1}
+    assert await cache.get_or_set("other", factory) == {"calls": 2}
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_disabled_with_zero_ttl():
+    cache = TTLCache(ttl_seconds=0)
+    factory = Counter()
+
+    await cache.get_or_set("queue", factory)
+    await cache.get_or_set("queue", factory)
+    assert factory.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_bounded_size():
+    cache = TTLCache(ttl_seconds=60, max_size=3)
+    for key in range(10):
+        await cache.get_or_set(key, Counter())
+
+    assert len(cache._items) <= 3
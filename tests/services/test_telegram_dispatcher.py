@@ -0,0 +1,241 @@
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs
+
+import pytest
+
+from app.services.telegram_dispatcher import TelegramDispatcher, TokenBucket
+
+
+class FakeBotAPI:
+    """Минимальный Bot API: getMe, sendMessage и один ответ 429 по запросу."""
+
+    def __init__(self, retry_after: int = 0):
+        self.retry_after = retry_after
+        self.sent = []
+        self.server = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/bot"
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    def respond(self, method: str, params: dict) -> tuple:
+        if method == "getMe":
+            return 200, {"ok": True, "result": {"id": 1, "is_bot": True, "first_name": "test", "username": "test_bot"}}
+
+        if self.retry_after:
+            retry_after, self.retry_after = self.retry_after, 0
+            return 429, {
+                "ok": False,
+                "error_code": 429,
+                "description": "Too Many Requests",
+                "parameters": {"retry_after": retry_after}
+            }
+
+        chat_id = int(params["chat_id"])
+        self.sent.append((chat_id, time.monotonic()))
+        return 200, {"ok": True, "result": {
+            "message_id": len(self.sent),
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "text": params.get("text", "")
+        }}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while request_line := await reader.readline():
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                name, _, value = line.decode().partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+            method = request_line.split()[1].decode().rsplit("/", 1)[-1]
+            if headers.get("content-type", "").startswith("application/json"):
+                params = json.loads(body or b"{}")
+            else:
+                params = {key: values[0] for key, values in parse_qs(body.decode()).items()}
+
+            status, payload = self.respond(method, params)
+            data = json.dumps(payload).encode()
+            writer.write(
+                f"HTTP/1.1 {status} OK\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\n\r\n".encode() + data
+            )
+            await writer.drain()
+        writer.close()
+
+
+@pytest.fixture
+async def bot_api():
+    api = FakeBotAPI()
+    api.base_url = await api.start()
+    yield api
+    await api.stop()
+
+
+def make_dispatcher(base_url: str, **kwargs) -> TelegramDispatcher:
+    options = {
+        "global_rate": 100.0,
+        "chat_rate": 10.0,
+        "group_rate_per_minute": 60.0,
+        "max_retries": 2,
+        "shared_limits": False
+    }
+    options.update(kwargs)
+    return TelegramDispatcher(token="123:test", base_url=base_url, connection_pool_size=4, **options)
+
+
+@pytest.fixture
+async def dispatcher(bot_api):
+    dispatcher = make_dispatcher(bot_api.base_url)
+    yield dispatcher
+    await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=20.0, capacity=1)
+    started = time.monotonic()
+    for _ in range(5):
+        await bucket.acquire()
+
+    assert time.monotonic() - started >= 4 / 20 * 0.9
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_sends_in_parallel_across_chats(bot_api, dispatcher):
+    results = await asyncio.gather(*(dispatcher.send(chat_id=chat_id, text="hi") for chat_id in range(1, 11)))
+
+    assert all(results)
+    assert sorted(chat_id for chat_id, _ in bot_api.sent) == list(range(1, 11))
+    stats = dispatcher.stats()
+    assert stats["sent"] == 10
+    assert stats["failed"] == 0
+    assert stats["queue_depth"] == 0
+    assert stats["in_flight"] == 0
+    assert stats["chats"] == 10
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_limits_rate_per_chat(bot_api, dispatcher):
+    await asyncio.gather(*(dispatcher.send(chat_id=42, text=str(i)) for i in range(4)))
+
+    times = [sent_at for _, sent_at in bot_api.sent]
+    assert len(times) == 4
+    assert times[-1] - times[0] >= 3 / 10 * 0.9
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_retries_after_429(bot_api, dispatcher):
+    bot_api.retry_after = 1
+
+    started = time.monotonic()
+    assert await dispatcher.send(chat_id=7, text="hi")
+
+    assert time.monotonic() - started >= 0.9
+    assert [chat_id for chat_id, _ in bot_api.sent] == [7]
+    stats = dispatcher.stats()
+    assert stats["rate_limited"] == 1
+    assert stats["sent"] == 1
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_without_token_does_not_send(bot_api):
+    dispatcher = make_dispatcher(bot_api.base_url)
+    dispatcher.token = ""
+
+    assert not await dispatcher.send(chat_id=7, text="hi")
+    assert bot_api.sent == []
+
+
+class FakeScript:
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = []
+
+    async def __call__(self, keys, args):
+        self.calls.append((keys, args))
+        result = self.results.pop(0) if self.results else "0"
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def use_fake_redis(dispatcher, acquire_results, block_results=()):
+    dispatcher.acquire_script = FakeScript(acquire_results)
+    dispatcher.block_script = FakeScript(block_results)
+
+    async def get_redis():
+        return object()
+
+    dispatcher.get_redis = get_redis
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_waits_for_shared_buckets(bot_api):
+    dispatcher = make_dispatcher(bot_api.base_url, shared_limits=True)
+    use_fake_redis(dispatcher, ["0.2", "0"])
+
+    started = time.monotonic()
+    assert await dispatcher.send(chat_id=42, text="hi")
+    assert time.monotonic() - started >= 0.2 * 0.9
+
+    keys, args = dispatcher.acquire_script.calls[0]
+    assert keys == ["telegram_rate:123:chat:42", "telegram_rate:123:global"]
+    assert args[1:] == [10.0, 1.0, 100.0, 100.0]
+    assert len(dispatcher.acquire_script.calls) == 2
+    await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_stores_429_block_in_redis(bot_api):
+    bot_api.retry_after = 1
+    dispatcher = make_dispatcher(bot_api.base_url, shared_limits=True)
+    use_fake_redis(dispatcher, ["0", "1.0", "0"])
+
+    assert await dispatcher.send(chat_id=7, text="hi")
+
+    keys, args = dispatcher.block_script.calls[0]
+    assert keys == ["telegram_rate:123:chat:7", "telegram_rate:123:global"]
+    assert args[1] == 1.0
+    await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_falls_back_to_local_buckets_without_redis(bot_api):
+    from redis.exceptions import ConnectionError as RedisConnectionError
+
+    dispatcher = make_dispatcher(bot_api.base_url, shared_limits=True)
+    use_fake_redis(dispatcher, [RedisConnectionError("down")])
+
+    assert await dispatcher.send(chat_id=7, text="hi")
+    assert await dispatcher.send(chat_id=8, text="hi")
+
+    assert [chat_id for chat_id, _ in bot_api.sent] == [7, 8]
+    assert len(dispatcher.acquire_script.calls) == 1
+    assert dispatcher.stats()["shared_limit_errors"] == 1
+    await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_close_releases_redis_client(bot_api):
+    class FakeRedisClient:
+        closed = False
+
+        async def aclose(self):
+            self.closed = True
+
+    dispatcher = make_dispatcher(bot_api.base_url)
+    assert await dispatcher.send(chat_id=7, text="hi")
+    client = dispatcher.redis_client = FakeRedisClient()
+
+    await dispatcher.close()
+
+    assert client.closed
+    assert dispatcher.redis_client is None and dispatcher.bot is None